@@ -0,0 +1,49 @@
+import timeit
+from typing import Callable, override
+
+from btpy import BehaviorTree, NodeStatus
+from btpy.builtins import Inverter, Sequence
+from btpy.core import RootTree
+
+
+def measure(fn: Callable[[], object], number: int, repeat: int = 5) -> float:
+    """the best observed time, in seconds, of a single call to `fn`"""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def report(title: str, rows: list[tuple[str, float]], unit: str = "calls/s") -> None:
+    """print the throughput of each row, relative to the first"""
+    print(title)
+    baseline = rows[0][1]
+    width = max(len(label) for label, _ in rows)
+    for label, seconds in rows:
+        print(
+            f"  {label:<{width}}  {1 / seconds:>12,.0f} {unit}"
+            f"  ({baseline / seconds:.2f}x)"
+        )
+
+
+class Running(BehaviorTree):
+    """an action that never finishes"""
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        return NodeStatus.RUNNING
+
+
+class Accumulate(BehaviorTree):
+    """adds its `step` to its `total` every tick"""
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        total = self.get("total")
+        total.value = (total.value or 0) + (self.get("step").value or 0)
+        return NodeStatus.SUCCESS
+
+
+def deep_tree(depth: int, leaf: BehaviorTree | None = None, **ports: str) -> RootTree:
+    """a tree of `depth` inverters, each with the `ports`, above the `leaf`"""
+    node = leaf or Sequence()
+    for _ in range(depth):
+        node = Inverter([node], **ports)
+    return RootTree("main", node)
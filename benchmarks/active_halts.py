@@ -0,0 +1,63 @@
+"""
+compare ticking a wide reactive sequence whose first child keeps running, calling
+`halt` on every later sibling on each tick against halting only the active ones
+
+both run on the current core, where halting a node that is already halted returns
+at once, so this measures the cost of the `halt` calls that are skipped, not the
+previous core, whose halts also returned early once each sibling was halted
+
+run with `python -m benchmarks.active_halts`
+"""
+
+from typing import override
+
+from btpy import BehaviorTree, NodeStatus
+from btpy.builtins import Inverter, ReactiveSequence, Sequence
+
+from benchmarks._harness import Running, measure, report
+
+
+class HaltAllReactiveSequence(ReactiveSequence):
+    """the previous `ReactiveSequence._do_tick`, which halts every later sibling"""
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        for i, child in enumerate(self.children()):
+            match child.tick():
+                case NodeStatus.FAILURE:
+                    self.halt()
+                    return NodeStatus.FAILURE
+
+                case NodeStatus.RUNNING:
+                    for sibling in self.children()[i + 1 :]:
+                        sibling.halt()
+                    return NodeStatus.RUNNING
+
+        self.halt()
+        return NodeStatus.SUCCESS
+
+
+def siblings(width: int) -> list[BehaviorTree]:
+    """a running action followed by `width` small subtrees"""
+    return [
+        Running(),
+        *(Sequence([Inverter([Running()]), Running()]) for _ in range(width)),
+    ]
+
+
+def main() -> None:
+    for width in [10, 100, 1_000]:
+        reference = HaltAllReactiveSequence(siblings(width))
+        tracked = ReactiveSequence(siblings(width))
+        report(
+            f"tick a reactive sequence with {width} waiting siblings",
+            [
+                ("call halt on every sibling", measure(reference.tick, 1_000)),
+                ("halt only active siblings", measure(tracked.tick, 1_000)),
+            ],
+            unit="ticks/s",
+        )
+
+
+if __name__ == "__main__":
+    main()
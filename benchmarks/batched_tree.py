@@ -0,0 +1,108 @@
+"""
+compare ticking many agents that run the same tree, as a `RootTree` each, against
+a `BatchedTree`, which ticks each node for every agent at once with numpy
+
+run with `python -m benchmarks.batched_tree`
+"""
+
+from typing import Any, override
+
+import numpy as np
+from btpy import BehaviorTree, BTParser, NodeRegistration, NodeStatus
+from btpy.core import BatchedTree
+
+from benchmarks._harness import measure, report
+
+XML = """
+<?xml version="1.0" encoding="UTF-8"?>
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <BehaviorTree ID="main">
+    <ReactiveSequence>
+      <Fallback>
+        <IsSafe />
+        <Flee />
+      </Fallback>
+      <Sequence>
+        <Repeat num_cycles="3"><Step /></Repeat>
+        <Inverter><IsSafe /></Inverter>
+        <Step />
+      </Sequence>
+    </ReactiveSequence>
+  </BehaviorTree>
+</root>
+""".strip()
+
+
+class IsSafe(BehaviorTree):
+    """a condition that fails on every third tick"""
+
+    def init(self) -> None:
+        super().init()
+        self.__ticks = 0
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        self.__ticks = self.__ticks + 1
+        return NodeStatus.FAILURE if self.__ticks % 3 == 0 else NodeStatus.SUCCESS
+
+
+class Flee(BehaviorTree):
+    """an action that always succeeds"""
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        return NodeStatus.SUCCESS
+
+
+class Step(Flee):
+    """an action that always succeeds"""
+
+
+def is_safe(size: int) -> Any:
+    """`IsSafe`, vectorized over the agents"""
+    ticks = np.zeros(size, np.intp)
+
+    def tick(agents: Any) -> Any:
+        ticks[agents] += 1
+        return np.where(
+            ticks[agents] % 3 == 0, NodeStatus.FAILURE.value, NodeStatus.SUCCESS.value
+        )
+
+    return tick
+
+
+def main() -> None:
+    with NodeRegistration.scope():
+        for node_type in [IsSafe, Flee, Step]:
+            NodeRegistration.register(node_type)
+        template = BTParser().parse_template_string(XML)
+
+    for size in [10, 100, 1_000, 10_000]:
+        trees = [template.instantiate() for _ in range(size)]
+        batch = BatchedTree(
+            template.instantiate(),
+            size,
+            {
+                "IsSafe": is_safe(size),
+                "Flee": lambda agents: NodeStatus.SUCCESS.value,
+                "Step": lambda agents: NodeStatus.SUCCESS.value,
+            },
+        )
+        assert batch.tick().tolist() == [tree.tick().value for tree in trees]
+
+        number = max(1, 1_000 // size)
+        report(
+            f"tick {size} agents",
+            [
+                (
+                    "RootTree each",
+                    measure(lambda: [tree.tick() for tree in trees], number) / size,
+                ),
+                ("BatchedTree", measure(batch.tick, number) / size),
+            ],
+            unit="agent-ticks/s",
+        )
+
+
+if __name__ == "__main__":
+    main()
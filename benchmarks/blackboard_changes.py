@@ -0,0 +1,99 @@
+"""
+compare re-evaluating every blackboard entry on each cycle against only doing so
+when `changed_since` reports a write, and measure what version stamping costs a write
+
+run with `python -m benchmarks.blackboard_changes`
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from btpy import Blackboard
+from btpy.core import Pointer
+
+from benchmarks._harness import measure, report
+
+
+@dataclass
+class PlainPointer:
+    """a pointer without version stamping, for reference"""
+
+    value: Any
+
+
+def blackboard(size: int) -> Blackboard:
+    """a blackboard with `size` numeric entries"""
+    blackboard = Blackboard()
+    for i in range(size):
+        blackboard.set(f"key {i}", i)
+    return blackboard
+
+
+def main() -> None:
+    keys = [f"key {i}" for i in range(100)]
+    polled, watched = blackboard(100), blackboard(100)
+    cycle = [0]
+
+    def poll() -> float:
+        """re-evaluate every entry on every cycle"""
+        cycle[0] = cycle[0] + 1
+        if cycle[0] % 100 == 0:
+            polled.set("key 0", cycle[0])
+        return float(sum(polled.get(key).value for key in keys))
+
+    total = [0.0]
+    version = [Pointer.clock()]
+
+    def skip_unchanged() -> float:
+        """re-evaluate only after a write"""
+        cycle[0] = cycle[0] + 1
+        if cycle[0] % 100 == 0:
+            watched.set("key 0", cycle[0])
+        if watched.changed_since(version[0]):
+            version[0] = Pointer.clock()
+            total[0] = float(sum(watched.get(key).value for key in keys))
+        return total[0]
+
+    report(
+        "evaluate 100 entries per cycle, 1% of cycles writing one",
+        [
+            ("poll", measure(poll, 1_000)),
+            ("changed_since", measure(skip_unchanged, 1_000)),
+        ],
+        unit="cycles/s",
+    )
+
+    plain, stamped = PlainPointer(0), Pointer(0)
+
+    def write_plain() -> None:
+        plain.value = 1
+
+    def write_stamped() -> None:
+        stamped.value = 1
+
+    def read_plain() -> Any:
+        return plain.value
+
+    def read_stamped() -> Any:
+        return stamped.value
+
+    report(
+        "write a pointer",
+        [
+            ("plain", measure(write_plain, 100_000)),
+            ("Pointer", measure(write_stamped, 100_000)),
+        ],
+        unit="writes/s",
+    )
+    report(
+        "read a pointer",
+        [
+            ("plain", measure(read_plain, 100_000)),
+            ("Pointer", measure(read_stamped, 100_000)),
+        ],
+        unit="reads/s",
+    )
+
+
+if __name__ == "__main__":
+    main()
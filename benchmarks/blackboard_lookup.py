@@ -0,0 +1,55 @@
+"""
+compare looking up a key from deep in a blackboard hierarchy, with and without the
+resolved-pointer cache
+
+run with `python -m benchmarks.blackboard_lookup`
+"""
+
+from typing import Any
+
+from btpy import Blackboard
+from btpy.builtins import Sequence
+from btpy.core import BlackboardChildType, Pointer
+
+from benchmarks._harness import deep_tree, measure, report
+
+
+def uncached_get(blackboard: Blackboard, key: str) -> Pointer[Any]:
+    """the previous implementation of `Blackboard.get`, for reference"""
+    if key.startswith("@"):
+        return uncached_get(blackboard._world, key[1:])
+    if key in blackboard._data:
+        return blackboard._data[key]
+    if blackboard._stack:
+        return uncached_get(blackboard._stack, key)
+    blackboard._data[key] = Pointer(None)
+    return blackboard._data[key]
+
+
+def main() -> None:
+    for depth in [1, 10, 40, 100, 400]:
+        root = Blackboard()
+        root.set("key", 1)
+        blackboard = root
+        for _ in range(depth):
+            blackboard = blackboard.create_child(BlackboardChildType.CHILD)
+        assert uncached_get(blackboard, "key") is blackboard.get("key")
+
+        leaf = Sequence()
+        deep_tree(depth, leaf).attach_blackboard(Blackboard()).get("key").value = 1
+        report(
+            f"look up a key {depth} levels above",
+            [
+                (
+                    "uncached get",
+                    measure(lambda: uncached_get(blackboard, "key"), 1_000),
+                ),
+                ("get", measure(lambda: blackboard.get("key"), 1_000)),
+                ("node get", measure(lambda: leaf.get("key"), 1_000)),
+            ],
+            unit="lookups/s",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+measure the cost of ticking a tree whose nodes look up their ports with `get`,
+before, while and after it is profiled by a `BlackboardProfiler`
+
+run with `python -m benchmarks.blackboard_profiler`
+"""
+
+
+from btpy import Blackboard
+from btpy.builtins import Sequence
+from btpy.core import BlackboardProfiler, RootTree
+
+from benchmarks._harness import Accumulate, measure, report
+
+NODES = 50
+
+
+def main() -> None:
+    blackboard = Blackboard()
+    blackboard.set("step", 1)
+    blackboard.set("total", 0)
+    tree = RootTree(
+        "main",
+        Sequence([Accumulate(step="{@step}", total="{total}") for _ in range(NODES)]),
+    ).attach_blackboard(blackboard)
+
+    before = measure(tree.tick, 1_000)
+    profiler = BlackboardProfiler()
+    with profiler.profile(tree):
+        profiled = measure(tree.tick, 1_000)
+    after = measure(tree.tick, 1_000)
+
+    report(
+        f"tick a tree of {NODES} nodes reading and writing the blackboard",
+        [("before profiling", before), ("profiling", profiled), ("after", after)],
+        unit="ticks/s",
+    )
+    print(profiler.report(limit=3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+compare the streaming `BTWriter` against the previous recursive, f-string based one
+
+run with `python -m benchmarks.bt_writer`
+"""
+
+import io
+import os
+import tracemalloc
+from typing import Callable
+
+from btpy import BehaviorTree
+from btpy.builtins import Sequence
+from btpy.core import BTWriter, RootTree, SubTree
+
+from benchmarks._harness import deep_tree, measure, report
+
+
+def recursive_to_xml(tree: SubTree, indent: str = "\t") -> str:
+    """the previous implementation of `BTWriter.to_xml`, for reference"""
+    seen = set[str]()
+
+    def attrs(node: BehaviorTree) -> str:
+        return "".join(f' {k}="{v}"' for (k, v) in sorted(node.mappings().items()))
+
+    def subtree_xml(tree: SubTree, level: int) -> str:
+        name = tree.class_name()
+        if name in seen:
+            return ""
+        seen.add(name)
+        return f"""{indent * level}<BehaviorTree ID="{name}">
+{node_xml(tree.child(), level + 1)}
+{indent * level}</BehaviorTree>
+"""
+
+    def node_xml(node: BehaviorTree, level: int) -> str:
+        name, ports, children = node.class_name(), attrs(node), node.children()
+        if isinstance(node, SubTree):
+            name, ports, children = "SubTree", f' ID="{name}"{ports}', []
+        if len(children) == 0:
+            return f"""{indent * level}<{name}{ports} />"""
+        return f"""{indent * level}<{name}{ports}>
+{"\n".join(node_xml(child, level + 1) for child in children)}
+{indent * level}</{name}>"""
+
+    subtrees = (node for node in tree if isinstance(node, SubTree))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<root BTCPP_format="4" main_tree_to_execute="{tree.class_name()}">
+{"".join(subtree_xml(subtree, level=1) for subtree in subtrees)}</root>
+"""
+
+
+def wide_tree(width: int) -> RootTree:
+    return RootTree(
+        "main",
+        Sequence([Sequence([Sequence(name=f"leaf_{i}")]) for i in range(width)]),
+    )
+
+
+def peak_memory(write: Callable[[], object]) -> int:
+    """the peak memory, in bytes, allocated by `write`"""
+    tracemalloc.start()
+    write()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    with open(os.devnull, "w") as devnull:
+        for label, tree in [
+            ("deep tree (300 levels)", deep_tree(300, name="inverter")),
+            ("wide tree (20,000 nodes)", wide_tree(10_000)),
+        ]:
+            assert recursive_to_xml(tree) == BTWriter.to_xml(tree)
+            writers: list[tuple[str, Callable[[], object]]] = [
+                ("recursive to_xml", lambda: recursive_to_xml(tree)),
+                ("to_xml", lambda: BTWriter.to_xml(tree)),
+                ("write", lambda: BTWriter.write(tree, devnull)),
+                ("write (StringIO)", lambda: BTWriter.write(tree, io.StringIO())),
+            ]
+            report(
+                f"serialize a {label}",
+                [(name, measure(write, 3)) for name, write in writers],
+                unit="trees/s",
+            )
+            for name, write in writers:
+                print(f"  peak memory ({name}): {peak_memory(write) / 1024:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+compare pushing a 200-value sensor frame into the world blackboard, and reading
+200 outputs back, one key at a time against the bulk operations
+
+run with `python -m benchmarks.bulk_io`
+"""
+
+from typing import Any
+
+import numpy as np
+from btpy import Blackboard
+
+from benchmarks._harness import measure, report
+
+SIZE = 200
+
+
+def main() -> None:
+    world = Blackboard()
+    leaf = world
+    for _ in range(5):
+        leaf = Blackboard(leaf)
+
+    keys = [f"sensor {i}" for i in range(SIZE)]
+    world_keys = [f"@{key}" for key in keys]
+    frame = {key: float(i) for i, key in enumerate(world_keys)}
+    dtype = np.dtype([(key, "f8") for key in keys])
+    record = np.array(tuple(frame.values()), dtype=dtype)[()]
+    binding = world.bind(dtype)
+
+    def set_each() -> None:
+        for key, value in frame.items():
+            leaf.set(key, value)
+
+    def set_many() -> None:
+        leaf.set_many(frame)
+
+    def write_record() -> None:
+        binding.write(record)
+
+    report(
+        f"write {SIZE} sensor values to the world blackboard",
+        [
+            ("set", measure(set_each, 1_000)),
+            ("set_many", measure(set_many, 1_000)),
+            ("bind(dtype)", measure(write_record, 1_000)),
+        ],
+        unit="frames/s",
+    )
+
+    def get_each() -> list[Any]:
+        return [leaf.get(key).value for key in world_keys]
+
+    def get_many() -> list[Any]:
+        return leaf.get_many(world_keys)
+
+    def read_record() -> tuple[Any, ...]:
+        return binding.read()
+
+    report(
+        f"read {SIZE} values back",
+        [
+            ("get", measure(get_each, 1_000)),
+            ("get_many", measure(get_many, 1_000)),
+            ("bind(dtype)", measure(read_record, 1_000)),
+        ],
+        unit="frames/s",
+    )
+
+
+if __name__ == "__main__":
+    main()
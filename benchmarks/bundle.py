@@ -0,0 +1,49 @@
+"""
+compare cold-start loading from xml against loading a precompiled bundle
+
+run with `python -m benchmarks.bundle`
+"""
+
+import tempfile
+from pathlib import Path
+
+from btpy import BTParser
+from btpy.core import BTWriter, IncludeCache
+
+from benchmarks._harness import measure, report
+from benchmarks.indexed_parsing import generate_library
+
+
+def main() -> None:
+    for files, trees_per_file in [(1, 10), (20, 200)]:
+        with tempfile.TemporaryDirectory() as directory:
+            path = generate_library(Path(directory), files, trees_per_file)
+            bundle = Path(directory) / "main.btpy"
+            bundle.write_bytes(BTWriter.to_bundle(BTParser().parse_template(path)))
+
+            def parse(indexed: bool = False) -> None:
+                BTParser(indexed=indexed, include_cache=IncludeCache()).parse(path)
+
+            def parse_bundle(check_sources: bool = True) -> None:
+                BTParser(include_cache=IncludeCache()).parse_bundle(
+                    bundle, check_sources=check_sources
+                )
+
+            report(
+                f"cold start from {files * trees_per_file} trees in {files} files",
+                [
+                    ("parse", measure(parse, 3)),
+                    ("parse, indexed", measure(lambda: parse(indexed=True), 3)),
+                    ("parse_bundle", measure(parse_bundle, 3)),
+                    (
+                        "parse_bundle, unchecked",
+                        measure(lambda: parse_bundle(False), 3),
+                    ),
+                ],
+                unit="starts/s",
+            )
+            print(f"  bundle size: {bundle.stat().st_size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+compare ticking trees of built-in nodes with `tick` against a `CompiledTick`,
+which inlines their control flow into one specialized function
+
+run with `python -m benchmarks.compiled_tick`
+"""
+
+from typing import override
+
+from btpy import BehaviorTree, Blackboard, NodeStatus
+from btpy.builtins import (
+    Fallback,
+    ForceSuccess,
+    Inverter,
+    ReactiveSequence,
+    Repeat,
+    Sequence,
+)
+from btpy.core import CompiledTick, RootTree
+
+from benchmarks._harness import measure, report
+
+
+class Succeed(BehaviorTree):
+    """an action that always succeeds"""
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        return NodeStatus.SUCCESS
+
+
+class Fail(BehaviorTree):
+    """a condition that always fails"""
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        return NodeStatus.FAILURE
+
+
+def wide() -> BehaviorTree:
+    """a sequence of 100 actions"""
+    return Sequence([Succeed() for _ in range(100)])
+
+
+def mixed() -> BehaviorTree:
+    """20 fallbacks over a failing condition and a repeated, decorated action"""
+    return Sequence(
+        [
+            Fallback(
+                [
+                    Inverter([Succeed()]),
+                    ReactiveSequence(
+                        [Repeat([ForceSuccess([Succeed()])], num_cycles="3")]
+                    ),
+                ]
+            )
+            for _ in range(20)
+        ]
+    )
+
+
+def deep() -> BehaviorTree:
+    """a chain of 200 alternating decorators"""
+    node: BehaviorTree = Fail()
+    for i in range(200):
+        node = Inverter([node]) if i % 2 else ForceSuccess([node])
+    return node
+
+
+def main() -> None:
+    for name, build in [("wide", wide), ("mixed", mixed), ("deep", deep)]:
+        tree = RootTree("main", build()).attach_blackboard(Blackboard())
+        compiled = CompiledTick(tree)
+        assert compiled() == tree.tick()
+        report(
+            f"tick a {name} tree of {sum(1 for _ in tree)} nodes",
+            [
+                ("tick", measure(tree.tick, 1_000)),
+                ("tick_iteratively", measure(tree.tick_iteratively, 1_000)),
+                ("CompiledTick", measure(compiled, 1_000)),
+            ],
+            unit="ticks/s",
+        )
+
+
+if __name__ == "__main__":
+    main()
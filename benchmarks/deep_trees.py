@@ -0,0 +1,48 @@
+"""
+compare ticking a chain of decorators with `tick`, which recurses into each child,
+against `tick_iteratively`, which keeps an explicit stack, as the chain gets deeper
+
+the recursion limit is raised for `tick`, which otherwise fails past a few hundred levels
+
+run with `python -m benchmarks.deep_trees`
+"""
+
+import sys
+
+from btpy import BehaviorTree, Blackboard
+from btpy.builtins import ForceSuccess, Inverter
+from btpy.core import RootTree
+
+from benchmarks._harness import Running, measure, report
+
+
+def chain(depth: int) -> RootTree:
+    """a tree of `depth` alternating decorators above a running action"""
+    node: BehaviorTree = Running()
+    for i in range(depth):
+        node = Inverter([node]) if i % 2 else ForceSuccess([node])
+    return RootTree("main", node).attach_blackboard(Blackboard())
+
+
+def main() -> None:
+    limit = sys.getrecursionlimit()
+    for depth in [10, 100, 1_000, 10_000]:
+        tree = chain(depth)
+        sys.setrecursionlimit(max(limit, 4 * depth + 100))
+        recursive = measure(tree.tick, max(1, 10_000 // depth))
+        sys.setrecursionlimit(limit)
+        report(
+            f"tick a chain of {depth} decorators",
+            [
+                ("tick", recursive),
+                (
+                    "tick_iteratively",
+                    measure(tree.tick_iteratively, max(1, 10_000 // depth)),
+                ),
+            ],
+            unit="ticks/s",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+compare checking two 100k-node trees for equality by digest and by serializing them
+
+run with `python -m benchmarks.fingerprint`
+"""
+
+from btpy.builtins import Inverter, Sequence
+from btpy.core import BTWriter, RootTree
+
+from benchmarks._harness import measure, report
+
+
+def large_tree(width: int) -> RootTree:
+    """a tree with `5 * width` nodes"""
+    return RootTree(
+        "main",
+        Sequence(
+            [
+                Sequence([Inverter([Sequence(name=f"leaf_{i}")]), Sequence()])
+                for i in range(width)
+            ],
+        ),
+    )
+
+
+def main() -> None:
+    first, second = large_tree(20_000), large_tree(20_000)
+    assert BTWriter.to_xml(first) == BTWriter.to_xml(second)
+    assert first.digest() == second.digest()
+
+    def by_xml() -> bool:
+        return BTWriter.to_xml(large_tree(20_000)) == BTWriter.to_xml(second)
+
+    def by_digest() -> bool:
+        return large_tree(20_000).digest() == second.digest()
+
+    # the cold comparisons include building a fresh tree, which has no digest yet
+    report(
+        "compare a fresh 100,000 node tree against a deployed one",
+        [
+            ("to_xml", measure(by_xml, 3)),
+            ("digest", measure(by_digest, 3)),
+            ("build only", measure(lambda: large_tree(20_000), 3)),
+        ],
+        unit="comparisons/s",
+    )
+    report(
+        "compare two deployed 100,000 node trees",
+        [
+            (
+                "to_xml",
+                measure(lambda: BTWriter.to_xml(first) == BTWriter.to_xml(second), 3),
+            ),
+            ("digest", measure(lambda: first.digest() == second.digest(), 1000)),
+        ],
+        unit="comparisons/s",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+measure parsing a deep, diamond-shaped include graph with a cold and a warm cache
+
+run with `python -m benchmarks.include_cache`
+"""
+
+import tempfile
+from pathlib import Path
+
+from btpy import BTParser
+from btpy.core import IncludeCache
+
+from benchmarks._harness import measure, report
+
+
+def generate_graph(directory: Path, layers: int, width: int) -> Path:
+    """write `layers` of `width` files, each including every file of the next layer"""
+    body = "<Sequence>" + "<ForceSuccess><Fallback /></ForceSuccess>" * 20
+    body = body + "</Sequence>"
+    for layer in range(layers):
+        for i in range(width):
+            includes = "".join(
+                f'<include path="file_{layer + 1}_{j}.xml" />'
+                for j in range(width)
+                if layer + 1 < layers
+            )
+            trees = "".join(
+                f'<BehaviorTree ID="tree_{layer}_{i}_{k}">{body}</BehaviorTree>'
+                for k in range(10)
+            )
+            (directory / f"file_{layer}_{i}.xml").write_text(
+                f'<root BTCPP_format="4">{includes}{trees}</root>'
+            )
+
+    main = directory / "main.xml"
+    includes = "".join(f'<include path="file_0_{j}.xml" />' for j in range(width))
+    main.write_text(
+        f'<root BTCPP_format="4" main_tree_to_execute="tree_{layers - 1}_0_0">'
+        f"{includes}</root>"
+    )
+    return main
+
+
+def main() -> None:
+    for layers, width in [(4, 3), (10, 4)]:
+        with tempfile.TemporaryDirectory() as directory:
+            path = generate_graph(Path(directory), layers, width)
+            warm = IncludeCache()
+
+            def cold_parse() -> None:
+                BTParser(include_cache=IncludeCache()).parse(path)
+
+            def warm_parse() -> None:
+                BTParser(include_cache=warm).parse(path)
+
+            report(
+                f"parse {layers} layers of {width} files"
+                f" ({width**layers:,} include paths)",
+                [
+                    ("cold cache", measure(cold_parse, 5)),
+                    ("warm cache", measure(warm_parse, 5)),
+                ],
+                unit="parses/s",
+            )
+            print(f"  warm cache: {warm.hits():,} hits, {warm.misses():,} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+compare eager and indexed parsing of a large multi-file tree library
+
+run with `python -m benchmarks.indexed_parsing`
+"""
+
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from btpy import BTParser
+
+from benchmarks._harness import measure, report
+
+
+def generate_library(directory: Path, files: int, trees_per_file: int) -> Path:
+    """write a library of `files` x `trees_per_file` trees, of which main uses two"""
+    body = "<Sequence>" + "<ForceSuccess><Fallback /></ForceSuccess>" * 20
+    body = body + "</Sequence>"
+    for i in range(files):
+        trees = "".join(
+            f'<BehaviorTree ID="tree_{i}_{j}">{body}</BehaviorTree>\n'
+            for j in range(trees_per_file)
+        )
+        (directory / f"library_{i}.xml").write_text(
+            f'<root BTCPP_format="4">\n{trees}</root>', encoding="utf-8"
+        )
+
+    includes = "".join(f'<include path="library_{i}.xml" />' for i in range(files))
+    main = directory / "main.xml"
+    main.write_text(
+        f"""
+<root BTCPP_format="4" main_tree_to_execute="main">
+  {includes}
+  <BehaviorTree ID="main">
+    <Sequence><SubTree ID="tree_0_0" /><SubTree ID="tree_{files - 1}_0" /></Sequence>
+  </BehaviorTree>
+</root>
+""".strip(),
+        encoding="utf-8",
+    )
+    return main
+
+
+def peak_memory(path: Path, indexed: bool) -> int:
+    """the peak memory, in bytes, allocated while parsing `path`"""
+    tracemalloc.start()
+    BTParser(indexed=indexed).parse(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    for files, trees_per_file in [(4, 50), (20, 200)]:
+        with tempfile.TemporaryDirectory() as directory:
+            path = generate_library(Path(directory), files, trees_per_file)
+            report(
+                f"parse 2 of {files * trees_per_file} trees from {files} files",
+                [
+                    ("eager", measure(lambda: BTParser().parse(path), 1)),
+                    ("indexed", measure(lambda: BTParser(indexed=True).parse(path), 1)),
+                ],
+                unit="parses/s",
+            )
+            for indexed in (False, True):
+                peak = peak_memory(path, indexed) / 1024
+                print(
+                    f"  peak memory ({'indexed' if indexed else 'eager'}): {peak:,.0f} KiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+compare eager and lazy subtree instantiation on a sparsely executed tree
+
+run with `python -m benchmarks.lazy_subtrees`
+"""
+
+import tracemalloc
+
+from btpy import BTParser
+from btpy.core import TreeTemplate
+
+from benchmarks._harness import measure, report
+
+
+def generate_xml(branches: int, depth: int) -> str:
+    """a fallback over `branches` calls to a large subtree, where only the first runs"""
+    nested = "<Sequence><ForceSuccess><Fallback /></ForceSuccess>" * depth
+    nested = nested + "</Sequence>" * depth
+    calls = "".join(
+        f'<SubTree ID="large" name="branch_{i}" input="{{value_{i}}}" />'
+        for i in range(branches)
+    )
+    return f"""
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <BehaviorTree ID="main"><Fallback><ForceSuccess><Sequence /></ForceSuccess>{calls}</Fallback></BehaviorTree>
+  <BehaviorTree ID="large">{nested}</BehaviorTree>
+</root>
+""".strip()
+
+
+def peak_memory(template: TreeTemplate, lazy: bool) -> int:
+    """the memory, in bytes, allocated by building and ticking one tree"""
+    tracemalloc.start()
+    tree = template.instantiate(lazy_subtrees=lazy)
+    tree.tick()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main() -> None:
+    for branches, depth in [(10, 10), (100, 50)]:
+        template = BTParser().parse_template_string(generate_xml(branches, depth))
+        report(
+            f"build and tick a fallback over {branches} subtrees of {depth} levels",
+            [
+                ("eager", measure(lambda: template.instantiate().tick(), 5)),
+                (
+                    "lazy",
+                    measure(lambda: template.instantiate(lazy_subtrees=True).tick(), 5),
+                ),
+            ],
+            unit="trees/s",
+        )
+        for lazy in (False, True):
+            memory = peak_memory(template, lazy) / 1024
+            print(f"  memory ({'lazy' if lazy else 'eager'}): {memory:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+compare nodes that read their ports through `get` on every tick against nodes that
+declare them as `Port`s bound at attach time
+
+run with `python -m benchmarks.ports`
+"""
+
+from typing import override
+
+from btpy import BehaviorTree, Blackboard, NodeStatus, Port
+from btpy.builtins import Sequence
+from btpy.core import RootTree
+
+from benchmarks._harness import measure, report
+
+
+class GetReader(BehaviorTree):
+    """reads three ports with `get`"""
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        ok = self.get("enabled", bool).value
+        ok = ok and (self.get("count", int).value or 0) > 0
+        ok = ok and self.get("target").value is not None
+        return NodeStatus.SUCCESS if ok else NodeStatus.FAILURE
+
+
+class PortReader(BehaviorTree):
+    """reads three declared ports"""
+
+    enabled = Port(bool)
+    count = Port(int)
+    target = Port()
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        ok = self.enabled.value
+        ok = ok and (self.count.value or 0) > 0
+        ok = ok and self.target.value is not None
+        return NodeStatus.SUCCESS if ok else NodeStatus.FAILURE
+
+
+def readers(reader: type[BehaviorTree], depth: int) -> RootTree:
+    """100 readers, each `depth` levels below a remapped sequence"""
+    leaves = list[BehaviorTree]()
+    for _ in range(100):
+        node = reader(enabled="true", count="{count}", target="{target}")
+        for _ in range(depth):
+            node = Sequence([node])
+        leaves.append(Sequence([node], name="remapped"))
+
+    blackboard = Blackboard()
+    blackboard.set("count", "1")
+    blackboard.set("target", object())
+    return RootTree("main", Sequence(leaves)).attach_blackboard(blackboard)
+
+
+class GetName(Sequence):
+    """reads its name with `get`, as `name()` used to"""
+
+    @override
+    def name(self) -> str:
+        return self.get("name", str).value or self.class_name()
+
+
+def named(node: type[Sequence]) -> RootTree:
+    """100 nodes, half of which remap their name"""
+    nodes: list[BehaviorTree] = [
+        node(name=f"node {i}") if i % 2 else node() for i in range(100)
+    ]
+    return RootTree("main", Sequence(nodes)).attach_blackboard(Blackboard())
+
+
+def main() -> None:
+    for depth in [0, 5]:
+        get_tree, port_tree = readers(GetReader, depth), readers(PortReader, depth)
+        report(
+            f"tick 100 nodes reading 3 ports, {depth} levels deep",
+            [
+                ("get", measure(get_tree.tick, 1_000)),
+                ("Port", measure(port_tree.tick, 1_000)),
+            ],
+            unit="ticks/s",
+        )
+
+    get_names, port_names = named(GetName), named(Sequence)
+    report(
+        "get the name of 100 nodes",
+        [
+            ("get", measure(lambda: [node.name() for node in get_names], 1_000)),
+            ("Port", measure(lambda: [node.name() for node in port_names], 1_000)),
+        ],
+        unit="calls/s",
+    )
+
+
+if __name__ == "__main__":
+    main()
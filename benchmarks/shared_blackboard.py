@@ -0,0 +1,87 @@
+"""
+compare delivering a 200-value sensor frame from a perception process to the tree
+process through a pickling queue against sharing the entries through a `SharedBlackboard`
+
+run with `python -m benchmarks.shared_blackboard`
+"""
+
+import multiprocessing
+import time
+from multiprocessing.connection import Connection
+from typing import Any
+
+from btpy import Blackboard
+from btpy.core import SharedBlackboard
+
+from benchmarks._harness import report
+
+SIZE = 200
+FRAMES = 20_000
+KEYS = [f"sensor {i}" for i in range(SIZE)]
+GROUP_KEYS = [f"frame.{key}" for key in KEYS]
+
+
+def produce_queue(queue: "multiprocessing.Queue[dict[str, float]]") -> None:
+    """send each frame through the queue"""
+    for frame in range(FRAMES):
+        queue.put({key: float(frame) for key in KEYS})
+
+
+def produce_shared(name: str, ready: Connection) -> None:
+    """write each frame to the shared entries"""
+    blackboard = SharedBlackboard.attach(name)
+    binding = blackboard.bind(GROUP_KEYS)
+    ready.send(None)
+    for frame in range(FRAMES):
+        binding.write([float(frame)] * SIZE)
+    blackboard.close()
+
+
+def consume_queue() -> float:
+    """seconds per frame to receive each frame and apply it to the blackboard"""
+    context = multiprocessing.get_context("spawn")
+    queue: "multiprocessing.Queue[dict[str, float]]" = context.Queue()
+    producer = context.Process(target=produce_queue, args=(queue,))
+    producer.start()
+
+    blackboard = Blackboard()
+    blackboard.set_many(queue.get())
+    start = time.perf_counter()
+    for _ in range(FRAMES - 1):
+        blackboard.set_many(queue.get())
+    elapsed = time.perf_counter() - start
+    producer.join()
+    return elapsed / (FRAMES - 1)
+
+
+def consume_shared() -> tuple[float, Any]:
+    """seconds per frame to read every shared entry while the producer writes them"""
+    context = multiprocessing.get_context("spawn")
+    blackboard = SharedBlackboard.create({"frame": {key: "d" for key in KEYS}})
+    binding = blackboard.bind(GROUP_KEYS)
+    receiver, sender = context.Pipe(duplex=False)
+    producer = context.Process(target=produce_shared, args=(blackboard.name(), sender))
+    producer.start()
+    receiver.recv()
+
+    start = time.perf_counter()
+    for _ in range(FRAMES - 1):
+        latest = binding.read()
+    elapsed = time.perf_counter() - start
+    producer.join()
+    blackboard.close()
+    return elapsed / (FRAMES - 1), latest
+
+
+def main() -> None:
+    queued = consume_queue()
+    shared, _ = consume_shared()
+    report(
+        f"deliver a {SIZE}-value frame to the tree process",
+        [("queue (pickle)", queued), ("SharedBlackboard", shared)],
+        unit="frames/s",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+measure the memory used by the blackboards of a 50k node tree, when nodes that remap
+no ports share their parent's blackboard and when every node has its own
+
+run with `python -m benchmarks.shared_parent_blackboard`
+"""
+
+import tracemalloc
+from typing import Callable, override
+
+from btpy import BehaviorTree, Blackboard
+from btpy.builtins import Sequence
+from btpy.core import BlackboardChildType, RootTree
+
+from benchmarks._harness import measure, report
+
+
+class OwnBlackboardSequence(Sequence):
+    """a sequence that always creates its own blackboard, as every node used to"""
+
+    @override
+    def make_blackboard(self, parent: Blackboard) -> Blackboard:
+        return parent.create_child(BlackboardChildType.CHILD)
+
+
+def large_tree(node: Callable[..., BehaviorTree]) -> RootTree:
+    """a tree of 50,000 nodes, where the 4,500 parents of the leaves each remap a port"""
+    leaves = [node([]) for _ in range(45_000)]
+    nodes = [node(leaves[i : i + 10], name="{x}") for i in range(0, len(leaves), 10)]
+    while len(nodes) > 1:
+        nodes = [node(nodes[i : i + 10]) for i in range(0, len(nodes), 10)]
+    return RootTree("main", nodes[0])
+
+
+def attached_memory(tree: RootTree) -> int:
+    """the memory, in bytes, allocated by attaching the `tree` to a blackboard"""
+    tracemalloc.start()
+    tree.attach_blackboard(Blackboard())
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def deepest_leaf(tree: BehaviorTree) -> BehaviorTree:
+    while tree.children():
+        tree = tree.children()[0]
+    return tree
+
+
+def main() -> None:
+    own, shared = large_tree(OwnBlackboardSequence), large_tree(Sequence)
+    print(f"nodes: {sum(1 for _ in shared):,}")
+    for label, tree in [
+        ("own blackboard per node", own),
+        ("shared blackboards", shared),
+    ]:
+        print(f"  blackboard memory ({label}): {attached_memory(tree) / 1024:,.0f} KiB")
+
+    own_leaf, shared_leaf = deepest_leaf(own), deepest_leaf(shared)
+    own.get("key").value = shared.get("key").value = 1
+    report(
+        "look up a key from the deepest leaf",
+        [
+            ("own blackboard per node", measure(lambda: own_leaf.get("key"), 10_000)),
+            ("shared blackboards", measure(lambda: shared_leaf.get("key"), 10_000)),
+        ],
+        unit="lookups/s",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+compare rolling back a what-if run on a large blackboard hierarchy by deep copying it
+beforehand against taking a copy-on-write snapshot
+
+run with `python -m benchmarks.snapshots`
+"""
+
+import copy
+
+from btpy import Blackboard
+from btpy.core import BlackboardChildType
+
+from benchmarks._harness import measure, report
+
+
+def hierarchy(size: int) -> tuple[Blackboard, list[Blackboard]]:
+    """a root with `size` entries, and 100 child layers aliasing some of them"""
+    root = Blackboard()
+    for i in range(size):
+        root.set(f"key {i}", i)
+
+    children = [root.create_child(BlackboardChildType.CLEAN) for _ in range(100)]
+    for i, child in enumerate(children):
+        Blackboard.remap(root, child, {"alias": f"{{key {i}}}", "literal": str(i)})
+    return root, children
+
+
+def main() -> None:
+    for size in [1_000, 100_000]:
+        root, children = hierarchy(size)
+
+        def what_if() -> None:
+            """write 10 entries through their aliases"""
+            for child in children[:10]:
+                child.set("alias", -1)
+
+        def deep_copy() -> None:
+            copy.deepcopy((root, children))
+            what_if()
+
+        def snapshot() -> None:
+            snapshot = root.snapshot()
+            what_if()
+            snapshot.restore()
+
+        report(
+            f"roll back 10 writes to a blackboard of {size:,} entries",
+            [
+                ("deepcopy", measure(deep_copy, 10 if size > 1_000 else 100, 3)),
+                ("snapshot", measure(snapshot, 1_000)),
+            ],
+            unit="rollbacks/s",
+        )
+
+    _, children = hierarchy(100)
+
+    def write() -> None:
+        children[0].set("alias", 0)
+
+    plain = measure(write, 100_000)
+    recorder = children[0].snapshot()
+    recording = measure(write, 100_000)
+    recorder.restore()
+    report(
+        "write an entry",
+        [("plain", plain), ("while recording", recording)],
+        unit="writes/s",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+measure how the throughput of parsing and ticking independent trees from a thread
+pool scales with the number of threads
+
+with the GIL, the throughput cannot grow past that of a single thread; this shows
+that sharing the registry and blackboards adds no contention, while on a free-threaded
+build (`python3.13t`) with several cores it should grow with the thread count
+
+run with `python -m benchmarks.threads`
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from btpy import Blackboard, BTParser
+
+from benchmarks._harness import measure, report
+
+TREES = 64
+
+XML = """
+<?xml version="1.0" encoding="UTF-8"?>
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <BehaviorTree ID="main">
+    <Sequence>
+      <SubTree ID="worker" count="{@count}" />
+      <SubTree ID="worker" count="{@count}" />
+    </Sequence>
+  </BehaviorTree>
+  <BehaviorTree ID="worker">
+    <Repeat num_cycles="{count}">
+      <Sequence><ForceSuccess><Fallback /></ForceSuccess></Sequence>
+    </Repeat>
+  </BehaviorTree>
+</root>
+""".strip()
+
+
+def run_tree(_: int) -> None:
+    """parse a tree with its own world blackboard, and tick it"""
+    world = Blackboard()
+    world.set("count", 10)
+    tree = BTParser().parse_string(XML, blackboard=Blackboard(world=world))
+    for _ in range(20):
+        tree.tick()
+
+
+def main() -> None:
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    rows = list[tuple[str, float]]()
+    for threads in [1, 2, 4, 8]:
+        with ThreadPoolExecutor(threads) as executor:
+            seconds = measure(lambda: list(executor.map(run_tree, range(TREES))), 3)
+        rows.append((f"{threads} threads", seconds / TREES))
+
+    report(
+        f"parse and tick {TREES} trees ({'with' if gil else 'without'} the GIL)",
+        rows,
+        unit="trees/s",
+    )
+
+
+if __name__ == "__main__":
+    main()
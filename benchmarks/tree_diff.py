@@ -0,0 +1,66 @@
+"""
+compare finding the changes between two large trees with `TreeDiff` and by diffing xml
+
+run with `python -m benchmarks.tree_diff`
+"""
+
+import difflib
+
+from btpy import BehaviorTree
+from btpy.builtins import Fallback, Inverter, Sequence
+from btpy.core import BTWriter, RootTree, SubTree, TreeDiff
+
+from benchmarks._harness import measure, report
+
+
+def large_tree(subtrees: int, changed: int | None = None) -> RootTree:
+    """a tree of 100 nodes per subtree, with one port changed in the `changed` subtree"""
+
+    def body(i: int) -> BehaviorTree:
+        return Sequence(
+            [
+                Inverter([Fallback(name="{x}" if i == changed and j == 0 else "{y}")])
+                for j in range(49)
+            ]
+        )
+
+    return RootTree(
+        "main", Sequence([SubTree(f"tree_{i}", body(i)) for i in range(subtrees)])
+    )
+
+
+def xml_diff(old: RootTree, new: RootTree) -> list[str]:
+    return list(
+        difflib.unified_diff(
+            BTWriter.to_xml(old).splitlines(), BTWriter.to_xml(new).splitlines()
+        )
+    )
+
+
+def main() -> None:
+    old, new = large_tree(1_000), large_tree(1_000, changed=500)
+    print("\n".join(str(change) for change in TreeDiff.compare(old, new)))
+
+    # freshly built trees have no cached digests yet
+    fresh = iter(
+        [(large_tree(1_000), large_tree(1_000, changed=500)) for _ in range(5)]
+    )
+    report(
+        "find the changes between two 100,000 node trees",
+        [
+            ("to_xml + difflib", measure(lambda: xml_diff(old, new), 1)),
+            (
+                "TreeDiff (fresh trees)",
+                measure(lambda: TreeDiff.compare(*next(fresh)), 1),
+            ),
+            (
+                "TreeDiff (digests cached)",
+                measure(lambda: TreeDiff.compare(old, new), 100),
+            ),
+        ],
+        unit="diffs/s",
+    )
+
+
+if __name__ == "__main__":
+    main()
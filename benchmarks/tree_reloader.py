@@ -0,0 +1,91 @@
+"""
+compare hot reloading one changed definition against parsing the whole tree again
+
+run with `python -m benchmarks.tree_reloader`
+"""
+
+import itertools
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from btpy import BTParser
+from btpy.core import TreeReloader
+
+from benchmarks._harness import measure, report
+
+
+def generate_tree(directory: Path, files: int, trees_per_file: int) -> Path:
+    """write a tree that uses every definition of a `files` x `trees_per_file` library"""
+    for i in range(files):
+        write_library(directory, i, trees_per_file, "{x}")
+
+    includes = "".join(f'<include path="library_{i}.xml" />' for i in range(files))
+    subtrees = "".join(
+        f'<SubTree ID="tree_{i}_{j}" />'
+        for i in range(files)
+        for j in range(trees_per_file)
+    )
+    main = directory / "main.xml"
+    main.write_text(
+        f"""
+<root BTCPP_format="4" main_tree_to_execute="main">
+  {includes}
+  <BehaviorTree ID="main"><Sequence>{subtrees}</Sequence></BehaviorTree>
+</root>
+""".strip(),
+        encoding="utf-8",
+    )
+    return main
+
+
+def write_library(directory: Path, i: int, trees_per_file: int, port: str) -> None:
+    """write one file of the library, with the first tree's port set to `port`"""
+    body = "<Sequence>" + "<ForceSuccess><Fallback /></ForceSuccess>" * 20
+    trees = "".join(
+        f'<BehaviorTree ID="tree_{i}_{j}"><Inverter name="{port if j == 0 else "{x}"}">'
+        f"{body}</Sequence></Inverter></BehaviorTree>\n"
+        for j in range(trees_per_file)
+    )
+    path = directory / f"library_{i}.xml"
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(f'<root BTCPP_format="4">\n{trees}</root>', encoding="utf-8")
+    os.utime(path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for files, trees_per_file in [(10, 10), (50, 20)]:
+            path = generate_tree(Path(directory), files, trees_per_file)
+            reloader = TreeReloader(path)
+            ports = itertools.cycle(["{y}", "{x}"])
+            # the reloader must see a change on every call, whatever else wrote the file
+            reloaded_ports = itertools.cycle(["{y}", "{x}"])
+
+            def edit() -> None:
+                write_library(Path(directory), 0, trees_per_file, next(ports))
+
+            def reload() -> None:
+                write_library(Path(directory), 0, trees_per_file, next(reloaded_ports))
+                assert reloader.reload() == ["tree_0_0"]
+
+            def reparse() -> None:
+                edit()
+                BTParser().parse(path)
+
+            nodes = sum(1 for _ in reloader.tree())
+            rows: list[tuple[str, Callable[[], None]]] = [
+                ("edit + parse", reparse),
+                ("edit + reload", reload),
+                ("edit only", edit),
+            ]
+            report(
+                f"apply a one-port edit to a tree of {nodes:,} nodes",
+                [(name, measure(fn, 5)) for name, fn in rows],
+                unit="edits/s",
+            )
+
+
+if __name__ == "__main__":
+    main()
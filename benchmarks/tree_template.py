@@ -0,0 +1,69 @@
+"""
+compare instantiating a `TreeTemplate` against re-parsing the xml, both with
+`parse_string` and with the loader that built nodes straight from the xml
+before templates, which is also the cost `parse_string` must keep up with
+
+run with `python -m benchmarks.tree_template`
+"""
+
+from xml.etree import ElementTree as XML
+
+from btpy import BehaviorTree, Blackboard, BTParser, NodeRegistration
+from btpy.core import RootTree, SubTree, TreeTemplate
+
+from benchmarks._harness import measure, report
+
+
+def single_pass_parse(xml: str) -> RootTree:
+    """the previous implementation of `BTParser.parse_string`, for reference"""
+    root = XML.fromstring(xml)
+    descriptions = {tree.attrib["ID"]: tree[0] for tree in root}
+
+    def load(element: XML.Element) -> BehaviorTree:
+        name, attrs = element.tag, element.attrib.copy()
+        if name == "SubTree":
+            name = attrs.pop("ID")
+            return SubTree(name, load(descriptions[name]), **attrs)
+
+        children = [load(child) for child in element]
+        return NodeRegistration.get(name)(children, **attrs)
+
+    main = root.attrib["main_tree_to_execute"]
+    return RootTree(main, load(descriptions[main])).attach_blackboard(Blackboard())
+
+
+def generate_xml(width: int, depth: int) -> str:
+    """a library with one `depth`-deep subtree, referenced `width` times by main"""
+    nested = "<Sequence><ForceSuccess><Fallback /></ForceSuccess>" * depth
+    nested = nested + "</Sequence>" * depth
+    calls = "".join(
+        f'<SubTree ID="nested" name="call_{i}" value="{{value_{i}}}" />'
+        for i in range(width)
+    )
+    return f"""
+<?xml version="1.0" encoding="UTF-8"?>
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <BehaviorTree ID="main"><ReactiveSequence>{calls}</ReactiveSequence></BehaviorTree>
+  <BehaviorTree ID="nested">{nested}</BehaviorTree>
+</root>
+""".strip()
+
+
+def main() -> None:
+    for width, depth in [(1, 10), (10, 10), (50, 20)]:
+        xml = generate_xml(width, depth)
+        template: TreeTemplate = BTParser().parse_template_string(xml)
+        number = max(1, 2_000 // (width * depth))
+        report(
+            f"instantiate a tree of {width} subtrees x {depth} levels",
+            [
+                ("single-pass parse", measure(lambda: single_pass_parse(xml), number)),
+                ("parse_string", measure(lambda: BTParser().parse_string(xml), number)),
+                ("template.instantiate", measure(template.instantiate, number)),
+            ],
+            unit="trees/s",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
 from btpy import builtins, core
 from btpy.builtins import StatefulActionNode
-from btpy.core import BehaviorTree, Blackboard, BTParser, NodeRegistration, NodeStatus
+from btpy.core import (
+    BehaviorTree,
+    Blackboard,
+    BTParser,
+    NodeRegistration,
+    NodeStatus,
+    Port,
+    PortDirection,
+)
 
 __all__ = [
     "BehaviorTree",
@@ -10,5 +18,7 @@ __all__ = [
     "core",
     "NodeRegistration",
     "NodeStatus",
+    "Port",
+    "PortDirection",
     "StatefulActionNode",
 ]
@@ -0,0 +1,40 @@
+import argparse
+import importlib
+from pathlib import Path
+
+from btpy.core import BTParser, BTWriter
+
+
+def main(argv: list[str] | None = None) -> None:
+    """the `btpy` command line interface"""
+    parser = argparse.ArgumentParser(prog="btpy")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_command = commands.add_parser(
+        "compile", help="compile an xml tree description into a binary bundle"
+    )
+    compile_command.add_argument("source", type=Path, help="the xml file to compile")
+    compile_command.add_argument(
+        "-o", "--output", type=Path, help="the bundle to write (default: SOURCE.btpy)"
+    )
+    compile_command.add_argument(
+        "-i",
+        "--import",
+        dest="modules",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help="a module to import first, registering its nodes (may be repeated)",
+    )
+
+    args = parser.parse_args(argv)
+    for module in args.modules:
+        importlib.import_module(module)
+
+    output = args.output or args.source.with_suffix(".btpy")
+    template = BTParser(indexed=True).parse_template(args.source)
+    output.write_bytes(BTWriter.to_bundle(template))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+from typing import TYPE_CHECKING
+
+# numpy is only needed by the `_tick_batch` of the built-in nodes, which only
+# a `BatchedTree` calls, so the nodes can be imported and ticked without it
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+else:
+    try:
+        import numpy as np
+        from numpy.typing import NDArray
+    except ImportError:  # pragma: no cover
+        np = NDArray = None
+
+__all__ = ["NDArray", "np"]
@@ -1,7 +1,17 @@
 import time
-from typing import Iterator, assert_never, override
+from abc import abstractmethod
+from typing import Iterator, override
 
-from btpy.core import BehaviorTree, NodeRegistration, NodeStatus
+from btpy.builtins._impl.batching import NDArray, np
+from btpy.core import (
+    BatchedTree,
+    BehaviorTree,
+    NodeRegistration,
+    NodeStatus,
+    Port,
+    TickCode,
+    TickSteps,
+)
 
 
 class _Decorator(BehaviorTree):
@@ -22,12 +32,83 @@ class _Decorator(BehaviorTree):
 
         return status
 
+    def _child_steps(self) -> TickSteps:
+        """`tick_child`, as part of `_tick_steps`"""
+        match status := (yield self.child()):
+            case NodeStatus.SUCCESS | NodeStatus.FAILURE:
+                self.child().halt()
+
+        return status
+
+    def _compile_child(self, code: TickCode, status: str) -> None:
+        """`tick_child`, as part of `_compile_tick`"""
+        code.tick(self.child(), status)
+        with code.block(f"if {status} is SUCCESS or {status} is FAILURE:"):
+            code.line(f"{code.constant(self.child())}.halt()")
+
+    def _tick_child_batch(
+        self, batch: BatchedTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        """`tick_child`, as part of `_tick_batch`"""
+        statuses = batch.tick_node(self.child(), agents)
+        finished = (statuses == NodeStatus.SUCCESS.value) | (
+            statuses == NodeStatus.FAILURE.value
+        )
+        batch.halt_node(self.child(), agents[finished])
+        return statuses
+
+
+class _StatusDecorator(_Decorator):
+    """
+    a decorator that ticks its child once, and only changes its status
+
+    its status must only depend on its child's, so that
+    `_compile_tick` can replace `_decorate` with a lookup
+    """
+
+    @abstractmethod
+    def _decorate(self, status: NodeStatus) -> NodeStatus:
+        """get the decorator's status from the child's"""
 
-@NodeRegistration.register
-class Inverter(_Decorator):
     @override
     def _do_tick(self) -> NodeStatus:
-        match status := self.tick_child():
+        return self._decorate(self.tick_child())
+
+    @override
+    def _tick_steps(self) -> TickSteps:
+        # `_child_steps` inlined, since a nested generator costs as much as the tick
+        match status := (yield self.child()):
+            case NodeStatus.SUCCESS | NodeStatus.FAILURE:
+                self.child().halt()
+
+        return self._decorate(status)
+
+    @override
+    def _compile_tick(self, code: TickCode, node: str, status: str) -> None:
+        self._compile_child(code, status)
+        keyword = "if"
+        for child_status in NodeStatus:
+            decorated = self._decorate(child_status)
+            if decorated != child_status:
+                with code.block(f"{keyword} {status} is {child_status.name}:"):
+                    code.line(f"{status} = {decorated.name}")
+                keyword = "elif"
+
+    def _tick_batch(
+        self, batch: BatchedTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        # the decorated status of each child status, indexed by its value
+        decorated = np.zeros(len(NodeStatus) + 1, np.uint8)
+        for status in NodeStatus:
+            decorated[status.value] = self._decorate(status).value
+        return decorated[self._tick_child_batch(batch, agents)]
+
+
+@NodeRegistration.register
+class Inverter(_StatusDecorator):
+    @override
+    def _decorate(self, status: NodeStatus) -> NodeStatus:
+        match status:
             case NodeStatus.SUCCESS:
                 return NodeStatus.FAILURE
 
@@ -39,10 +120,10 @@ class Inverter(_Decorator):
 
 
 @NodeRegistration.register
-class ForceSuccess(_Decorator):
+class ForceSuccess(_StatusDecorator):
     @override
-    def _do_tick(self) -> NodeStatus:
-        match self.tick_child():
+    def _decorate(self, status: NodeStatus) -> NodeStatus:
+        match status:
             case NodeStatus.RUNNING:
                 return NodeStatus.RUNNING
 
@@ -51,10 +132,10 @@ class ForceSuccess(_Decorator):
 
 
 @NodeRegistration.register
-class ForceFailure(_Decorator):
+class ForceFailure(_StatusDecorator):
     @override
-    def _do_tick(self) -> NodeStatus:
-        match self.tick_child():
+    def _decorate(self, status: NodeStatus) -> NodeStatus:
+        match status:
             case NodeStatus.RUNNING:
                 return NodeStatus.RUNNING
 
@@ -64,26 +145,35 @@ class ForceFailure(_Decorator):
 
 @NodeRegistration.register
 class Repeat(_Decorator):
+    num_cycles = Port(int)
+
     @override
     def init(self) -> None:
         super().init()
-        self.__idx = 0
+        # the cycles completed, which the code from `_compile_tick` also updates
+        self._index = 0
 
     @override
     def halt(self) -> None:
         super().halt()
-        self.__idx = 0
+        self._index = 0
 
     @override
     def _do_tick(self) -> NodeStatus:
-        num_cycles = self.get("num_cycles", int).value
+        return self._tick_by_steps()
+
+    @override
+    def _tick_steps(self) -> TickSteps:
+        num_cycles = self.num_cycles.value
         if num_cycles is None or num_cycles < -1:
             return NodeStatus.FAILURE
 
-        iterator = self.__forever() if num_cycles < 0 else range(self.__idx, num_cycles)
+        iterator = (
+            self.__forever() if num_cycles < 0 else range(self._index, num_cycles)
+        )
 
         for _ in iterator:
-            match status := self.tick_child():
+            match status := (yield from self._child_steps()):
                 case NodeStatus.RUNNING:
                     return NodeStatus.RUNNING
 
@@ -91,14 +181,53 @@ class Repeat(_Decorator):
                     return status
 
                 case NodeStatus.SUCCESS:
-                    self.__idx = self.__idx + 1
-                    continue
-
-                case _:  # pragma: no cover
-                    assert_never(self)
+                    self._index = self._index + 1
 
         return NodeStatus.SUCCESS
 
+    @override
+    def _compile_tick(self, code: TickCode, node: str, status: str) -> None:
+        num_cycles = code.variable()
+        code.line(f"{num_cycles} = {code.port(self, 'num_cycles', self.num_cycles)}")
+        index = f"{node}._index"
+        with code.block(f"if {num_cycles} is None or {num_cycles} < -1:"):
+            code.line(f"{status} = FAILURE")
+        with code.block("else:"):
+            with code.block(
+                f"while {num_cycles} < 0 or {index} < {num_cycles}:", loop=True
+            ):
+                self._compile_child(code, status)
+                with code.block(f"if {status} is not SUCCESS:"):
+                    code.line("break")
+                code.line(f"{index} = {index} + 1")
+            with code.block("else:"):
+                code.line(f"{status} = SUCCESS")
+
+    def _tick_batch(
+        self, batch: BatchedTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        num_cycles = self.num_cycles.value
+        if num_cycles is None or num_cycles < -1:
+            return np.full(agents.shape, NodeStatus.FAILURE.value, np.uint8)
+
+        index = batch.state(self, "index")
+        statuses = np.full(agents.shape, NodeStatus.SUCCESS.value, np.uint8)
+        here = np.arange(agents.size)
+        while True:
+            if num_cycles >= 0:
+                here = here[index[agents[here]] < num_cycles]
+            if not here.size:
+                return statuses
+
+            child_statuses = self._tick_child_batch(batch, agents[here])
+            stopped = child_statuses != NodeStatus.SUCCESS.value
+            statuses[here[stopped]] = child_statuses[stopped]
+            here = here[~stopped]
+            index[agents[here]] += 1
+
+    def _halt_batch(self, batch: BatchedTree, agents: "NDArray[np.intp]") -> None:
+        batch.state(self, "index")[agents] = 0
+
     def __forever(self) -> Iterator[None]:
         while True:
             yield
@@ -106,29 +235,68 @@ class Repeat(_Decorator):
 
 @NodeRegistration.register
 class RetryUntilSuccessful(_Decorator):
+    num_attempts = Port(int)
+
     @override
     def _do_tick(self) -> NodeStatus:
-        num_attempts = self.get("num_attempts", int).value
+        return self._tick_by_steps()
+
+    @override
+    def _tick_steps(self) -> TickSteps:
+        num_attempts = self.num_attempts.value
         if num_attempts is None or num_attempts < -1:
             return NodeStatus.FAILURE
 
         iterator = self.__forever() if num_attempts < 0 else range(num_attempts)
 
         for _ in iterator:
-            match status := self.tick_child():
+            match status := (yield from self._child_steps()):
                 case NodeStatus.RUNNING:
                     return NodeStatus.RUNNING
 
                 case NodeStatus.SUCCESS | NodeStatus.SKIPPED:
                     return status
 
-                case NodeStatus.FAILURE:
-                    continue
+        return NodeStatus.FAILURE
+
+    @override
+    def _compile_tick(self, code: TickCode, node: str, status: str) -> None:
+        num_attempts, attempt = code.variable(), code.variable()
+        code.line(
+            f"{num_attempts} = {code.port(self, 'num_attempts', self.num_attempts)}"
+        )
+        with code.block(f"if {num_attempts} is None or {num_attempts} < -1:"):
+            code.line(f"{status} = FAILURE")
+        with code.block("else:"):
+            code.line(f"{attempt} = 0")
+            with code.block(
+                f"while {num_attempts} < 0 or {attempt} < {num_attempts}:", loop=True
+            ):
+                code.line(f"{attempt} = {attempt} + 1")
+                self._compile_child(code, status)
+                with code.block(f"if {status} is not FAILURE:"):
+                    code.line("break")
+            with code.block("else:"):
+                code.line(f"{status} = FAILURE")
+
+    def _tick_batch(
+        self, batch: BatchedTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        num_attempts = self.num_attempts.value
+        statuses = np.full(agents.shape, NodeStatus.FAILURE.value, np.uint8)
+        if num_attempts is None or num_attempts < -1:
+            return statuses
 
-                case _:  # pragma: no cover
-                    assert_never(self)
+        # every agent still retrying has made the same number of attempts
+        here, attempt = np.arange(agents.size), 0
+        while here.size and (num_attempts < 0 or attempt < num_attempts):
+            attempt = attempt + 1
+            child_statuses = self._tick_child_batch(batch, agents[here])
+            stopped = child_statuses != NodeStatus.FAILURE.value
+            statuses[here[stopped]] = child_statuses[stopped]
+            here = here[~stopped]
 
-        return NodeStatus.FAILURE
+        return statuses
 
     def __forever(self) -> Iterator[None]:
         while True:
@@ -136,10 +304,10 @@ class RetryUntilSuccessful(_Decorator):
 
 
 @NodeRegistration.register
-class KeepRunningUntilFailure(_Decorator):
+class KeepRunningUntilFailure(_StatusDecorator):
     @override
-    def _do_tick(self) -> NodeStatus:
-        match status := self.tick_child():
+    def _decorate(self, status: NodeStatus) -> NodeStatus:
+        match status:
             case NodeStatus.FAILURE | NodeStatus.SKIPPED:
                 return status
 
@@ -149,6 +317,8 @@ class KeepRunningUntilFailure(_Decorator):
 
 @NodeRegistration.register
 class Delay(_Decorator):
+    delay_msec = Port(int)
+
     def init(self) -> None:
         super().init()
         self.__start_time: int | None = None
@@ -160,8 +330,46 @@ class Delay(_Decorator):
 
     @override
     def _do_tick(self) -> NodeStatus:
+        return self._tick_by_steps()
+
+    @override
+    def _tick_steps(self) -> TickSteps:
+        status = self.__wait()
+        if status is not None:
+            return status
+
+        return (yield self.child())
+
+    @override
+    def _compile_tick(self, code: TickCode, node: str, status: str) -> None:
+        code.line(f"{status} = {code.constant(self.__wait)}()")
+        with code.block(f"if {status} is None:"):
+            # intentionally not self._compile_child()
+            code.tick(self.child(), status)
+
+    def _tick_batch(
+        self, batch: BatchedTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        # the start time of each agent's delay, or 0 before it starts
+        start_time, now = batch.state(self, "start_time"), time.time_ns()
+        start_time[agents[start_time[agents] == 0]] = now
+        delay = self.delay_msec.value
+        if delay is None:
+            return np.full(agents.shape, NodeStatus.FAILURE.value, np.uint8)
+
+        statuses = np.full(agents.shape, NodeStatus.RUNNING.value, np.uint8)
+        elapsed = np.flatnonzero(now >= start_time[agents] + delay * 1_000_000)
+        # intentionally not self._tick_child_batch()
+        statuses[elapsed] = batch.tick_node(self.child(), agents[elapsed])
+        return statuses
+
+    def _halt_batch(self, batch: BatchedTree, agents: "NDArray[np.intp]") -> None:
+        batch.state(self, "start_time")[agents] = 0
+
+    def __wait(self) -> NodeStatus | None:
+        """get the status while the delay has not elapsed yet"""
         self.__start_time = self.__start_time or time.time_ns()
-        delay = self.get("delay_msec", int).value
+        delay = self.delay_msec.value
         if delay is None:
             return NodeStatus.FAILURE
 
@@ -169,27 +377,68 @@ class Delay(_Decorator):
         if time.time_ns() < end_time:
             return NodeStatus.RUNNING
 
-        # intentionally not self.tick_child()
-        return self.child().tick()
+        return None
 
 
 @NodeRegistration.register
 class RunOnce(_Decorator):
+    then_skip = Port(bool)
+
     def init(self) -> None:
         super().init()
-        self.__final_status: NodeStatus | None = None
+        # the child's status once it finished, which the code from `_compile_tick` reads
+        self._final_status: NodeStatus | None = None
 
     @override
     def _do_tick(self) -> NodeStatus:
-        if self.__final_status is None:
-            match status := self.tick_child():
-                case NodeStatus.RUNNING:
-                    return status
+        return self._tick_by_steps()
 
-                case _:
-                    self.__final_status = status
-                    return status
+    @override
+    def _tick_steps(self) -> TickSteps:
+        if self._final_status is None:
+            return self.__finish((yield from self._child_steps()))
+
+        return self.__skip(self._final_status)
+
+    @override
+    def _compile_tick(self, code: TickCode, node: str, status: str) -> None:
+        final_status = f"{node}._final_status"
+        with code.block(f"if {final_status} is None:"):
+            self._compile_child(code, status)
+            code.line(f"{status} = {code.constant(self.__finish)}({status})")
+        with code.block("else:"):
+            code.line(f"{status} = {code.constant(self.__skip)}({final_status})")
+
+    def _tick_batch(
+        self, batch: BatchedTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        # the value of each agent's final status, or 0 before it finishes
+        final_status = batch.state(self, "final_status")
+        statuses = np.empty(agents.shape, np.uint8)
+        unfinished = final_status[agents] == 0
+        skipped = np.flatnonzero(~unfinished)
+        if skipped.size:
+            then_skip = self.then_skip.value
+            then_skip = True if then_skip is None else then_skip
+            statuses[skipped] = (
+                NodeStatus.SKIPPED.value if then_skip else final_status[agents[skipped]]
+            )
+
+        here = np.flatnonzero(unfinished)
+        child_statuses = self._tick_child_batch(batch, agents[here])
+        statuses[here] = child_statuses
+        finished = child_statuses != NodeStatus.RUNNING.value
+        final_status[agents[here[finished]]] = child_statuses[finished]
+        return statuses
+
+    def __finish(self, status: NodeStatus) -> NodeStatus:
+        """remember the child's status once it has finished"""
+        if status != NodeStatus.RUNNING:
+            self._final_status = status
+        return status
 
-        then_skip = self.get("then_skip", bool).value
+    def __skip(self, final_status: NodeStatus) -> NodeStatus:
+        """get the status once the child has finished"""
+        then_skip = self.then_skip.value
         then_skip = True if then_skip is None else then_skip
-        return NodeStatus.SKIPPED if then_skip else self.__final_status
+        return NodeStatus.SKIPPED if then_skip else final_status
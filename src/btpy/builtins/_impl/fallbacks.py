@@ -1,6 +1,14 @@
-from typing import assert_never, override
+from typing import override
 
-from btpy.core import BehaviorTree, NodeRegistration, NodeStatus
+from btpy.builtins._impl.batching import NDArray, np
+from btpy.core import (
+    BatchedTree,
+    BehaviorTree,
+    NodeRegistration,
+    NodeStatus,
+    TickCode,
+    TickSteps,
+)
 
 
 @NodeRegistration.register
@@ -16,8 +24,12 @@ class Fallback(BehaviorTree):
 
     @override
     def _do_tick(self) -> NodeStatus:
+        return self._tick_by_steps()
+
+    @override
+    def _tick_steps(self) -> TickSteps:
         for self._index in range(self._index, len(self.children())):
-            match self.children()[self._index].tick():
+            match (yield self.children()[self._index]):
                 case NodeStatus.SUCCESS:
                     self.halt()
                     return NodeStatus.SUCCESS
@@ -25,24 +37,64 @@ class Fallback(BehaviorTree):
                 case NodeStatus.RUNNING:
                     return NodeStatus.RUNNING
 
-                case NodeStatus.SKIPPED | NodeStatus.FAILURE:
-                    continue
-
-                case _:  # pragma: no cover
-                    assert_never(self)
-
         self.halt()
         return NodeStatus.FAILURE
 
+    @override
+    def _compile_tick(self, code: TickCode, node: str, status: str) -> None:
+        index = code.variable()
+        code.line(f"{index} = {node}._index")
+        with code.block("while True:", loop=True):
+            for i, child in enumerate(self.children()):
+                with code.block(f"if {index} <= {i}:"):
+                    code.line(f"{node}._index = {i}")
+                    code.tick(child, status)
+                    with code.block(f"if {status} is SUCCESS:"):
+                        code.line(f"{node}.halt()")
+                        code.line("break")
+                    with code.block(f"if {status} is RUNNING:"):
+                        code.line("break")
+
+            code.line(f"{node}.halt()")
+            code.line(f"{status} = FAILURE")
+            code.line("break")
+
+    def _tick_batch(
+        self, batch: BatchedTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        index = batch.state(self, "index")
+        statuses = np.full(agents.shape, NodeStatus.FAILURE.value, np.uint8)
+        # whether each agent has yet to stop at a child
+        ticking = np.ones(agents.shape, np.bool_)
+        for i, child in enumerate(self.children()):
+            here = np.flatnonzero(ticking & (index[agents] <= i))
+            index[agents[here]] = i
+            child_statuses = batch.tick_node(child, agents[here])
+            stopped = (child_statuses == NodeStatus.SUCCESS.value) | (
+                child_statuses == NodeStatus.RUNNING.value
+            )
+            statuses[here[stopped]] = child_statuses[stopped]
+            ticking[here[stopped]] = False
+
+        batch.halt_node(self, agents[statuses != NodeStatus.RUNNING.value])
+        return statuses
+
+    def _halt_batch(self, batch: BatchedTree, agents: "NDArray[np.intp]") -> None:
+        batch.state(self, "index")[agents] = 0
+
 
 @NodeRegistration.register
 class ReactiveFallback(BehaviorTree):
     @override
     def _do_tick(self) -> NodeStatus:
+        return self._tick_by_steps()
+
+    @override
+    def _tick_steps(self) -> TickSteps:
         status = NodeStatus.FAILURE
 
         for child in self.children():
-            match child.tick():
+            match (yield child):
                 case NodeStatus.SUCCESS:
                     self.halt()
                     return NodeStatus.SUCCESS
@@ -50,13 +102,42 @@ class ReactiveFallback(BehaviorTree):
                 case NodeStatus.RUNNING:
                     status = NodeStatus.RUNNING
 
-                case NodeStatus.SKIPPED | NodeStatus.FAILURE:
-                    continue
-
-                case _:  # pragma: no cover
-                    assert_never(self)
-
         if status == NodeStatus.FAILURE:
             self.halt()
 
         return status
+
+    @override
+    def _compile_tick(self, code: TickCode, node: str, status: str) -> None:
+        result = code.variable()
+        code.line(f"{result} = FAILURE")
+        with code.block("while True:", loop=True):
+            for child in self.children():
+                code.tick(child, status)
+                with code.block(f"if {status} is SUCCESS:"):
+                    code.line(f"{node}.halt()")
+                    code.line("break")
+                with code.block(f"if {status} is RUNNING:"):
+                    code.line(f"{result} = RUNNING")
+
+            with code.block(f"if {result} is FAILURE:"):
+                code.line(f"{node}.halt()")
+            code.line(f"{status} = {result}")
+            code.line("break")
+
+    def _tick_batch(
+        self, batch: BatchedTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        statuses = np.full(agents.shape, NodeStatus.FAILURE.value, np.uint8)
+        here = np.arange(agents.size)
+        for child in self.children():
+            child_statuses = batch.tick_node(child, agents[here])
+            succeeded = child_statuses == NodeStatus.SUCCESS.value
+            statuses[here[succeeded]] = NodeStatus.SUCCESS.value
+            statuses[
+                here[child_statuses == NodeStatus.RUNNING.value]
+            ] = NodeStatus.RUNNING.value
+            here = here[~succeeded]
+
+        batch.halt_node(self, agents[statuses != NodeStatus.RUNNING.value])
+        return statuses
@@ -2,7 +2,7 @@ from abc import abstractmethod
 from contextlib import contextmanager
 from typing import Final, Iterator, TypeVar, final, override
 
-from btpy.core import BehaviorTree, NodeStatus
+from btpy.core import BehaviorTree, NodeStatus, TickCode, TickSteps
 
 _T = TypeVar("_T")
 
@@ -31,3 +31,16 @@ class Observer(BehaviorTree):
     def _do_tick(self) -> NodeStatus:
         with self.observe(self.__observed):
             return self.__node.tick()
+
+    @final
+    @override
+    def _tick_steps(self) -> TickSteps:
+        with self.observe(self.__observed):
+            return (yield self.__node)
+
+    @final
+    @override
+    def _compile_tick(self, code: TickCode, node: str, status: str) -> None:
+        observed = code.constant(self.__observed)
+        with code.block(f"with {node}.observe({observed}):", loop=True):
+            code.tick(self.__node, status)
@@ -1,6 +1,14 @@
-from typing import assert_never, override
+from typing import override
 
-from btpy.core import BehaviorTree, NodeRegistration, NodeStatus
+from btpy.builtins._impl.batching import NDArray, np
+from btpy.core import (
+    BatchedTree,
+    BehaviorTree,
+    NodeRegistration,
+    NodeStatus,
+    TickCode,
+    TickSteps,
+)
 
 
 @NodeRegistration.register
@@ -11,8 +19,12 @@ class SequenceWithMemory(BehaviorTree):
 
     @override
     def _do_tick(self) -> NodeStatus:
+        return self._tick_by_steps()
+
+    @override
+    def _tick_steps(self) -> TickSteps:
         for self._index in range(self._index, len(self.children())):
-            match self.children()[self._index].tick():
+            match (yield self.children()[self._index]):
                 case NodeStatus.FAILURE:
                     self.halt()
                     return NodeStatus.FAILURE
@@ -20,15 +32,48 @@ class SequenceWithMemory(BehaviorTree):
                 case NodeStatus.RUNNING:
                     return NodeStatus.RUNNING
 
-                case NodeStatus.SKIPPED | NodeStatus.SUCCESS:
-                    continue
-
-                case _:  # pragma: no cover
-                    assert_never(self)
-
         self.halt()
         return NodeStatus.SUCCESS
 
+    @override
+    def _compile_tick(self, code: TickCode, node: str, status: str) -> None:
+        index = code.variable()
+        code.line(f"{index} = {node}._index")
+        with code.block("while True:", loop=True):
+            for i, child in enumerate(self.children()):
+                with code.block(f"if {index} <= {i}:"):
+                    code.line(f"{node}._index = {i}")
+                    code.tick(child, status)
+                    with code.block(f"if {status} is FAILURE:"):
+                        code.line(f"{node}.halt()")
+                        code.line("break")
+                    with code.block(f"if {status} is RUNNING:"):
+                        code.line("break")
+
+            code.line(f"{node}.halt()")
+            code.line(f"{status} = SUCCESS")
+            code.line("break")
+
+    def _tick_batch(
+        self, batch: BatchedTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        index = batch.state(self, "index")
+        statuses = np.full(agents.shape, NodeStatus.SUCCESS.value, np.uint8)
+        # whether each agent has yet to stop at a child
+        ticking = np.ones(agents.shape, np.bool_)
+        for i, child in enumerate(self.children()):
+            here = np.flatnonzero(ticking & (index[agents] <= i))
+            index[agents[here]] = i
+            child_statuses = batch.tick_node(child, agents[here])
+            stopped = (child_statuses == NodeStatus.FAILURE.value) | (
+                child_statuses == NodeStatus.RUNNING.value
+            )
+            statuses[here[stopped]] = child_statuses[stopped]
+            ticking[here[stopped]] = False
+
+        batch.halt_node(self, agents[statuses != NodeStatus.RUNNING.value])
+        return statuses
+
 
 @NodeRegistration.register
 class Sequence(SequenceWithMemory):
@@ -37,27 +82,60 @@ class Sequence(SequenceWithMemory):
         super().halt()
         self._index = 0
 
+    def _halt_batch(self, batch: BatchedTree, agents: "NDArray[np.intp]") -> None:
+        batch.state(self, "index")[agents] = 0
+
 
 @NodeRegistration.register
 class ReactiveSequence(BehaviorTree):
     @override
     def _do_tick(self) -> NodeStatus:
+        return self._tick_by_steps()
+
+    @override
+    def _tick_steps(self) -> TickSteps:
         for i, child in enumerate(self.children()):
-            match child.tick():
+            match (yield child):
                 case NodeStatus.FAILURE:
                     self.halt()
                     return NodeStatus.FAILURE
 
                 case NodeStatus.RUNNING:
-                    for sibling in self.children()[i + 1 :]:
-                        sibling.halt()
+                    self._halt_children(i + 1)
                     return NodeStatus.RUNNING
 
-                case NodeStatus.SKIPPED | NodeStatus.SUCCESS:
-                    continue
-
-                case _:  # pragma: no cover
-                    assert_never(self)
-
         self.halt()
         return NodeStatus.SUCCESS
+
+    @override
+    def _compile_tick(self, code: TickCode, node: str, status: str) -> None:
+        with code.block("while True:", loop=True):
+            for i, child in enumerate(self.children()):
+                code.tick(child, status)
+                with code.block(f"if {status} is FAILURE:"):
+                    code.line(f"{node}.halt()")
+                    code.line("break")
+                with code.block(f"if {status} is RUNNING:"):
+                    code.line(f"{node}._halt_children({i + 1})")
+                    code.line("break")
+
+            code.line(f"{node}.halt()")
+            code.line(f"{status} = SUCCESS")
+            code.line("break")
+
+    def _tick_batch(
+        self, batch: BatchedTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        statuses = np.full(agents.shape, NodeStatus.SUCCESS.value, np.uint8)
+        here = np.arange(agents.size)
+        for i, child in enumerate(self.children()):
+            child_statuses = batch.tick_node(child, agents[here])
+            failed = child_statuses == NodeStatus.FAILURE.value
+            running = child_statuses == NodeStatus.RUNNING.value
+            statuses[here[failed]] = NodeStatus.FAILURE.value
+            statuses[here[running]] = NodeStatus.RUNNING.value
+            batch.halt_children(self, agents[here[running]], i + 1)
+            here = here[~(failed | running)]
+
+        batch.halt_node(self, agents[statuses != NodeStatus.RUNNING.value])
+        return statuses
@@ -1,7 +1,22 @@
-from btpy.core._impl.behavior_tree import BehaviorTree
-from btpy.core._impl.blackboard import Blackboard, BlackboardChildType
+from btpy.core._impl.batched_tree import BatchedTree, BatchLeaf
+from btpy.core._impl.behavior_tree import (
+    BehaviorTree,
+    Port,
+    PortDirection,
+    RootTree,
+    SubTree,
+    TickSteps,
+)
+from btpy.core._impl.blackboard import (
+    Blackboard,
+    BlackboardBinding,
+    BlackboardChildType,
+    BlackboardSnapshot,
+)
+from btpy.core._impl.blackboard_profiler import BlackboardProfiler, ProfileRow
 from btpy.core._impl.bt_parser import BTParser
 from btpy.core._impl.bt_writer import BTWriter
+from btpy.core._impl.include_cache import IncludeCache
 from btpy.core._impl.layered_dict import LayeredDict
 from btpy.core._impl.node_registration import (
     BehaviorTreeFactory,
@@ -10,17 +25,44 @@ from btpy.core._impl.node_registration import (
 )
 from btpy.core._impl.node_status import NodeStatus
 from btpy.core._impl.pointer import Pointer
+from btpy.core._impl.shared_blackboard import SharedBlackboard
+from btpy.core._impl.tick_compiler import CompiledTick, TickCode
+from btpy.core._impl.tree_diff import ChangeKind, TreeChange, TreeDiff
+from btpy.core._impl.tree_reloader import TreeReloader
+from btpy.core._impl.tree_template import NodePlan, SubTreePlan, TreeTemplate
 
 __all__ = [
+    "BatchedTree",
+    "BatchLeaf",
     "BehaviorTree",
     "BehaviorTreeFactory",
     "BehaviorTreeFactoryFunction",
     "Blackboard",
+    "BlackboardBinding",
     "BlackboardChildType",
+    "BlackboardProfiler",
+    "BlackboardSnapshot",
     "BTParser",
     "BTWriter",
+    "ChangeKind",
+    "CompiledTick",
+    "IncludeCache",
     "LayeredDict",
+    "NodePlan",
     "NodeRegistration",
     "NodeStatus",
     "Pointer",
+    "Port",
+    "PortDirection",
+    "ProfileRow",
+    "RootTree",
+    "SharedBlackboard",
+    "SubTree",
+    "SubTreePlan",
+    "TickCode",
+    "TickSteps",
+    "TreeChange",
+    "TreeDiff",
+    "TreeReloader",
+    "TreeTemplate",
 ]
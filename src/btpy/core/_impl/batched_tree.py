@@ -0,0 +1,180 @@
+from functools import partial
+from typing import Any, Callable, Final, Mapping
+
+from btpy.core._impl.behavior_tree import BehaviorTree, SubTree, _implements
+from btpy.core._impl.node_status import NodeStatus
+
+try:
+    import numpy as np
+    from numpy.typing import ArrayLike, NDArray
+
+    _NUMPY = True
+except ImportError:  # pragma: no cover
+    _NUMPY = False
+
+# a vectorized leaf, which ticks the agents at the given indices and
+# returns the value of each one's `NodeStatus` (or one value for them all)
+BatchLeaf = Callable[["NDArray[np.intp]"], "ArrayLike"]
+
+
+class BatchedTree:
+    """
+    a batch of `size` agents each running its own copy of an attached tree,
+    whose nodes are ticked for every agent at once with numpy
+
+    each node's status, whether it is active, and its state are kept in
+    arrays with an entry per agent; the nodes named in `leaves` are ticked
+    by their vectorized function, subtrees tick their root, and every other
+    node is ticked by its `_tick_batch(batch, agents)`, which each built-in
+    node but the `Observer` implements
+
+    `_tick_batch` returns the value of each agent's status, ticking the
+    node's children with `tick_node`; a node that resets state when it is
+    halted also implements `_halt_batch(batch, agents)`, which is called
+    like `halt` for the agents it halts
+
+    the agents share the tree's blackboard, so each port is read once for
+    the whole batch; data that differs between agents should be kept in
+    arrays that the leaves index
+    """
+
+    def __init__(
+        self, root: BehaviorTree, size: int, leaves: Mapping[str, BatchLeaf] = {}
+    ) -> None:
+        if not _NUMPY:  # pragma: no cover
+            raise ImportError("a BatchedTree requires numpy")
+
+        root.blackboard()
+        self.__root: Final = root
+        self.__size: Final = size
+        self.__agents: Final = np.arange(size)
+        # each node's position in the arrays, the functions that tick and halt it,
+        # and its children
+        self.__slots: Final = dict[BehaviorTree, int]()
+        self.__ticks: Final = list[Callable[[NDArray[np.intp]], NDArray[np.uint8]]]()
+        self.__halts: Final = list[
+            Callable[[BatchedTree, NDArray[np.intp]], None] | None
+        ]()
+        self.__children: Final = list[list[BehaviorTree]]()
+        self.__state: Final = dict[tuple[int, str], NDArray[Any]]()
+
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            self.__slots[node] = len(self.__ticks)
+            leaf = leaves.get(node.name())
+            if leaf is not None:
+                self.__ticks.append(partial(self.__tick_leaf, leaf))
+                self.__halts.append(None)
+                self.__children.append([])
+                continue
+
+            if _implements(type(node), "_tick_batch"):
+                self.__ticks.append(partial(getattr(node, "_tick_batch"), self))
+            elif isinstance(node, SubTree) and type(node)._do_tick is SubTree._do_tick:
+                self.__ticks.append(partial(self.__tick_subtree, node))
+            else:
+                raise ValueError(
+                    f"{node.name()} cannot be ticked in a batch, expected a leaf for it"
+                )
+            self.__halts.append(getattr(node, "_halt_batch", None))
+            self.__children.append(list(node.children()))
+            stack.extend(reversed(node.children()))
+
+        shape = (len(self.__ticks), size)
+        self.__statuses: Final = np.full(shape, NodeStatus.SKIPPED.value, np.uint8)
+        self.__halted: Final = np.ones(shape, np.bool_)
+
+    def size(self) -> int:
+        """get the number of agents"""
+        return self.__size
+
+    def tick(self, agents: "ArrayLike | None" = None) -> "NDArray[np.uint8]":
+        """
+        tick the tree for the `agents` at the given indices, or for every
+        agent, returning the value of each one's status
+        """
+        return self.tick_node(self.__root, self.__select(agents))
+
+    def halt(self, agents: "ArrayLike | None" = None) -> None:
+        """halt the tree for the `agents` at the given indices, or for every agent"""
+        self.halt_node(self.__root, self.__select(agents))
+
+    def status(self, node: BehaviorTree) -> "NDArray[np.uint8]":
+        """get the value of the `node`'s status for each agent"""
+        statuses: NDArray[np.uint8] = self.__statuses[self.__slots[node]]
+        return statuses.copy()
+
+    def active(self, node: BehaviorTree) -> "NDArray[np.bool_]":
+        """get whether the `node` has been ticked since it was last halted, for each agent"""
+        halted: NDArray[np.bool_] = self.__halted[self.__slots[node]]
+        return ~halted
+
+    def tick_node(
+        self, node: BehaviorTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        """tick the `node` for the `agents`, like `BehaviorTree.tick`"""
+        if not agents.size:
+            return np.empty(0, np.uint8)
+
+        slot = self.__slots[node]
+        # the parent was activated by its own tick
+        self.__halted[slot, agents] = False
+        statuses = self.__statuses[slot]
+        statuses[agents] = NodeStatus.RUNNING.value
+        result = self.__ticks[slot](agents)
+        statuses[agents] = result
+        return result
+
+    def halt_node(self, node: BehaviorTree, agents: "NDArray[np.intp]") -> None:
+        """halt the `node` and its active descendants for the `agents`"""
+        stack = [(node, agents)]
+        while stack:
+            node, agents = stack.pop()
+            slot = self.__slots[node]
+            halted = self.__halted[slot]
+            # a halted node's descendants are halted too
+            agents = agents[~halted[agents]]
+            if not agents.size:
+                continue
+
+            halted[agents] = True
+            halt = self.__halts[slot]
+            if halt is not None:
+                halt(self, agents)
+            stack.extend((child, agents) for child in self.__children[slot])
+
+    def halt_children(
+        self, node: BehaviorTree, agents: "NDArray[np.intp]", start: int = 0
+    ) -> None:
+        """halt the `node`'s children from the `start`-th on, for the `agents`"""
+        for child in self.__children[self.__slots[node]][start:]:
+            self.halt_node(child, agents)
+
+    def state(
+        self, node: BehaviorTree, name: str, fill: int | float = 0
+    ) -> "NDArray[Any]":
+        """get the `node`'s state `name`, with an entry per agent starting at `fill`"""
+        key = (self.__slots[node], name)
+        state = self.__state.get(key)
+        if state is None:
+            state = self.__state[key] = np.full(self.__size, fill)
+        return state
+
+    def __select(self, agents: "ArrayLike | None") -> "NDArray[np.intp]":
+        if agents is None:
+            return self.__agents
+        return np.asarray(agents, dtype=np.intp)
+
+    def __tick_subtree(
+        self, subtree: SubTree, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        return self.tick_node(subtree.child(), agents)
+
+    def __tick_leaf(
+        self, leaf: BatchLeaf, agents: "NDArray[np.intp]"
+    ) -> "NDArray[np.uint8]":
+        statuses = np.asarray(leaf(agents), dtype=np.uint8)
+        if statuses.shape != agents.shape:
+            statuses = np.full(agents.shape, statuses, np.uint8)
+        return statuses
@@ -1,9 +1,19 @@
+import hashlib
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from enum import Enum
+from functools import wraps
+from types import MappingProxyType
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     Final,
+    Generator,
+    Generic,
+    Iterable,
     Iterator,
+    Mapping,
     Self,
     Sequence,
     TypeVar,
@@ -16,17 +26,292 @@ from btpy.core._impl.blackboard import Blackboard, BlackboardChildType
 from btpy.core._impl.node_status import NodeStatus
 from btpy.core._impl.pointer import Pointer
 
+if TYPE_CHECKING:
+    from btpy.core._impl.tick_compiler import TickCode
+
 _T = TypeVar("_T")
 
+# a tick as a generator, which yields each child to tick and is sent back its status
+TickSteps = Generator["BehaviorTree", NodeStatus, NodeStatus]
+
+# the nodes left to halt, innermost last, while the outermost halt halts them
+_halting = ContextVar[list["BehaviorTree"] | None]("halting", default=None)
+
+
+def node_digest(
+    name: str, ports: Mapping[str, str], children: Iterable[bytes]
+) -> bytes:
+    """hash a node's type and ports along with the digests of its children"""
+    hash = hashlib.blake2b(repr((name, sorted(ports.items()))).encode(), digest_size=16)
+    for child in children:
+        hash.update(child)
+    return hash.digest()
+
+
+def _coerce(value: Any, converter: Callable[[Any], _T]) -> _T:
+    """convert a blackboard value, treating `bool` specially"""
+    if converter is not bool:
+        return converter(value)
+
+    match value:
+        case "true" | True:
+            return True  # type: ignore[return-value]
+
+        case "false" | False:
+            return False  # type: ignore[return-value]
+
+    raise ValueError(f"expected a bool, got {value!r}")
+
+
+def _convert(ptr: Pointer[Any], converter: Callable[[Any], Any] | None) -> Pointer[Any]:
+    """coerce the value at `ptr` in place"""
+    if ptr.value is not None and converter is not None:
+        ptr.value = _coerce(ptr.value, converter)
+    return ptr
+
+
+class PortDirection(Enum):
+    """
+    how a node uses a declared port:
+
+    - `INPUT`: the node reads the value, converted to the port's type
+    - `OUTPUT`: the node writes the value, so the port must be remapped to an entry
+    """
+
+    INPUT = 1
+    OUTPUT = 2
+
+
+class _Converted(Pointer[_T]):
+    """
+    a view of a blackboard entry that converts its value on read, without
+    writing the converted value back to the entry
+
+    the converted value is cached until the entry is written again
+    """
+
+    def __init__(self, source: Pointer[Any], converter: Callable[[Any], _T]) -> None:
+        # the value is read from the source, through the `value` property
+        super().__init__(None)  # type: ignore[arg-type]
+        self.__source = source
+        self.__converter = converter
+        # the version of the entry that was last converted, before any write
+        self.__version = -1
+        self.__converted: _T | None = None
+
+    @staticmethod
+    def of(source: Pointer[Any], converter: Callable[[Any], _T]) -> Pointer[_T]:
+        """get the view of the `source` through the `converter`, creating it once"""
+        views = source._views
+        if views is None:
+            views = source._views = {}
+        view = views.get(converter)
+        if view is None:
+            view = views.setdefault(converter, _Converted(source, converter))
+        return view
+
+    @property  # type: ignore[override]
+    def value(self) -> _T | None:
+        source = self.__source
+        # the version is read first, so a concurrent write is converted again
+        version = source.version()
+        if version != self.__version:
+            raw = source.value
+            self.__converted = None if raw is None else _coerce(raw, self.__converter)
+            self.__version = version
+        return self.__converted
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self.__source.value = value
+
+    @override
+    def version(self) -> int:
+        return self.__source.version()
+
+    @override
+    def subscribe(self, callback: Callable[[Pointer[Any]], None]) -> Callable[[], None]:
+        return self.__source.subscribe(callback)
+
+
+class Port(Generic[_T]):
+    """
+    a port declared by a node type, as a class attribute, similar
+    to the `providedPorts` of a `BehaviorTree.CPP` node
+
+    each node's port is resolved to its blackboard entry once, when the
+    node is attached, after which reading it is an attribute access
+
+    an input port given a literal value is converted when the node is built,
+    so an invalid value raises a `ValueError` while the tree is being parsed;
+    one remapped to an entry is converted each time the entry changes, leaving
+    the entry itself unchanged
+    """
+
+    @overload
+    def __init__(
+        self: "Port[Any]",
+        *,
+        key: str | None = None,
+        direction: PortDirection = PortDirection.INPUT,
+    ) -> None:
+        """declare a port, named `key` or after the attribute"""
+
+    @overload
+    def __init__(
+        self,
+        converter: Callable[[Any], _T],
+        *,
+        key: str | None = None,
+        direction: PortDirection = PortDirection.INPUT,
+    ) -> None:
+        """declare a port whose value is coerced by the `converter`"""
+
+    def __init__(
+        self,
+        converter: Callable[[Any], _T] | None = None,
+        *,
+        key: str | None = None,
+        direction: PortDirection = PortDirection.INPUT,
+    ) -> None:
+        self.__converter = converter
+        self.__key = key
+        self.__direction = direction
+        self.__attribute = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.__key = self.__key or name
+        self.__attribute = f"_port_{name}"
+
+    def key(self) -> str:
+        """get the name of the port"""
+        assert self.__key is not None
+        return self.__key
+
+    def direction(self) -> PortDirection:
+        """get whether the port is read or written by the node"""
+        return self.__direction
+
+    def parse(self, node_type: str, mapping: str) -> Any:
+        """
+        check a port mapping given to a node of type `node_type`,
+        returning the converted value if it is a literal
+        """
+        if mapping.startswith("{"):
+            return None
+
+        if self.__direction == PortDirection.OUTPUT:
+            raise ValueError(
+                f"output port {self.key()} of {node_type} must be remapped to an entry"
+            )
+
+        if self.__converter is None:
+            return mapping
+
+        try:
+            return _coerce(mapping, self.__converter)
+        except (TypeError, ValueError) as e:
+            raise ValueError(
+                f"invalid value {mapping!r} for port {self.key()} of {node_type}: {e}"
+            ) from e
+
+    def bind(self, node: "BehaviorTree", literal: Any = None) -> None:
+        """resolve the `node`'s port to its blackboard entry"""
+        ptr = node.blackboard().get(self.key())
+        if literal is not None:
+            # the node's own entry for the literal, so the converted value is shared
+            ptr.value = literal
+
+        elif self.__converter is not None and self.__direction == PortDirection.INPUT:
+            ptr = _Converted.of(ptr, self.__converter)
+
+        # set without `__dict__`, which would give the node a dict of its own
+        object.__setattr__(node, self.__attribute, ptr)
+
+    @overload
+    def __get__(self, node: None, owner: type) -> Self:
+        pass
+
+    @overload
+    def __get__(self, node: "BehaviorTree", owner: type) -> Pointer[_T | None]:
+        pass
+
+    def __get__(
+        self, node: "BehaviorTree | None", owner: type
+    ) -> "Self | Pointer[_T | None]":
+        if node is None:
+            return self
+
+        ptr: Pointer[_T | None] | None = getattr(node, self.__attribute, None)
+        if ptr is None:
+            return node.get(self.key(), self.__converter)  # type: ignore[arg-type]
+        return ptr
+
 
 class BehaviorTree(ABC):
     """a node in a behavior tree"""
 
+    _name_port = Port(str, key="name")
+
+    # bumped whenever a subtree is replaced, since any node's digest may then be stale
+    __structure_version = 0
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        halt = cls.__dict__.get("halt")
+        if halt is not None:
+            setattr(cls, "halt", BehaviorTree.__halting_descendants(halt))
+
+    @staticmethod
+    def __halting_descendants(
+        halt: Callable[["BehaviorTree"], None],
+    ) -> Callable[["BehaviorTree"], None]:
+        """
+        wrap a `halt` override so that, when it is the outermost halt, it
+        halts the descendants once it returns, as every nested halt's are
+        """
+
+        @wraps(halt)
+        def wrapper(node: BehaviorTree) -> None:
+            if not node.__active or _halting.get() is not None:
+                halt(node)
+                return
+
+            pending = list[BehaviorTree]()
+            token = _halting.set(pending)
+            try:
+                halt(node)
+                while pending:
+                    pending.pop().halt()
+            finally:
+                _halting.reset(token)
+
+        return wrapper
+
     def __init__(
         self, __children: list["BehaviorTree"] | None = None, **ports: str
     ) -> None:
-        self.__children: Final = __children or []
+        # nodes without children share an empty tuple, until they adopt one
+        self.__children: list[BehaviorTree] | tuple[()] = __children or ()
+        self.__parent: BehaviorTree | None = None
+        # the node's position among its parent's children
+        self.__index = 0
+        if __children:
+            for index, child in enumerate(__children):
+                child.__parent, child.__index = self, index
+        self.__digest: bytes | None = None
+        self.__digest_version = BehaviorTree.__structure_version
         self.__ports: Final = ports
+        # the converted values of declared ports that were given literals
+        self.__literals: Final[Mapping[str, Any]] = (
+            {
+                port.key(): port.parse(type(self).__name__, ports[port.key()])
+                for port in _declared_ports(type(self))
+                if port.key() in ports
+            }
+            if ports
+            else _NO_LITERALS
+        )
 
         self.init()
 
@@ -34,13 +319,39 @@ class BehaviorTree(ABC):
         """initialize the node"""
         self.__status: NodeStatus = NodeStatus.SKIPPED
         self.__blackboard: Blackboard | None = None
-        self.__halted: bool = False
+        # a node is active from when it is ticked until it is halted
+        self.__halted: bool = True
+        # the active children, and their positions, so halting skips inactive
+        # subtrees; only allocated once a child is first ticked
+        self.__active: dict[BehaviorTree, int] | None = None
 
-    @final
     def children(self) -> Sequence["BehaviorTree"]:
         """get the node's children"""
         return self.__children
 
+    @final
+    def _adopt(self, child: "BehaviorTree") -> None:
+        """add a `child` after construction, attaching it if the node already was"""
+        if not isinstance(self.__children, list):
+            self.__children = []
+        self.__children.append(child)
+        child.__parent, child.__index = self, len(self.__children) - 1
+        self.__digest = None
+        if self.__blackboard is not None:
+            child.attach_blackboard(self.__blackboard)
+
+    @final
+    def _replace(self, old: "BehaviorTree", new: "BehaviorTree") -> None:
+        """swap the child `old` for `new`, halting `old` and attaching `new`"""
+        assert isinstance(self.__children, list)
+        (index,) = [i for i, child in enumerate(self.__children) if child is old]
+        old.halt()
+        self.__children[index] = new
+        new.__parent, new.__index = self, index
+        BehaviorTree.__structure_version = BehaviorTree.__structure_version + 1
+        if self.__blackboard is not None:
+            new.attach_blackboard(self.__blackboard)
+
     @final
     def mappings(self) -> dict[str, str]:
         """get the node's remapped ports"""
@@ -55,21 +366,211 @@ class BehaviorTree(ABC):
         """tick the node"""
         pass
 
+    def _tick_steps(self) -> TickSteps:
+        """
+        tick the node for `tick_iteratively`, yielding each child to
+        tick instead of calling `tick()` on it
+
+        by default the node is ticked with `_do_tick`, so a node with
+        children should override this with the same semantics
+        """
+        return self._do_tick()
+        yield self  # pragma: no cover
+
+    @final
+    def _tick_by_steps(self) -> NodeStatus:
+        """
+        tick the node through its `_tick_steps`, calling `tick()` on each
+        child it yields, so that `_do_tick` can share its semantics
+        """
+        # the first `send` starts the steps, so it must send `None`
+        send: Callable[[Any], BehaviorTree] = self._tick_steps().send
+        status: NodeStatus | None = None
+        try:
+            while True:
+                status = send(status).tick()
+        except StopIteration as stop:
+            result: NodeStatus = stop.value
+            return result
+
+    def _compile_tick(self, code: "TickCode", node: str, status: str) -> None:
+        """
+        add the `_do_tick` of the node, named `node`, to the `code` of a
+        `CompiledTick`, storing the status in the variable `status`
+
+        by default the code calls `_do_tick`, so a node with children should
+        override this, ticking its children with `code.tick`
+        """
+        code.line(f"{status} = {code.constant(self._do_tick)}()")
+
+    @final
+    def active(self) -> bool:
+        """whether the node has been ticked since it was last halted"""
+        return not self.__halted
+
     @final
     def tick(self) -> NodeStatus:
         """tick the node"""
-        self.__halted = False
+        if self.__halted:
+            self.__activate()
         self.__status = NodeStatus.RUNNING
         self.__status = self._do_tick()
         return self.__status
 
+    @final
+    def _start_tick(self) -> None:
+        """
+        mark the node as running, activating it if it was halted, like `tick`
+        does before `_do_tick`, for an executor that ticks the node itself
+        """
+        if self.__halted:
+            self.__activate()
+        self.__status = NodeStatus.RUNNING
+
+    @final
+    def _finish_tick(self, status: NodeStatus) -> None:
+        """set the node's `status` once an executor has ticked it, like `tick` does"""
+        self.__status = status
+
+    @final
+    def tick_iteratively(self) -> NodeStatus:
+        """
+        tick the node like `tick`, but with an explicit stack of each
+        node's `_tick_steps` instead of recursing into its children,
+        so that trees of any depth can be ticked
+        """
+        running, steps = NodeStatus.RUNNING, _STEPS
+        # each unfinished tick, and the `send` method of its `_tick_steps`
+        stack: list[tuple[BehaviorTree, Callable[[Any], BehaviorTree]]] = []
+        node: BehaviorTree = self
+        while True:
+            if node.__halted:
+                node.__activate()
+            node.__status = running
+            status: NodeStatus | None = None
+            stepped = steps.get(type(node))
+            if stepped is None:
+                stepped = steps[type(node)] = _implements(type(node), "_tick_steps")
+            if not stepped:
+                status = node.__status = node._do_tick()
+                if not stack:
+                    return node.__status
+            else:
+                stack.append((node, node._tick_steps().send))
+
+            # resume the innermost tick until it yields a child, unwinding finished ticks
+            while True:
+                owner, send = stack[-1]
+                try:
+                    node = send(status)
+                    break
+                except StopIteration as stop:
+                    stack.pop()
+                    status = owner.__status = stop.value
+                    if not stack:
+                        return owner.__status
+
     def halt(self) -> None:
-        """halt the node"""
+        """
+        halt the node and its active descendants
+
+        so that trees of any depth can be halted, each node's active children
+        are halted in order once its own `halt` has returned, rather than within
+        `super().halt()`, whether or not the node is the one being halted
+        """
         if self.__halted:
             return
-        for child in self.children():
-            child.halt()
         self.__halted = True
+        if self.__parent is not None and self.__parent.__active:
+            self.__parent.__active.pop(self, None)
+        if self.__active:
+            self._halt_children()
+
+    @final
+    def _halt_children(self, start: int = 0) -> None:
+        """halt the active children from the `start`-th on, in order"""
+        active = self.__active
+        if not active:
+            return
+
+        if len(active) == 1:
+            children = [child for child, index in active.items() if index >= start]
+        else:
+            children = [
+                child
+                for child in sorted(active, key=active.__getitem__, reverse=True)
+                if active[child] >= start
+            ]
+        pending = _halting.get()
+        if pending is not None:
+            # a halt is in progress, and halts the children once its override returns
+            pending.extend(children)
+            return
+
+        token = _halting.set(children)
+        try:
+            while children:
+                children.pop().halt()
+        finally:
+            _halting.reset(token)
+
+    def __activate(self) -> None:
+        """mark the node active, along with any of its ancestors that were halted"""
+        self.__halted = False
+        node = self
+        while (parent := node.__parent) is not None:
+            if parent.__active is None:
+                parent.__active = {}
+            parent.__active[node] = node.__index
+            if not parent.__halted:
+                return
+            parent.__halted = False
+            node = parent
+
+    @final
+    def digest(self) -> bytes:
+        """
+        get a hash of the structure of the tree rooted at the node
+
+        the hash covers each node's `class_name()` and `mappings()`,
+        so structurally identical trees have identical digests
+        """
+        # visit the tree in post-order, so each node's children are hashed first
+        stack: list[tuple[BehaviorTree, bool]] = [(self, False)]
+        while stack:
+            node, visited = stack.pop()
+            if (
+                node.__digest is not None
+                and node.__digest_version == BehaviorTree.__structure_version
+            ):
+                continue
+
+            children = node.children()
+            if not visited:
+                stack.append((node, True))
+                stack.extend((child, False) for child in children)
+                continue
+
+            node.__digest = node_digest(
+                node.class_name(),
+                node.mappings(),
+                (child.digest() for child in children),
+            )
+            node.__digest_version = BehaviorTree.__structure_version
+
+        assert self.__digest is not None
+        return self.__digest
+
+    @final
+    def fingerprint(self) -> str:
+        """get the `digest()` as a hex string"""
+        return self.digest().hex()
+
+    @final
+    @classmethod
+    def provided_ports(cls) -> Mapping[str, Port[Any]]:
+        """get the ports declared by the node type, by name"""
+        return {port.key(): port for port in _declared_ports(cls)}
 
     def class_name(self) -> str:
         """get the name of the node's type"""
@@ -77,30 +578,52 @@ class BehaviorTree(ABC):
 
     def name(self) -> str:
         """get the name of the node"""
-        return self.get("name", str).value or self.class_name()
+        return self._name_port.value or self.class_name()
 
     def make_blackboard(self, parent: Blackboard) -> Blackboard:
-        """create a blackboard suitable for the node to use"""
+        """
+        create a blackboard suitable for the node to use
+
+        a node that remaps no ports would only delegate every lookup
+        to its `parent`, so it shares the `parent` instead
+        """
+        if not self.mappings():
+            return parent
         return parent.create_child(BlackboardChildType.CHILD)
 
     @final
-    def attach_blackboard(self, blackboard: Blackboard) -> Self:
-        """attach the `blackboard` to the node"""
-        assert self.__blackboard is None
-        self.__blackboard = self.make_blackboard(blackboard)
-        Blackboard.remap(blackboard, self.__blackboard, self.mappings())
+    def blackboard(self) -> Blackboard:
+        """get the blackboard the node uses"""
+        assert self.__blackboard is not None
+        return self.__blackboard
 
-        for child in self.children():
-            child.attach_blackboard(self.__blackboard)
+    @final
+    def attach_blackboard(self, blackboard: Blackboard) -> Self:
+        """attach the `blackboard` to the node and its descendants"""
+        stack: list[tuple[BehaviorTree, Blackboard]] = [(self, blackboard)]
+        while stack:
+            node, parent = stack.pop()
+            assert node.__blackboard is None
+            node.__blackboard = attached = node.make_blackboard(parent)
+            if node.__ports:
+                Blackboard.remap(parent, attached, node.__ports)
+            literals = node.__literals
+            for port in _declared_ports(type(node)):
+                port.bind(node, literals.get(port.key()) if literals else None)
+
+            if node.__children:
+                stack.extend([(child, attached) for child in reversed(node.__children)])
 
         return self
 
     @final
     def __iter__(self) -> Iterator["BehaviorTree"]:
-        """iterate over all of the nodes in the tree"""
-        yield self
-        for child in self.children():
-            yield from child
+        """iterate over all of the nodes in the tree, in pre-order"""
+        stack: list[BehaviorTree] = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children()))
 
     @overload
     def get(self, key: str) -> Pointer[Any | None]:
@@ -115,36 +638,76 @@ class BehaviorTree(ABC):
     def get(
         self, key: str, converter: Callable[[Any], _T] | None = None
     ) -> Pointer[Any | None]:
-        if converter is bool:
-            return self._get_bool(key)
-
         assert self.__blackboard is not None
-        ptr = self.__blackboard.get(key)
-        if ptr.value is not None and converter is not None:
-            ptr.value = converter(ptr.value)
-        return ptr
+        return _convert(self.__blackboard.get(key), converter)
+
+
+def _declared_ports(node_type: type[BehaviorTree]) -> tuple[Port[Any], ...]:
+    """get the ports declared by the `node_type` and its bases"""
+    ports = _PORTS.get(node_type)
+    if ports is None:
+        ports = _PORTS[node_type] = tuple(
+            {
+                name: port
+                for base in reversed(node_type.__mro__)
+                for name, port in vars(base).items()
+                if isinstance(port, Port)
+            }.values()
+        )
+    return ports
 
-    def _get_bool(self, key: str) -> Pointer[bool | None]:
-        """get the bool at the specified port"""
-        ptr = self.get(key)
-        match ptr.value:
-            case "true":
-                ptr.value = True
 
-            case "false":
-                ptr.value = False
+_PORTS = dict[type[BehaviorTree], tuple[Port[Any], ...]]()
+
+# the literals of every node given no ports, shared rather than one empty dict each
+_NO_LITERALS: Mapping[str, Any] = MappingProxyType({})
 
-        assert ptr.value is None or isinstance(ptr.value, bool)
-        return ptr
+
+def _implements(node_type: type[BehaviorTree], method: str) -> bool:
+    """
+    whether the `node_type` defines or inherits `method` from a class at least
+    as far down as the `_do_tick` it inherits, so a subclass only overriding
+    `_do_tick` is still ticked by it, and one overriding neither, such as
+    `RootTree`, is ticked like its base
+    """
+    for base in node_type.__mro__:
+        if base is BehaviorTree:
+            return False
+        if method in vars(base):
+            return True
+        if "_do_tick" in vars(base):
+            return False
+    return False  # pragma: no cover
+
+
+# whether each node type is ticked through its `_tick_steps`
+_STEPS = dict[type[BehaviorTree], bool]()
 
 
 class SubTree(BehaviorTree):
-    """a subtree"""
+    """
+    a subtree
+
+    the subtree's root may be given as a factory instead, in which
+    case it is only built the first time it is needed (e.g. ticked)
+    """
+
+    def __init__(
+        self,
+        __name: str,
+        __child: BehaviorTree | Callable[[], BehaviorTree],
+        **ports: str,
+    ) -> None:
+        if isinstance(__child, BehaviorTree):
+            super().__init__([__child], **ports)
+            self.__child: BehaviorTree | None = __child
+
+        else:
+            super().__init__([], **ports)
+            self.__child = None
+            self.__factory = __child
 
-    def __init__(self, __name: str, __child: BehaviorTree, **ports: str) -> None:
-        super().__init__([__child], **ports)
         self.__name: Final = __name
-        self.__child = __child
 
         autoremap = self.mappings().get("_autoremap", "false")
         assert autoremap in {"true", "false"}
@@ -169,19 +732,61 @@ class SubTree(BehaviorTree):
         """tick the subtree"""
         return self.child().tick()
 
+    @override
+    def _tick_steps(self) -> TickSteps:
+        return (yield self.child())
+
+    @override
+    def _compile_tick(self, code: "TickCode", node: str, status: str) -> None:
+        # an unexpanded subtree is built, and ticked, by `_do_tick`
+        if self.__child is None:
+            super()._compile_tick(code, node, status)
+        else:
+            code.tick(self.__child, status)
+
+    @override
+    def children(self) -> Sequence[BehaviorTree]:
+        """get the root of the subtree, building it if necessary"""
+        self.child()
+        return super().children()
+
     def child(self) -> BehaviorTree:
-        """get the root of the subtree"""
+        """get the root of the subtree, building it if necessary"""
+        if self.__child is None:
+            self.__child = self.__factory()
+            self._adopt(self.__child)
         return self.__child
 
+    def expanded(self) -> bool:
+        """whether the root of the subtree has been built"""
+        return self.__child is not None
+
+    def replace(self, child: BehaviorTree | Callable[[], BehaviorTree]) -> None:
+        """
+        swap in a new root for the subtree, halting the previous one
+
+        the subtree keeps its blackboard, which the new root is attached to;
+        a factory given for a subtree that has not been built yet replaces
+        its factory instead, so the new root is also built when first needed
+        """
+        if not isinstance(child, BehaviorTree):
+            if self.__child is None:
+                self.__factory = child
+                return
+            child = child()
+
+        if self.__child is None:
+            self.__child = child
+            self._adopt(child)
+
+        else:
+            self._replace(self.__child, child)
+            self.__child = child
+
 
 class RootTree(SubTree):
     """a top level subtree"""
 
-    @override
-    def _do_tick(self) -> NodeStatus:
-        """tick the tree"""
-        return super()._do_tick()
-
     @override
     def make_blackboard(self, parent: Blackboard) -> Blackboard:
         """special case: the root tree should not create a clean blackboard"""
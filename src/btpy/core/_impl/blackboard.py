@@ -1,5 +1,24 @@
+import threading
+import weakref
+from dataclasses import fields as dataclass_fields
+from dataclasses import is_dataclass
 from enum import Enum
-from typing import Any, Callable, Final, TypeVar, assert_never, overload, override
+from functools import partial
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Final,
+    Iterable,
+    Mapping,
+    Protocol,
+    Sequence,
+    TypeVar,
+    assert_never,
+    overload,
+    override,
+    runtime_checkable,
+)
 
 from btpy.core._impl.pointer import Pointer
 
@@ -26,6 +45,11 @@ class Blackboard:
     system where values may be shadowed or aliased
     """
 
+    # bumped whenever a key is added to a layer that other layers look through,
+    # since any key they already resolved past that layer may now be shadowed
+    __epoch = 0
+    __epoch_lock = threading.Lock()
+
     def __init__(
         self,
         parent: "Blackboard | None" = None,
@@ -35,7 +59,16 @@ class Blackboard:
     ) -> None:
         self._stack: Final = parent
         self._world: Final = self._choose_world(parent=parent, world=world)
-        self._data: Final = dict[str, Pointer[Any]]()
+        self._data: Final[dict[str, Pointer[Any]]] = {}
+        # where keys not in `_data` were found in the parents, as of an epoch;
+        # the pair is replaced at once, so other threads never see a mismatched epoch
+        self._resolved: tuple[int, dict[str, Pointer[Any]]] = (Blackboard.__epoch, {})
+        self._has_children = False
+        if parent is not None:
+            parent._has_children = True
+        # called with each entry this blackboard owns, as a world blackboard,
+        # just before it is written, e.g. to snapshot it
+        self._write_hooks: Final[list[Callable[[Pointer[Any]], None]]] = []
 
     def _choose_world(
         self, *, parent: "Blackboard | None", world: "Blackboard | None"
@@ -66,17 +99,17 @@ class Blackboard:
 
     @staticmethod
     def remap(
-        parent: "Blackboard", child: "Blackboard", mappings: dict[str, str]
+        parent: "Blackboard", child: "Blackboard", mappings: Mapping[str, str]
     ) -> None:
         """remap the ports by aliasing or shadowing the ports in `parent`"""
         for child_port, mapping in mappings.items():
             if mapping.startswith("{"):
                 assert mapping.endswith("}")
                 parent_port = mapping[1:-1]
-                child._data[child_port] = parent.get(parent_port)
+                child._insert(child_port, parent.get(parent_port))
 
             else:
-                child._data[child_port] = Pointer(mapping)
+                child._insert(child_port, Pointer(mapping))
 
     @overload
     def get(self, key: str) -> Pointer[Any]:
@@ -97,36 +130,290 @@ class Blackboard:
         self, key: str, transform: Callable[[Any], _T | None] | None = None
     ) -> Pointer[Any]:
         if transform:
-            ptr = self.get(key)
-            if ptr.value is not None:
-                ptr.value = transform(ptr.value)
-            return ptr
+            converted = self.get(key)
+            if converted.value is not None:
+                converted.value = transform(converted.value)
+            return converted
 
         if key.startswith("@"):
             return self._world.get(key[1:])
 
-        if key in self._data:
-            return self._data[key]
+        ptr = self._data.get(key)
+        if ptr is not None:
+            return ptr
+
+        if self._stack is None or self._shadows(key):
+            return self._insert_missing(key)
+
+        # the epoch is read before resolving, so a key inserted meanwhile
+        # invalidates the result along with the rest of the cache
+        epoch = Blackboard.__epoch
+        resolved_epoch, resolved = self._resolved
+        if resolved_epoch != epoch:
+            resolved = {}
+            self._resolved = (epoch, resolved)
+
+        ptr = resolved.get(key)
+        if ptr is None:
+            ptr = resolved[key] = self._stack._resolve(key)
+        return ptr
+
+    def _resolve(self, key: str) -> Pointer[Any]:
+        """find the `key` in this layer or its parents, without caching it"""
+        layer = self
+        while True:
+            ptr = layer._data.get(key)
+            if ptr is not None:
+                return ptr
+
+            if layer._stack is None or layer._shadows(key):
+                return layer._insert_missing(key)
+
+            layer = layer._stack
 
-        if self._stack:
-            return self._stack.get(key)
+    def _shadows(self, key: str) -> bool:
+        """whether the `key` should be created in this layer instead of a parent"""
+        return False
 
-        self._data[key] = Pointer(None)
-        return self._data[key]
+    def _insert(self, key: str, ptr: Pointer[_T]) -> Pointer[_T]:
+        """add the `key` to this layer"""
+        if ptr._owner is None:
+            ptr._owner = self._world
+        self._data[key] = ptr
+        self._invalidate_resolved()
+        return ptr
+
+    def _insert_missing(self, key: str) -> Pointer[Any]:
+        """
+        add an empty entry for the `key` to this layer, unless another
+        thread has just added one, in which case that entry is shared
+        """
+        ptr = Pointer(None)
+        ptr._owner = self._world
+        inserted = self._data.setdefault(key, ptr)
+        if inserted is ptr:
+            self._invalidate_resolved()
+        return inserted
+
+    def _invalidate_resolved(self) -> None:
+        """invalidate the keys other layers resolved, after an insert into this one"""
+        # the epoch is only bumped once the key is in `_data`, so any
+        # lookup that reads the new epoch is guaranteed to find the key
+        if self._stack is not None and self._has_children:
+            with Blackboard.__epoch_lock:
+                Blackboard.__epoch = Blackboard.__epoch + 1
 
     def set(self, key: str, value: _T) -> _T:
         """set the value at the specified port"""
         self.get(key).value = value
         return value
 
+    def set_many(self, values: Mapping[str, Any]) -> None:
+        """
+        set the value at each of the specified ports, as a single write
+
+        every entry gets the same version, and subscribers are only
+        called once all of the values have been written
+        """
+        Pointer.write_many(self._get_pointers(values), [*values.values()])
+
+    def get_many(self, keys: Iterable[str]) -> list[Any]:
+        """get the values at each of the specified ports"""
+        return [ptr.value for ptr in self._get_pointers(keys)]
+
+    def _get_pointers(self, keys: Iterable[str]) -> list[Pointer[Any]]:
+        """`get` each of the `keys`, looking in this layer and the world first"""
+        data, world, world_data = self._data, self._world, self._world._data
+        pointers = list[Pointer[Any]]()
+        for key in keys:
+            if key[:1] == "@":
+                key = key[1:]
+                pointers.append(world_data.get(key) or world.get(key))
+            else:
+                pointers.append(data.get(key) or self.get(key))
+        return pointers
+
+    def bind(
+        self, fields: "type[Any] | _StructuredDtype | Sequence[str]", prefix: str = ""
+    ) -> "BlackboardBinding":
+        """
+        bind a group of ports, named after the `fields` of a dataclass
+        or a NumPy structured dtype (or given directly) and the `prefix`,
+        so they can be written and read together
+
+        the ports are resolved once, so remapping the blackboard
+        afterwards does not affect the binding
+        """
+        extract: Callable[[Any], Sequence[Any]]
+        if isinstance(fields, type):
+            assert is_dataclass(fields)
+            names = [field.name for field in dataclass_fields(fields) if field.init]
+            getter = attrgetter(*names)
+            extract = (lambda record: (getter(record),)) if len(names) == 1 else getter
+
+        elif isinstance(fields, _StructuredDtype):
+            assert fields.names is not None
+            names = [*fields.names]
+            extract = _record_values
+
+        else:
+            names = [*fields]
+            extract = _sequence_values
+
+        return self._bind([prefix + name for name in names], extract)
+
+    def _bind(
+        self, keys: Sequence[str], extract: Callable[[Any], Sequence[Any]]
+    ) -> "BlackboardBinding":
+        """bind the `keys`, whose values are taken from each record by `extract`"""
+        return BlackboardBinding(keys, [self.get(key) for key in keys], extract)
+
+    def snapshot(self) -> "BlackboardSnapshot":
+        """
+        start recording writes to the entries of every blackboard
+        sharing this one's world, so they can later be rolled back
+        """
+        return BlackboardSnapshot(self._world)
+
+    def changed_since(self, version: int) -> list[str]:
+        """
+        list the keys of this layer whose values were written after `version`,
+        which is typically a `Pointer.clock()` taken before an earlier tick
+
+        keys that were only looked up through a parent are listed by that parent
+        """
+        return [key for key, ptr in self._data.items() if ptr.version() > version]
+
+    def subscribe(
+        self, key: str, callback: Callable[[str, Any], None]
+    ) -> Callable[[], None]:
+        """
+        call the `callback` with the `key` and its value after each
+        write to it, returning a function that cancels the subscription
+
+        aliases share the same entry, so writes through any of them are reported
+        """
+        return self.get(key).subscribe(lambda ptr: callback(key, ptr.value))
+
+
+@runtime_checkable
+class _StructuredDtype(Protocol):
+    """a NumPy structured dtype"""
+
+    @property
+    def names(self) -> tuple[str, ...] | None:
+        pass
+
+    @property
+    def fields(self) -> Mapping[str, Any] | None:
+        pass
+
+
+def _record_values(record: Any) -> Sequence[Any]:
+    """get the fields of a NumPy structured record as Python values"""
+    values: Sequence[Any] = record.item()
+    return values
+
+
+def _sequence_values(record: Any) -> Sequence[Any]:
+    """get the values of a record that is already a sequence"""
+    values: Sequence[Any] = record
+    return values
+
+
+class BlackboardBinding:
+    """
+    a group of blackboard ports written and read together,
+    such as the fields of a sensor frame
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        pointers: Sequence[Pointer[Any]],
+        extract: Callable[[Any], Sequence[Any]],
+        store: Callable[[Sequence[Any]], None] | None = None,
+        load: Callable[[], tuple[Any, ...]] | None = None,
+    ) -> None:
+        self.__keys: Final = tuple(keys)
+        self.__pointers: Final = tuple(pointers)
+        self.__extract: Final = extract
+        # how to write and read every value at once, when the entries allow it
+        self.__store: Final = store
+        self.__load: Final = load
+
+    def keys(self) -> tuple[str, ...]:
+        """get the bound ports, in field order"""
+        return self.__keys
+
+    def write(self, record: Any) -> None:
+        """write each field of the `record` to its port, as a single write"""
+        Pointer.write_many(self.__pointers, self.__extract(record), self.__store)
+
+    def read(self) -> tuple[Any, ...]:
+        """
+        get the value of each port, in field order, e.g. to pass
+        to the dataclass or to assign to a NumPy structured array
+        """
+        if self.__load is not None:
+            return self.__load()
+        return tuple([ptr.value for ptr in self.__pointers])
+
+
+class BlackboardSnapshot:
+    """
+    the state of a blackboard hierarchy, kept copy-on-write
+
+    taking a snapshot copies nothing; instead, the previous value of each
+    entry is copied the first time it is written, so `restore()` only costs
+    as much as the number of entries that changed
+
+    entries are restored in place, so aliases created by `Blackboard.remap`
+    keep sharing them; keys added since the snapshot are kept, but reset to `None`,
+    and values are not copied, so objects mutated in place are not rolled back
+    """
+
+    def __init__(self, world: Blackboard) -> None:
+        self.__saved: Final = dict[int, tuple[Pointer[Any], Any]]()
+        # the hook does not hold on to the snapshot, so one that is
+        # abandoned without being restored or committed stops recording
+        hook = partial(_save_previous, self.__saved)
+        world._write_hooks.append(hook)
+        self.__recording: Final = weakref.finalize(
+            self, world._write_hooks.remove, hook
+        )
+
+    def active(self) -> bool:
+        """whether writes are still being recorded"""
+        return self.__recording.alive
+
+    def changed(self) -> int:
+        """get the number of entries written since the snapshot"""
+        return len(self.__saved)
+
+    def restore(self) -> None:
+        """roll back every entry written since the snapshot, and stop recording"""
+        self.commit()
+        for ptr, value in self.__saved.values():
+            ptr.value = value
+        self.__saved.clear()
+
+    def commit(self) -> None:
+        """keep every entry written since the snapshot, and stop recording"""
+        assert self.active()
+        self.__recording()
+
+
+def _save_previous(
+    saved: dict[int, tuple[Pointer[Any], Any]], ptr: Pointer[Any]
+) -> None:
+    """copy the value of the `ptr` before it is first overwritten"""
+    if id(ptr) not in saved:
+        saved[id(ptr)] = (ptr, ptr.value)
+
 
 class _AutoRemapped(Blackboard):
     @override
-    def get(
-        self, key: str, transform: Callable[[Any], _T | None] | None = None
-    ) -> Pointer[Any]:
+    def _shadows(self, key: str) -> bool:
         """shadow all private ports"""
-        if key.startswith("_") and key not in self._data:
-            self._data[key] = Pointer(None)
-
-        return super().get(key, transform=transform)
+        return key.startswith("_")
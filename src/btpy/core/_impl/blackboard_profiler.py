@@ -0,0 +1,296 @@
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass, fields
+from typing import Any, Callable, Iterator, TypeVar, overload, override
+
+from btpy.core._impl.behavior_tree import BehaviorTree, SubTree
+from btpy.core._impl.blackboard import Blackboard
+from btpy.core._impl.node_status import NodeStatus
+from btpy.core._impl.pointer import Pointer
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileRow:
+    """
+    how a node used a blackboard key while it was profiled
+
+    - `reads`: calls to `get`, from the node or from outside of any tick (`node == ""`)
+    - `writes`: writes to the key's entry, through `set` or any `Pointer` to it
+    - `walks`: lookups that were not cached, and searched the parent layers
+    - `depth`: the number of parent layers searched, over every walk
+    - `world`: lookups redirected to the world blackboard by an `@` prefix
+    - `misses`: lookups of a missing key, which created an empty entry
+    """
+
+    key: str
+    node: str
+    reads: int
+    writes: int
+    walks: int
+    depth: int
+    world: int
+    misses: int
+
+
+_COLUMNS = [field.name for field in fields(ProfileRow)]
+
+
+class BlackboardProfiler:
+    """
+    records how the nodes of a tree use its blackboards
+
+    profiling swaps the classes of the tree's nodes and blackboards for
+    instrumented subclasses, and swaps them back afterwards, so it costs
+    nothing outside of `profile()`
+
+    ports bound as `Port`s are only looked up once, so their
+    reads are not counted; a key with many reads, walks or
+    misses is a good candidate to declare as a `Port`, or to remap
+    """
+
+    def __init__(self) -> None:
+        # the counts of each (key, node), in the order of `ProfileRow`'s counters
+        self.__counts = dict[tuple[str, str], list[int]]()
+        # the key each profiled entry was first found under
+        self.__keys = dict[int, str]()
+        # the nodes being ticked, innermost last
+        self._ticking = list[BehaviorTree]()
+
+    @contextmanager
+    def profile(
+        self, root: BehaviorTree | Blackboard
+    ) -> Iterator["BlackboardProfiler"]:
+        """
+        profile the attached tree rooted at `root`, or a single blackboard
+        hierarchy, until the context exits
+
+        subtrees that are built lazily while profiling are not profiled
+        """
+        blackboards = dict[int, Blackboard]()
+        nodes = list[BehaviorTree]()
+        if isinstance(root, Blackboard):
+            _collect_layers(root, blackboards)
+
+        else:
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                nodes.append(node)
+                _collect_layers(node.blackboard(), blackboards)
+                if not isinstance(node, SubTree) or node.expanded():
+                    stack.extend(reversed(node.children()))
+
+        # profilers may be nested, so each instance keeps the profilers recording it
+        swapped = list[tuple[Any, type, tuple[BlackboardProfiler, ...]]]()
+        for layer in sorted(blackboards.values(), key=_depth):
+            for key, ptr in layer._data.items():
+                self.__keys.setdefault(id(ptr), key)
+            swapped.append(_swap(layer, self))
+        for node in nodes:
+            swapped.append(_swap(node, self))
+
+        # writes are reported by the world blackboard that owns each entry
+        worlds = {id(layer._world): layer._world for layer in blackboards.values()}
+        for world in worlds.values():
+            world._write_hooks.append(self.__record_write)
+        try:
+            yield self
+
+        finally:
+            for world in worlds.values():
+                world._write_hooks.remove(self.__record_write)
+            for instance, original, profilers in reversed(swapped):
+                instance.__class__ = original
+                if profilers:
+                    instance._profilers = profilers
+                else:
+                    del instance._profilers
+
+    def rows(self) -> list[ProfileRow]:
+        """get the counts of each key used by each node"""
+        return [
+            ProfileRow(key, node, *counts)
+            for (key, node), counts in self.__counts.items()
+        ]
+
+    def report(self, sort_by: str = "reads", limit: int | None = None) -> str:
+        """format the `rows()` as a table, with the highest `sort_by` first"""
+        if sort_by not in _COLUMNS:
+            raise ValueError(f"cannot sort by {sort_by!r}, expected one of {_COLUMNS}")
+
+        rows = sorted(self.rows(), key=lambda row: getattr(row, sort_by), reverse=True)
+        table = [_COLUMNS, *([str(value) for value in astuple(row)] for row in rows)]
+        table = table[: None if limit is None else limit + 1]
+        widths = [max(len(row[i]) for row in table) for i in range(len(_COLUMNS))]
+        return "\n".join(
+            "  ".join(
+                cell.ljust(width) if i < 2 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in table
+        )
+
+    def clear(self) -> None:
+        """forget every recorded count"""
+        self.__counts.clear()
+
+    def _record(self, key: str, counter: int, amount: int = 1) -> None:
+        """add to one of the counters of the `key`, for the node being ticked"""
+        node = self._ticking[-1].name() if self._ticking else ""
+        counts = self.__counts.get((key, node))
+        if counts is None:
+            counts = self.__counts[(key, node)] = [0] * (len(_COLUMNS) - 2)
+        counts[counter] = counts[counter] + amount
+
+    def _track(self, key: str, ptr: Pointer[Any]) -> None:
+        """record writes to an entry added while profiling"""
+        self.__keys.setdefault(id(ptr), key)
+
+    def __record_write(self, ptr: Pointer[Any]) -> None:
+        key = self.__keys.get(id(ptr))
+        if key is not None:
+            self._record(key, _WRITES)
+
+
+_READS, _WRITES, _WALKS, _DEPTH, _WORLD, _MISSES = range(6)
+
+
+class _ProfiledBlackboard(Blackboard):
+    """counts how each key is looked up"""
+
+    _profilers: tuple[BlackboardProfiler, ...]
+
+    def _record(self, key: str, counter: int, amount: int = 1) -> None:
+        for profiler in self._profilers:
+            profiler._record(key, counter, amount)
+
+    @overload
+    def get(self, key: str) -> Pointer[Any]:
+        pass
+
+    @overload
+    def get(self, key: str, transform: None) -> Pointer[Any]:
+        pass
+
+    @overload
+    def get(self, key: str, transform: Callable[[Any], _T]) -> Pointer[_T]:
+        pass
+
+    @override
+    def get(
+        self, key: str, transform: Callable[[Any], _T | None] | None = None
+    ) -> Pointer[Any]:
+        if transform:
+            # counted by the lookup without the `transform`
+            return super().get(key, transform)
+
+        if key.startswith("@"):
+            # counted as a read by the world blackboard
+            self._record(key[1:], _WORLD)
+            return self._world.get(key[1:])
+
+        self._record(key, _READS)
+        return super().get(key)
+
+    @override
+    def _resolve(self, key: str) -> Pointer[Any]:
+        layer: Blackboard = self
+        depth = 1
+        while (
+            key not in layer._data
+            and layer._stack is not None
+            and not layer._shadows(key)
+        ):
+            depth, layer = depth + 1, layer._stack
+        self._record(key, _WALKS)
+        self._record(key, _DEPTH, depth)
+        return super()._resolve(key)
+
+    @override
+    def _insert_missing(self, key: str) -> Pointer[Any]:
+        missing = key not in self._data
+        ptr = super()._insert_missing(key)
+        if missing:
+            self._record(key, _MISSES)
+            for profiler in self._profilers:
+                profiler._track(key, ptr)
+        return ptr
+
+
+# the instrumented subclass of each node and blackboard type, created once so
+# the caches keyed by node type do not grow with every profile
+_PROFILED = dict[type, type]()
+
+
+def _swap(
+    instance: Any, profiler: BlackboardProfiler
+) -> tuple[Any, type, tuple[BlackboardProfiler, ...]]:
+    """
+    add the `profiler` to those recording the `instance`, swapping its class for
+    an instrumented subclass if it is not profiled yet
+    """
+    original = type(instance)
+    profilers: tuple[BlackboardProfiler, ...] = getattr(instance, "_profilers", ())
+    if not profilers:
+        instance.__class__ = _profiled(original)
+    instance._profilers = (*profilers, profiler)
+    return instance, original, profilers
+
+
+def _profiled(original: type) -> type:
+    """get the instrumented subclass of a node or blackboard type"""
+    profiled = _PROFILED.get(original)
+    if profiled is not None:
+        return profiled
+
+    if issubclass(original, Blackboard):
+        profiled = type(
+            original.__name__, (_ProfiledBlackboard, original), _names(original)
+        )
+
+    else:
+        assert issubclass(original, BehaviorTree)
+        do_tick = original._do_tick
+
+        def _do_tick(node: Any) -> NodeStatus:
+            profilers: tuple[BlackboardProfiler, ...] = node._profilers
+            for profiler in profilers:
+                profiler._ticking.append(node)
+            try:
+                status: NodeStatus = do_tick(node)
+                return status
+            finally:
+                for profiler in profilers:
+                    profiler._ticking.pop()
+
+        profiled = type(
+            original.__name__, (original,), {**_names(original), "_do_tick": _do_tick}
+        )
+
+    _PROFILED[original] = profiled
+    return profiled
+
+
+def _names(original: type) -> dict[str, str]:
+    """keep the names of a profiled class, so nodes are named and shown as before"""
+    return {"__module__": original.__module__, "__qualname__": original.__qualname__}
+
+
+def _collect_layers(blackboard: Blackboard, layers: dict[int, Blackboard]) -> None:
+    """add the `blackboard`, its parents and their world blackboards to `layers`"""
+    pending: list[Blackboard | None] = [blackboard]
+    while pending:
+        layer = pending.pop()
+        if layer is None or id(layer) in layers:
+            continue
+        layers[id(layer)] = layer
+        pending.extend([layer._stack, layer._world])
+
+
+def _depth(blackboard: Blackboard) -> int:
+    """count the parents of the `blackboard`, so aliased entries are named from the root"""
+    depth, layer = 0, blackboard._stack
+    while layer is not None:
+        depth, layer = depth + 1, layer._stack
+    return depth
@@ -0,0 +1,226 @@
+"""
+a compact binary layout for `TreeTemplate`s
+
+all integers are little-endian, and every section is an array of fixed-size
+records, so a bundle can be read directly out of a memory-mapped file:
+
+- header: magic, version, the main tree string and the length of each section
+- strings: the end offset of each string, followed by the utf-8 string data
+- sources: (path string, content hash) for each file the template was loaded from
+- definitions: (name string, root node) for each subtree definition
+- nodes: (kind, name string, first port, port count, first child, child count),
+  with every node stored after its children
+- ports: (key string, value string)
+- children: node indices
+"""
+
+import struct
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable
+
+from btpy.core._impl.behavior_tree import BehaviorTree
+from btpy.core._impl.node_registration import NodeRegistration
+from btpy.core._impl.tree_template import NodePlan, SubTreePlan, TreeTemplate
+
+MAGIC = b"BTPY"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIIIIII")
+_OFFSET = struct.Struct("<I")
+_SOURCE = struct.Struct("<I16s")
+_DEFINITION = struct.Struct("<II")
+_NODE = struct.Struct("<BIIIII")
+_PORT = struct.Struct("<II")
+_BYTE = struct.Struct("<B")
+
+_ACTION = 0
+_SUBTREE = 1
+
+
+class _StringTable:
+    """assigns each distinct string an index"""
+
+    def __init__(self) -> None:
+        self.indices = dict[str, int]()
+
+    def __call__(self, string: str) -> int:
+        return self.indices.setdefault(string, len(self.indices))
+
+
+def dump(template: TreeTemplate) -> bytes:
+    """serialize the `template`"""
+    strings = _StringTable()
+    nodes = list[tuple[int, int, int, int, int, int]]()
+    ports = list[tuple[int, int]]()
+    children = list[int]()
+
+    def flatten(root: NodePlan | SubTreePlan) -> int:
+        """append the `root` plan after its descendants, returning its index"""
+        # each plan being flattened, with its first port and the indices of its children
+        stack = list[tuple[NodePlan | SubTreePlan, int, list[int]]]()
+        plan: NodePlan | SubTreePlan | None = root
+        while True:
+            if plan is not None:
+                stack.append((plan, len(ports), []))
+                ports.extend((strings(k), strings(v)) for k, v in plan.ports.items())
+
+            plan, first_port, indices = stack[-1]
+            if isinstance(plan, NodePlan) and len(indices) < len(plan.children):
+                plan = plan.children[len(indices)]
+                continue
+
+            stack.pop()
+            if isinstance(plan, SubTreePlan):
+                record = (
+                    _SUBTREE,
+                    strings(plan.name),
+                    first_port,
+                    len(plan.ports),
+                    0,
+                    0,
+                )
+
+            else:
+                record = (
+                    _ACTION,
+                    strings(plan.name),
+                    first_port,
+                    len(plan.ports),
+                    len(children),
+                    len(indices),
+                )
+                children.extend(indices)
+
+            nodes.append(record)
+            if not stack:
+                return len(nodes) - 1
+            stack[-1][2].append(len(nodes) - 1)
+            plan = None
+
+    main_tree = strings(template.main_tree())
+    definitions = [
+        (strings(name), flatten(plan)) for name, plan in template.definitions().items()
+    ]
+    sources = [(strings(str(path)), digest) for path, digest in template.sources()]
+
+    encoded = [string.encode() for string in strings.indices]
+    offsets = list[int]()
+    for string in encoded:
+        offsets.append((offsets[-1] if offsets else 0) + len(string))
+
+    return b"".join(
+        [
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                0,
+                main_tree,
+                len(encoded),
+                len(sources),
+                len(definitions),
+                len(nodes),
+                len(ports),
+                len(children),
+            ),
+            *(_OFFSET.pack(offset) for offset in offsets),
+            *encoded,
+            *(_SOURCE.pack(*source) for source in sources),
+            *(_DEFINITION.pack(*definition) for definition in definitions),
+            *(_NODE.pack(*node) for node in nodes),
+            *(_PORT.pack(*port) for port in ports),
+            *(_OFFSET.pack(child) for child in children),
+        ]
+    )
+
+
+def load(
+    data: bytes | memoryview,
+    decorators: tuple[Callable[[BehaviorTree], BehaviorTree], ...] = (),
+) -> TreeTemplate:
+    """deserialize a template, resolving each node type through `NodeRegistration`"""
+    (
+        magic,
+        version,
+        _,
+        main_tree,
+        num_strings,
+        num_sources,
+        num_definitions,
+        num_nodes,
+        num_ports,
+        num_children,
+    ) = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise RuntimeError(f"unsupported bundle format: {bytes(magic)!r} v{version}")
+
+    offset = _HEADER.size
+    ends = [
+        end
+        for (end,) in _OFFSET.iter_unpack(_section(data, offset, _OFFSET, num_strings))
+    ]
+    offset = offset + _OFFSET.size * num_strings
+    blob = _section(data, offset, _BYTE, ends[-1] if ends else 0)
+    strings = [str(blob[start:end], "utf-8") for start, end in zip([0, *ends], ends)]
+    offset = offset + len(blob)
+
+    sources = tuple(
+        (Path(strings[path]), bytes(digest))
+        for path, digest in _SOURCE.iter_unpack(
+            _section(data, offset, _SOURCE, num_sources)
+        )
+    )
+    offset = offset + _SOURCE.size * num_sources
+    definitions = _DEFINITION.iter_unpack(
+        _section(data, offset, _DEFINITION, num_definitions)
+    )
+    offset = offset + _DEFINITION.size * num_definitions
+    nodes = _NODE.iter_unpack(_section(data, offset, _NODE, num_nodes))
+    offset = offset + _NODE.size * num_nodes
+    ports = [
+        (strings[key], strings[value])
+        for key, value in _PORT.iter_unpack(_section(data, offset, _PORT, num_ports))
+    ]
+    offset = offset + _PORT.size * num_ports
+    children = [
+        child
+        for (child,) in _OFFSET.iter_unpack(
+            _section(data, offset, _OFFSET, num_children)
+        )
+    ]
+
+    plans = list[NodePlan | SubTreePlan]()
+    for kind, name, first_port, port_count, first_child, child_count in nodes:
+        mapping = MappingProxyType(dict(ports[first_port : first_port + port_count]))
+        if kind == _SUBTREE:
+            plans.append(SubTreePlan(strings[name], mapping))
+
+        else:
+            plans.append(
+                NodePlan(
+                    strings[name],
+                    NodeRegistration.get(strings[name]),
+                    mapping,
+                    tuple(
+                        plans[child]
+                        for child in children[first_child : first_child + child_count]
+                    ),
+                )
+            )
+
+    return TreeTemplate(
+        strings[main_tree],
+        {strings[name]: plans[root] for name, root in definitions},
+        decorators,
+        sources,
+    )
+
+
+def _section(
+    data: bytes | memoryview, offset: int, record: struct.Struct, count: int
+) -> bytes | memoryview:
+    """get the `count` records starting at `offset`"""
+    end = offset + record.size * count
+    if end > len(data):
+        raise RuntimeError("truncated bundle")
+    return data[offset:end]
@@ -1,20 +1,129 @@
+import mmap
+import re
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from typing import Callable, Self, overload
 from xml.etree import ElementTree as XML
 
-from btpy.core._impl.behavior_tree import BehaviorTree, RootTree, SubTree
+from btpy.core._impl import bt_bundle
+from btpy.core._impl.behavior_tree import BehaviorTree, RootTree
 from btpy.core._impl.blackboard import Blackboard
+from btpy.core._impl.include_cache import IncludeCache
 from btpy.core._impl.node_registration import NodeRegistration
+from btpy.core._impl.tree_template import NodePlan, SubTreePlan, TreeTemplate
+
+# the tokens needed to find each `<BehaviorTree>` without parsing its contents
+_SCAN = re.compile(
+    rb"<!--.*?-->|<!\[CDATA\[.*?\]\]>|<\?.*?\?>"
+    rb"|<BehaviorTree\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*?(/?)>|</BehaviorTree\b",
+    re.DOTALL,
+)
+# the xml declaration that may start a file, which names its encoding
+_DECLARATION = re.compile(rb"(?:\xef\xbb\xbf)?\s*<\?xml\b.*?\?>", re.DOTALL)
+
+
+# the skeleton of a file (its trees emptied out), the byte
+# range of each tree and the file's xml declaration, if any
+_Scanned = tuple[XML.Element, tuple[tuple[int, int], ...], bytes]
+
+
+def _scan(xml: bytes) -> _Scanned:
+    """find where each tree is described, without building its elements"""
+    skeleton = bytearray()
+    ranges = list[tuple[int, int]]()
+    copied = 0
+    tree_start: int | None = None
+    body_start = 0
+    for token in _SCAN.finditer(xml):
+        if token[0].startswith(b"<BehaviorTree"):
+            assert tree_start is None
+            tree_start, body_start = token.start(), token.end()
+            if token[1]:
+                ranges.append((tree_start, body_start))
+                tree_start = None
+
+        elif token[0].startswith(b"</BehaviorTree"):
+            assert tree_start is not None
+            ranges.append((tree_start, token.start()))
+            skeleton += xml[copied:body_start]
+            copied = token.start()
+            tree_start = None
+
+    skeleton += xml[copied:]
+    declaration = _DECLARATION.match(xml)
+    return (
+        XML.fromstring(skeleton),
+        tuple(ranges),
+        b"" if declaration is None else declaration[0],
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _TreeLocation:
+    """where an indexed `<BehaviorTree>` definition can be found"""
+
+    source: Path | bytes
+    start: int
+    end: int
+    # the content hash of the `source` file, so edited files compare unequal
+    version: bytes = b""
+    # the xml declaration of the `source` file, so the definition is decoded alike
+    declaration: bytes = b""
+
+    def read(self) -> bytes:
+        """read the definition as a document of its own"""
+        if isinstance(self.source, bytes):
+            return self.source[self.start : self.end] + b"</BehaviorTree>"
+
+        with open(self.source, "rb") as f:
+            f.seek(self.start)
+            definition = f.read(self.end - self.start)
+        return self.declaration + definition + b"</BehaviorTree>"
+
+
+# the description a definition was last compiled from, and the registrations
+# it was compiled with, along with the plan and the subtrees it references
+_Compiled = tuple[
+    XML.Element | _TreeLocation, object, NodePlan | SubTreePlan, list[str]
+]
 
 
 class BTParser:
     """loads `BehaviorTree` objects from xml"""
 
-    def __init__(self, *decorators: Callable[[BehaviorTree], BehaviorTree]) -> None:
-        """create a `BTParser` that applies `decorators` to each node it constructs"""
+    def __init__(
+        self,
+        *decorators: Callable[[BehaviorTree], BehaviorTree],
+        indexed: bool = False,
+        include_cache: IncludeCache | None = None,
+        lazy_subtrees: bool = False,
+    ) -> None:
+        """
+        create a `BTParser` that applies `decorators` to each node it constructs
+
+        when `indexed`, files are only scanned for the location of each
+        `<BehaviorTree>`, which is then read the first time it is needed
+
+        files are loaded through the `include_cache`, which
+        defaults to one shared by the whole process
+
+        when `lazy_subtrees`, each `SubTree` is only built the first time it is needed
+        """
         self._main_tree: str | None = None
-        self._tree_descriptions = dict[str, XML.Element]()
+        # annotated rather than built as `dict[...]()`, which is slow enough to
+        # matter for a parser created for each parse
+        self._tree_descriptions: dict[str, XML.Element] = {}
+        self._tree_locations: dict[str, _TreeLocation] = {}
         self._decorators = decorators
+        self._indexed = indexed
+        self._lazy_subtrees = lazy_subtrees
+        self._include_cache = include_cache or IncludeCache.shared()
+        self._included: dict[Path, bytes] = {}
+        self._including: list[Path] = []
+        self._compiled: dict[str, _Compiled] = {}
+        # the last template resolved, reused while its plans and sources are unchanged
+        self._template: TreeTemplate | None = None
 
     @overload
     def parse(self, path: str, blackboard: Blackboard | None = None) -> RootTree:
@@ -26,7 +135,7 @@ class BTParser:
 
     def parse(self, path: Path | str, blackboard: Blackboard | None = None) -> RootTree:
         if isinstance(path, str):
-            return self.parse(Path(path))
+            return self.parse(Path(path), blackboard)
 
         return self._parse(path, first=True).get(
             *self._decorators, global_blackboard=blackboard
@@ -40,43 +149,186 @@ class BTParser:
             *self._decorators, global_blackboard=blackboard
         )
 
+    def parse_bundle(
+        self,
+        path: Path | str,
+        blackboard: Blackboard | None = None,
+        check_sources: bool = True,
+    ) -> RootTree:
+        """load a `BehaviorTree` from a bundle written by `BTWriter.to_bundle`"""
+        return self.parse_bundle_template(path, check_sources).instantiate(
+            blackboard, self._lazy_subtrees
+        )
+
+    def parse_bundle_template(
+        self, path: Path | str, check_sources: bool = True
+    ) -> TreeTemplate:
+        """
+        load a reusable `TreeTemplate` from a bundle written by `BTWriter.to_bundle`
+
+        when `check_sources`, the files the bundle was compiled
+        from must not have changed since it was written
+        """
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as m:
+            with memoryview(m) as data:
+                template = bt_bundle.load(data, self._decorators)
+
+        if check_sources:
+            for source, digest in template.sources():
+                if self._include_cache.digest(source) != digest:
+                    raise RuntimeError(f"bundle {path} is out of date with {source}")
+
+        return template
+
     def _parse(self, path: Path, first: bool) -> Self:
         """load the tree description from file"""
-        with open(path, "r") as f:
-            return self._parse_string(f.read(), path.parent, first=first)
+        if first:
+            self._included.clear()
+
+        resolved = path.resolve()
+        if resolved in self._including:
+            cycle = [*self._including[self._including.index(resolved) :], resolved]
+            raise RuntimeError(f"include cycle: {' -> '.join(map(str, cycle))}")
+
+        if resolved in self._included:
+            return self
+
+        self._included[resolved] = self._include_cache.digest(resolved)
+        self._including.append(resolved)
+        try:
+            if self._indexed:
+                scanned = self._include_cache.load(path, _scan)
+                return self._index(
+                    scanned, path, path.parent, first, self._included[resolved]
+                )
+
+            xml = self._include_cache.load(path, XML.fromstring)
+            return self._from_xml(xml, path.parent, first=first)
+
+        finally:
+            self._including.pop()
 
     def _parse_string(self, xml: str, cwd: Path, first: bool) -> Self:
         """load the tree description from an xml string"""
+        if first:
+            self._included.clear()
+
+        if self._indexed:
+            data = xml.encode()
+            return self._index(_scan(data), data, cwd, first=first)
+
         return self._from_xml(XML.fromstring(xml), cwd, first=first)
 
+    def _index(
+        self,
+        scanned: "_Scanned",
+        source: Path | bytes,
+        cwd: Path,
+        first: bool,
+        version: bytes = b"",
+    ) -> Self:
+        """load the tree locations found by `_scan`"""
+        root, ranges, declaration = scanned
+        self._check_root(root.tag, root.attrib, first=first)
+        trees = iter(ranges)
+        for child in root:
+            if self._check_tag(child.tag, child.attrib, cwd):
+                id = child.attrib["ID"]
+                self._main_tree = self._main_tree or id
+                self._tree_descriptions.pop(id, None)
+                self._tree_locations[id] = _TreeLocation(
+                    source, *next(trees), version, declaration
+                )
+
+        return self
+
     def _from_xml(self, xml: XML.Element, cwd: Path, first: bool) -> Self:
         """load the tree description from an `XML.Element`"""
-        assert xml.tag == "root"
-        assert xml.attrib["BTCPP_format"] == "4"
+        self._check_root(xml.tag, xml.attrib, first=first)
+        for child in xml:
+            if self._check_tag(child.tag, child.attrib, cwd):
+                id = child.attrib["ID"]
+                self._main_tree = self._main_tree or id
+                self._tree_locations.pop(id, None)
+                (self._tree_descriptions[id],) = child
+
+        return self
+
+    def _check_root(self, tag: str, attrib: dict[str, str], first: bool) -> None:
+        """validate the root element of a file"""
+        assert tag == "root"
+        assert attrib["BTCPP_format"] == "4"
         if first:
-            self._main_tree = xml.attrib.get("main_tree_to_execute", None)
+            self._main_tree = attrib.get("main_tree_to_execute", None)
 
-        for child in xml:
-            match child.tag:
-                case "BehaviorTree":
-                    id = child.attrib["ID"]
-                    assert not NodeRegistration.has(id)
-                    self._main_tree = self._main_tree or id
-                    (self._tree_descriptions[id],) = child
+    def _check_tag(self, tag: str, attrib: dict[str, str], cwd: Path) -> bool:
+        """handle a top level element, returning whether it describes a tree"""
+        match tag:
+            case "BehaviorTree":
+                assert not NodeRegistration.has(attrib["ID"])
+                return True
 
-                case "include":
-                    assert (
-                        "ros_pkg" not in child.attrib
-                    ), "ros_pkg is not currently supported"
-                    self._parse(cwd / child.attrib["path"], first=False)
+            case "include":
+                assert "ros_pkg" not in attrib, "ros_pkg is not currently supported"
+                self._parse(cwd / attrib["path"], first=False)
 
-                case "TreeNodesModel":
-                    pass  # this tag is for tools like Groot
+            case "TreeNodesModel":
+                pass  # this tag is for tools like Groot
 
-                case _:
-                    raise RuntimeError(f"invalid tag: {child.tag}")
+            case _:
+                raise RuntimeError(f"invalid tag: {tag}")
 
-        return self
+        return False
+
+    def _description(self, id: str) -> XML.Element:
+        """get the description of the tree `id`, reading it if it was only indexed"""
+        if id not in self._tree_descriptions:
+            # the location is kept, so the definition's compiled plan can be reused
+            (self._tree_descriptions[id],) = XML.fromstring(self._location(id).read())
+
+        return self._tree_descriptions[id]
+
+    def _location(self, id: str) -> _TreeLocation:
+        """
+        get where the indexed tree `id` is described, scanning
+        its file again if it changed since it was indexed
+        """
+        location = self._tree_locations[id]
+        path = location.source
+        if (
+            isinstance(path, bytes)
+            or self._include_cache.digest(path) == location.version
+        ):
+            return location
+
+        root, ranges, declaration = self._include_cache.load(path, _scan)
+        version = self._include_cache.digest(path)
+        trees = iter(ranges)
+        for child in root:
+            if child.tag == "BehaviorTree":
+                start, end = next(trees)
+                previous = self._tree_locations.get(child.attrib["ID"])
+                if previous is not None and previous.source == path:
+                    self._tree_descriptions.pop(child.attrib["ID"], None)
+                    self._tree_locations[child.attrib["ID"]] = _TreeLocation(
+                        path, start, end, version, declaration
+                    )
+
+        if path.resolve() in self._included:
+            self._included[path.resolve()] = version
+        if self._tree_locations[id] is location:
+            raise RuntimeError(f"{path} no longer describes the tree {id}")
+        return self._tree_locations[id]
+
+    def parse_template(self, path: Path | str) -> TreeTemplate:
+        """load a reusable `TreeTemplate` from file"""
+        return self._parse(Path(path), first=True).template(*self._decorators)
+
+    def parse_template_string(self, xml: str, cwd: Path = Path()) -> TreeTemplate:
+        """load a reusable `TreeTemplate` from an xml string"""
+        return self._parse_string(xml, cwd, first=True).template(*self._decorators)
 
     def get(
         self,
@@ -84,33 +336,126 @@ class BTParser:
         global_blackboard: Blackboard | None = None,
     ) -> RootTree:
         """instantiate the loaded tree description"""
+        return self.template(*decorators).instantiate(
+            global_blackboard, self._lazy_subtrees
+        )
+
+    def template(
+        self, *decorators: Callable[[BehaviorTree], BehaviorTree]
+    ) -> TreeTemplate:
+        """resolve the loaded tree description into a reusable `TreeTemplate`"""
         assert self._main_tree is not None
-        assert self._main_tree in self._tree_descriptions
-        return RootTree(
-            self._main_tree,
-            self._load(self._tree_descriptions[self._main_tree], *decorators),
-        ).attach_blackboard(global_blackboard or Blackboard())
-
-    def _load(
-        self, xml: XML.Element, *decorators: Callable[[BehaviorTree], BehaviorTree]
-    ) -> BehaviorTree:
-        """instantiate the tree from the `xml` description"""
+        assert (
+            self._main_tree in self._tree_descriptions
+            or self._main_tree in self._tree_locations
+        )
+        plans: dict[str, NodePlan | SubTreePlan] = {}
+        pending = [self._main_tree]
+        while pending:
+            name = pending.pop()
+            if name not in plans:
+                plans[name] = self._compile_definition(name, pending)
+
+        sources = tuple(self._included.items())
+        template = self._template
+        if (
+            template is None
+            or template.main_tree() != self._main_tree
+            or template._decorators != decorators
+            or template.sources() != sources
+            or template.definitions().keys() != plans.keys()
+            or any(
+                template.definitions()[name] is not plan for name, plan in plans.items()
+            )
+        ):
+            template = self._template = TreeTemplate(
+                self._main_tree, plans, decorators, sources
+            )
+        return template
+
+    def library(
+        self, *decorators: Callable[[BehaviorTree], BehaviorTree]
+    ) -> TreeTemplate:
+        """
+        resolve every loaded tree description into a `TreeTemplate`,
+        including those that the main tree does not use
+        """
+        assert self._main_tree is not None
+        plans = {
+            name: self._compile_definition(name, [])
+            for name in dict.fromkeys([*self._tree_descriptions, *self._tree_locations])
+        }
+        return TreeTemplate(
+            self._main_tree, plans, decorators, tuple(self._included.items())
+        )
+
+    def _compile_definition(
+        self, name: str, pending: list[str]
+    ) -> NodePlan | SubTreePlan:
+        """
+        resolve the definition `name`, queueing any referenced subtrees on `pending`
+
+        the previous plan is reused if the definition's description is unchanged,
+        which is the case for files that were loaded from the include cache, and
+        the same registration scope is in effect, since the plan holds its factories
+        """
+        source = (
+            self._location(name)
+            if name in self._tree_locations
+            else self._description(name)
+        )
+        scope = NodeRegistration._current()
+        compiled = self._compiled.get(name)
+        if compiled is not None and compiled[0] == source and compiled[1] is scope:
+            pending.extend(compiled[3])
+            return compiled[2]
+
+        references: list[str] = []
+        plan = self._compile(self._description(name), references)
+        self._compiled[name] = (source, scope, plan, references)
+        pending.extend(references)
+        return plan
+
+    def _compile(self, xml: XML.Element, pending: list[str]) -> NodePlan | SubTreePlan:
+        """resolve the `xml` description, queueing any referenced subtrees on `pending`"""
+        # each element being resolved, along with the plans of its children so far
+        stack: list[tuple[XML.Element, list[NodePlan | SubTreePlan]]] = [(xml, [])]
+        while True:
+            element, children = stack[-1]
+            if len(children) < len(element) and element.tag != "SubTree":
+                child = element[len(children)]
+                if len(child) and child.tag != "SubTree":
+                    stack.append((child, []))
+                else:
+                    # leaves are resolved in place, without a frame of their own
+                    children.append(self._compile_element(child, (), pending))
+                continue
+
+            stack.pop()
+            plan = self._compile_element(element, tuple(children), pending)
+            if not stack:
+                return plan
+            stack[-1][1].append(plan)
+
+    def _compile_element(
+        self,
+        xml: XML.Element,
+        children: tuple[NodePlan | SubTreePlan, ...],
+        pending: list[str],
+    ) -> NodePlan | SubTreePlan:
+        """resolve a single element, given the plans of its `children`"""
         name = xml.tag
         attrs = xml.attrib.copy()
 
         if name == "SubTree":
             name = attrs.pop("ID")
             assert len(xml) == 0
-            return SubTree(
-                name, self._load(self._tree_descriptions[name], *decorators), **attrs
-            )
+            pending.append(name)
+            return SubTreePlan(name, MappingProxyType(attrs))
 
         if name == "Action":
             name = attrs.pop("ID")
 
-        children = [self._load(child, *decorators) for child in xml]
-        loaded = NodeRegistration.get(name)(children, **attrs)
-        assert loaded.class_name() == name
-        for decorator in decorators:
-            loaded = decorator(loaded)
-        return loaded
+        return NodePlan(
+            name, NodeRegistration.get(name), MappingProxyType(attrs), children
+        )
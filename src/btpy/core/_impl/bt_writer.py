@@ -1,4 +1,11 @@
+from typing import Iterator, TextIO
+
+from btpy.core._impl import bt_bundle
 from btpy.core._impl.behavior_tree import BehaviorTree, SubTree
+from btpy.core._impl.tree_template import TreeTemplate
+
+# the number of characters to batch into each write
+_WRITE_SIZE = 1 << 16
 
 
 class BTWriter:
@@ -7,18 +14,46 @@ class BTWriter:
     @staticmethod
     def to_xml(tree: SubTree, indent: str | int = "\t") -> str:
         """format the `tree` as xml"""
+        return "".join(BTWriter.iter_xml(tree, indent))
+
+    @staticmethod
+    def write(tree: SubTree, fp: TextIO, indent: str | int = "\t") -> None:
+        """write the `tree` as xml to the file object `fp`"""
+        buffer = list[str]()
+        buffered = 0
+        for chunk in BTWriter.iter_xml(tree, indent):
+            buffer.append(chunk)
+            buffered = buffered + len(chunk)
+            if buffered >= _WRITE_SIZE:
+                fp.write("".join(buffer))
+                buffer.clear()
+                buffered = 0
+
+        fp.write("".join(buffer))
+
+    @staticmethod
+    def iter_xml(tree: SubTree, indent: str | int = "\t") -> Iterator[str]:
+        """format the `tree` as xml, one chunk at a time"""
         if isinstance(indent, int):
-            return BTWriter.to_xml(tree, " " * indent)
+            indent = " " * indent
 
         writer = BTWriter()
-        subtrees = (node for node in tree if isinstance(node, SubTree))
-        return f"""<?xml version="1.0" encoding="UTF-8"?>
-<root BTCPP_format="4" main_tree_to_execute="{tree.class_name()}">
-{"".join(writer._get_subtree_xml(subtree, indent=indent, level=1) for subtree in subtrees)}</root>
-"""
+        main_tree = writer._subtree_id(tree)
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield f'<root BTCPP_format="4" main_tree_to_execute="{main_tree}">\n'
+        yield from writer._iter_subtrees_xml(tree, indent)
+        yield "</root>\n"
+
+    @staticmethod
+    def to_bundle(template: TreeTemplate) -> bytes:
+        """format the `template` as a binary bundle that `BTParser` can load"""
+        return bt_bundle.dump(template)
 
     def __init__(self) -> None:
-        self._seen_subtrees = set[str]()
+        # the ID each subtree definition is described under, by its digest
+        self._subtree_ids = dict[bytes, str]()
+        self._used_ids = set[str]()
+        self._described = set[bytes]()
 
     def _get_port_attrs(self, node: BehaviorTree) -> str:
         """format the `node`'s ports as xml attributes"""
@@ -26,32 +61,89 @@ class BTWriter:
             f' {name}="{value}"' for (name, value) in sorted(node.mappings().items())
         )
 
-    def _get_subtree_xml(self, tree: SubTree, indent: str, level: int) -> str:
-        """format the `tree` as an xml subtree description"""
-        name = tree.class_name()
-        if name in self._seen_subtrees:
-            return ""
-
-        self._seen_subtrees.add(name)
-        return f"""{indent * level}<BehaviorTree ID="{name}">
-{self._to_xml(tree.child(), indent=indent, level=level + 1)}
-{indent * level}</BehaviorTree>
-"""
-
-    def _to_xml(self, node: BehaviorTree, indent: str, level: int) -> str:
-        """format the `node` as xml"""
-        name = node.class_name()
-        attrs = self._get_port_attrs(node)
-        children = node.children()
-
-        if isinstance(node, SubTree):
-            children = []
-            attrs = f' ID="{name}"{attrs}'
-            name = "SubTree"
-
-        if len(children) == 0:
-            return f"""{indent * level}<{name}{attrs} />"""
-
-        return f"""{indent * level}<{name}{attrs}>
-{"\n".join(self._to_xml(child, indent=indent, level=level + 1) for child in children)}
-{indent * level}</{name}>"""
+    def _subtree_id(self, subtree: SubTree) -> str:
+        """
+        get the ID the `subtree`'s definition is described under: that of an identical
+        definition found earlier, or its name, made unique if a different definition
+        was already described under it
+        """
+        digest = subtree.child().digest()
+        id = self._subtree_ids.get(digest)
+        if id is None:
+            id = name = subtree.class_name()
+            suffix = 1
+            while id in self._used_ids:
+                suffix = suffix + 1
+                id = f"{name}_{suffix}"
+            self._subtree_ids[digest] = id
+            self._used_ids.add(id)
+        return id
+
+    def _iter_subtrees_xml(self, tree: SubTree, indent: str) -> Iterator[str]:
+        """
+        format the `tree` and each subtree it references as xml subtree descriptions
+
+        subtrees are described in the order they are first found by a depth first
+        search, which finds them while describing the subtree that references them
+
+        each definition is described once, however many subtrees share it
+        """
+        pending = [iter([tree])]
+        while pending:
+            subtree = next(pending[-1], None)
+            if subtree is None:
+                pending.pop()
+                continue
+
+            digest = subtree.child().digest()
+            if digest in self._described:
+                continue
+
+            self._described.add(digest)
+            references = list[SubTree]()
+            yield f'{indent}<BehaviorTree ID="{self._subtree_ids[digest]}">\n'
+            yield from self._iter_xml(subtree.child(), indent, references)
+            yield f"\n{indent}</BehaviorTree>\n"
+            pending.append(iter(references))
+
+    def _iter_xml(
+        self, node: BehaviorTree, indent: str, references: list[SubTree]
+    ) -> Iterator[str]:
+        """format the `node` as xml, collecting the `references`d subtrees"""
+        # each entry is the tag and the remaining children of an open element
+        stack = list[tuple[str, Iterator[BehaviorTree]]]()
+        next_node: BehaviorTree | None = node
+        newline = ""
+        while True:
+            if next_node is not None:
+                prefix = newline + indent * (len(stack) + 2)
+                newline = "\n"
+                name = next_node.class_name()
+                attrs = self._get_port_attrs(next_node)
+
+                if isinstance(next_node, SubTree):
+                    references.append(next_node)
+                    children: Iterator[BehaviorTree] = iter(())
+                    attrs = f' ID="{self._subtree_id(next_node)}"{attrs}'
+                    name = "SubTree"
+
+                else:
+                    children = iter(next_node.children())
+
+                next_node = next(children, None)
+                if next_node is None:
+                    yield f"{prefix}<{name}{attrs} />"
+
+                else:
+                    yield f"{prefix}<{name}{attrs}>"
+                    stack.append((name, children))
+                    continue
+
+            if not stack:
+                return
+
+            name, children = stack[-1]
+            next_node = next(children, None)
+            if next_node is None:
+                stack.pop()
+                yield f"\n{indent * (len(stack) + 2)}</{name}>"
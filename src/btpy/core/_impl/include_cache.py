@@ -0,0 +1,92 @@
+import hashlib
+import time
+from pathlib import Path
+from typing import Any, Callable, Final, TypeVar, cast
+
+_T = TypeVar("_T")
+
+# how long after a file is modified it could be rewritten without changing its
+# modification time, which some file systems only store to the nearest two seconds
+_MTIME_GRANULARITY_NS = 2_000_000_000
+
+
+class IncludeCache:
+    """
+    a cache of parsed files, keyed by their resolved path and content hash
+
+    a file whose size and modification time are unchanged is not re-read,
+    unless it was modified too recently for those to tell a rewrite apart;
+    one that was touched but whose contents are unchanged is not re-parsed
+    """
+
+    __shared: "IncludeCache | None" = None
+
+    @staticmethod
+    def shared() -> "IncludeCache":
+        """get the process-wide cache used by default"""
+        if IncludeCache.__shared is None:
+            IncludeCache.__shared = IncludeCache()
+        return IncludeCache.__shared
+
+    def __init__(self) -> None:
+        # the size and modification time each digest was read at, if they can
+        # be trusted to change along with the file's contents
+        self.__digests: Final = dict[Path, tuple[tuple[int, int] | None, bytes]]()
+        self.__parsed: Final = dict[tuple[Path, bytes, Callable[..., Any]], Any]()
+        self.__hits = 0
+        self.__misses = 0
+
+    def hits(self) -> int:
+        """the number of loads that did not need to parse their file"""
+        return self.__hits
+
+    def misses(self) -> int:
+        """the number of loads that parsed their file"""
+        return self.__misses
+
+    def clear(self) -> None:
+        """forget every cached file and reset the counters"""
+        self.__digests.clear()
+        self.__parsed.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+    def digest(self, path: Path) -> bytes:
+        """get the content hash of the file at `path`"""
+        return self.__read(path.resolve())[0]
+
+    def load(self, path: Path, parse: Callable[[bytes], _T]) -> _T:
+        """
+        get the result of `parse`-ing the file at `path`
+
+        the result is shared with every other load of the same
+        file, so it must be treated as immutable
+        """
+        path = path.resolve()
+        digest, data = self.__read(path)
+        key = (path, digest, parse)
+        if key in self.__parsed:
+            self.__hits = self.__hits + 1
+            return cast(_T, self.__parsed[key])
+
+        self.__misses = self.__misses + 1
+        parsed = self.__parsed[key] = parse(path.read_bytes() if data is None else data)
+        return parsed
+
+    def __read(self, path: Path) -> tuple[bytes, bytes | None]:
+        """hash the file at `path`, returning its contents if they had to be read"""
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self.__digests.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1], None
+
+        data = path.read_bytes()
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        racy = stat.st_mtime_ns > time.time_ns() - _MTIME_GRANULARITY_NS
+        self.__digests[path] = (None if racy else version, digest)
+        if cached is not None and cached[1] != digest:
+            for key in [key for key in self.__parsed if key[:2] == (path, cached[1])]:
+                del self.__parsed[key]
+
+        return digest, data
@@ -1,4 +1,6 @@
+import threading
 from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Callable, Iterator, Protocol, TypeVar, overload
 
 from btpy.core._impl.behavior_tree import BehaviorTree
@@ -25,17 +27,36 @@ _BTF = TypeVar("_BTF", bound=BehaviorTreeFactory)
 
 
 class NodeRegistration:
-    __registered_nodes = LayeredDict[str, BehaviorTreeFactoryFunction]()
+    """
+    the registry of factories that trees are loaded with
+
+    a `scope()` only affects the context that opened it: `asyncio` tasks
+    created inside it run in a copy of its context, so they see the scope,
+    but new threads start with an empty context, in which they see the global
+    registry that is shared outside of any scope; a thread only sees a scope
+    when it runs in a copy of its context, e.g. through `contextvars.copy_context().run`
+    """
+
+    __registered_nodes = ContextVar(
+        "registered_nodes", default=LayeredDict[str, BehaviorTreeFactoryFunction]()
+    )
+    # guards checking for and adding a registration as one step
+    __lock = threading.Lock()
 
     @staticmethod
     def get(name: str) -> BehaviorTreeFactoryFunction:
         """get the registered factory by `name`"""
-        return NodeRegistration.__registered_nodes[name]
+        return NodeRegistration.__registered_nodes.get()[name]
+
+    @staticmethod
+    def _current() -> object:
+        """get the registry of the current scope, which identifies the scope"""
+        return NodeRegistration.__registered_nodes.get()
 
     @staticmethod
     def has(name: str) -> bool:
         """check whether a factory has been registered for the given `name`"""
-        return name in NodeRegistration.__registered_nodes
+        return name in NodeRegistration.__registered_nodes.get()
 
     @overload
     @staticmethod
@@ -62,8 +83,10 @@ class NodeRegistration:
         if arg2 is None:
             return lambda arg2: NodeRegistration.register(arg1, arg2)
 
-        assert arg1 not in NodeRegistration.__registered_nodes
-        NodeRegistration.__registered_nodes[arg1] = arg2
+        registered_nodes = NodeRegistration.__registered_nodes.get()
+        with NodeRegistration.__lock:
+            assert arg1 not in registered_nodes
+            registered_nodes[arg1] = arg2
         return arg2
 
     @contextmanager
@@ -75,14 +98,12 @@ class NodeRegistration:
         useful to temporarily register a factory
         (e.g. for a test) without polluting the global registry
         """
-        NodeRegistration.__registered_nodes = LayeredDict(
-            NodeRegistration.__registered_nodes
+        token = NodeRegistration.__registered_nodes.set(
+            LayeredDict(NodeRegistration.__registered_nodes.get())
         )
 
         try:
             yield
 
         finally:
-            NodeRegistration.__registered_nodes = (
-                NodeRegistration.__registered_nodes.parent()
-            )
+            NodeRegistration.__registered_nodes.reset(token)
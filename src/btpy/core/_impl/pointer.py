@@ -1,11 +1,141 @@
-from dataclasses import dataclass
-from typing import Generic, TypeVar
+import itertools
+from typing import TYPE_CHECKING, Any, Callable, Generic, Sequence, TypeVar
+
+if TYPE_CHECKING:
+    from btpy.core._impl.blackboard import Blackboard
 
 _T = TypeVar("_T", covariant=True)
 
+# the versions given to writes, shared by every pointer; drawing from the
+# counter is atomic, so concurrent writes are never given the same version
+_versions = itertools.count(1)
+
 
-@dataclass
 class Pointer(Generic[_T]):
-    """a reference to a value"""
+    """
+    a reference to a value
+
+    every write to the `value` is stamped with a new `version()`, taken
+    from a single process-wide clock, and reported to any subscribers
+
+    the `value` is a property, since intercepting every attribute write costs
+    several times as much; a write only looks for subscribers and for hooks on the
+    world blackboard that owns the pointer, e.g. a snapshot's, when there are any
+    """
+
+    __slots__ = ("_value", "_version", "_subscribers", "_owner", "_views")
+
+    def __init__(self, value: _T) -> None:
+        self._value: Any = value
+        self._version = 0
+        self._subscribers: list[Callable[[Pointer[Any]], None]] | None = None
+        # the blackboard hierarchy the pointer was first added to, as its world blackboard
+        self._owner: Blackboard | None = None
+        # views of the value through each converter, shared by every port that reads it
+        self._views: dict[Any, Pointer[Any]] | None = None
+
+    def __repr__(self) -> str:
+        return f"Pointer(value={self.value!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        assert isinstance(other, Pointer)
+        return bool(self.value == other.value)
+
+    @property
+    def value(self) -> _T:
+        return self._value  # type: ignore[no-any-return]
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        owner = self._owner
+        if self._subscribers or owner is not None and owner._write_hooks:
+            self._write(value)
+        else:
+            self._value = value
+            self._version = next(_versions)
+
+    def _write(self, value: Any) -> None:
+        """write the `value`, calling the world's hooks before and subscribers after"""
+        for hook in [*_hooks(self)]:
+            hook(self)
+
+        self._store(value)
+        self._version = next(_versions)
+        for callback in [*(self._subscribers or ())]:
+            callback(self)
+
+    def _store(self, value: Any) -> None:
+        """store the `value`, without stamping or reporting the write"""
+        self._value = value
+
+    @staticmethod
+    def write_many(
+        pointers: Sequence["Pointer[Any]"],
+        values: Sequence[Any],
+        store: Callable[[Sequence[Any]], None] | None = None,
+    ) -> None:
+        """
+        write each of the `values` to the matching pointer, stamping every write
+        with one version and calling subscribers once all of them are written
+
+        the values are stored by `store`, if given, instead of by each pointer
+        """
+        assert len(pointers) == len(values)
+        for ptr in pointers:
+            for hook in [*_hooks(ptr)]:
+                hook(ptr)
+
+        if store is not None:
+            store(values)
+
+        version = next(_versions)
+        notify = dict[int, Pointer[Any]]()
+        for ptr, value in zip(pointers, values):
+            if store is None:
+                ptr._store(value)
+            ptr._version = version
+            if ptr._subscribers:
+                notify[id(ptr)] = ptr
+
+        for ptr in notify.values():
+            for callback in [*(ptr._subscribers or ())]:
+                callback(ptr)
+
+    @staticmethod
+    def clock() -> int:
+        """
+        get a version later than that of every write so far,
+        and earlier than that of every write after it
+        """
+        return next(_versions)
+
+    def version(self) -> int:
+        """get the version of the most recent write to the pointer"""
+        return self._version
+
+    def subscribe(
+        self, callback: Callable[["Pointer[Any]"], None]
+    ) -> Callable[[], None]:
+        """
+        call the `callback` after each write to the pointer,
+        returning a function that cancels the subscription
+        """
+        subscribers = self._subscribers
+        if subscribers is None:
+            subscribers = []
+            self._subscribers = subscribers
+        subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in subscribers:
+                subscribers.remove(callback)
+
+        return unsubscribe
+
 
-    value: _T
+def _hooks(ptr: Pointer[Any]) -> Sequence[Callable[[Pointer[Any]], None]]:
+    """get the hooks of the world blackboard that owns the `ptr`"""
+    owner = ptr._owner
+    return () if owner is None else owner._write_hooks
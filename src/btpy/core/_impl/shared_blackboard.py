@@ -0,0 +1,273 @@
+import json
+import os
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Final, Mapping, Sequence, override
+
+from btpy.core._impl.blackboard import Blackboard, BlackboardBinding
+from btpy.core._impl.pointer import Pointer
+
+_MAGIC = b"BTSM"
+# magic, schema length
+_HEADER = struct.Struct("<4sI")
+# the sequence number guarding each group of entries
+_SEQUENCE = struct.Struct("<Q")
+
+# attaching to shared memory registers it to be unlinked when the process exits, which
+# can only be turned off from 3.13, so before then it is unregistered after attaching
+_UNREGISTER_ATTACHED = os.name == "posix" and sys.version_info < (3, 13)
+# the retries of a read before it starts checking how long it has waited for a writer
+_SPINS = 64
+
+Schema = Mapping[str, "str | Mapping[str, str]"]
+
+
+def _align(offset: int) -> int:
+    """round the `offset` up to a multiple of 8 bytes"""
+    return (offset + 7) & ~7
+
+
+def _layout(schema: Schema, start: int) -> tuple[list[tuple[int, dict[str, str]]], int]:
+    """find the offset of each group of entries, and the total size"""
+    groups = list[tuple[int, dict[str, str]]]()
+    offset = _align(start)
+    for name, format in schema.items():
+        if isinstance(format, str):
+            fields = {name: format}
+        else:
+            fields = {f"{name}.{field}": value for field, value in format.items()}
+
+        groups.append((offset, fields))
+        size = struct.calcsize("<" + "".join(fields.values()))
+        offset = _align(offset + _SEQUENCE.size + size)
+
+    return groups, offset
+
+
+class _Group:
+    """
+    entries in shared memory that are written and read together, guarded by a seqlock
+
+    the group's sequence number is odd while it is being written,
+    so a read retries until it sees the same even sequence number
+    before and after copying the values, for at most `timeout` seconds
+    """
+
+    def __init__(
+        self, buffer: memoryview, offset: int, formats: Sequence[str], timeout: float
+    ) -> None:
+        self.__buffer = buffer
+        self.__offset = offset
+        self.__timeout = timeout
+        self.__data_offset = offset + _SEQUENCE.size
+        self.__layout = struct.Struct("<" + "".join(formats))
+        self.__fields = [
+            (
+                self.__data_offset + struct.calcsize("<" + "".join(formats[:i])),
+                struct.Struct("<" + format),
+            )
+            for i, format in enumerate(formats)
+        ]
+
+    def read(self) -> tuple[Any, ...]:
+        """get the value of every entry in the group"""
+        return self.__read(self.__layout.unpack_from, self.__data_offset)
+
+    def write(self, values: Sequence[Any]) -> None:
+        """set the value of every entry in the group"""
+        self.__write(self.__layout.pack(*values), self.__data_offset)
+
+    def read_field(self, index: int) -> Any:
+        """get the value of one entry in the group"""
+        offset, layout = self.__fields[index]
+        return self.__read(layout.unpack_from, offset)[0]
+
+    def write_field(self, index: int, value: Any) -> None:
+        """set the value of one entry in the group"""
+        offset, layout = self.__fields[index]
+        self.__write(layout.pack(value), offset)
+
+    def sequence(self) -> int:
+        """get the number of writes to the group from any process"""
+        (sequence,) = _SEQUENCE.unpack_from(self.__buffer, self.__offset)
+        return int(sequence) // 2
+
+    def __read(
+        self, unpack: Callable[[memoryview, int], tuple[Any, ...]], offset: int
+    ) -> tuple[Any, ...]:
+        """unpack the data at `offset`, retrying until no write overlapped the read"""
+        buffer, sequence_offset = self.__buffer, self.__offset
+        unpack_sequence = _SEQUENCE.unpack_from
+        retries, deadline = 0, 0.0
+        while True:
+            (before,) = unpack_sequence(buffer, sequence_offset)
+            if not before & 1:
+                values = unpack(buffer, offset)
+                (after,) = unpack_sequence(buffer, sequence_offset)
+                if before == after:
+                    return values
+
+            retries = retries + 1
+            if retries == _SPINS:
+                deadline = time.monotonic() + self.__timeout
+            elif retries > _SPINS and time.monotonic() > deadline:
+                raise TimeoutError(
+                    "a write to shared memory did not finish; its writer may have died"
+                )
+
+    def __write(self, data: bytes, offset: int) -> None:
+        """copy the `data` to `offset`, marking the group as being written meanwhile"""
+        # the data is packed first, so a value of the wrong type leaves the group readable
+        buffer, sequence_offset = self.__buffer, self.__offset
+        (sequence,) = _SEQUENCE.unpack_from(buffer, sequence_offset)
+        # an odd sequence number was left by a writer that died mid-write
+        sequence = sequence + (sequence & 1)
+        _SEQUENCE.pack_into(buffer, sequence_offset, sequence + 1)
+        buffer[offset : offset + len(data)] = data
+        _SEQUENCE.pack_into(buffer, sequence_offset, sequence + 2)
+
+
+class _SharedPointer(Pointer[Any]):
+    """a blackboard entry stored in shared memory, as part of a `_Group`"""
+
+    def __init__(self, group: _Group, index: int) -> None:
+        super().__init__(None)
+        self.__group = group
+        self.__index = index
+
+    @property  # type: ignore[override]
+    def value(self) -> Any:
+        return self.__group.read_field(self.__index)
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._write(value)
+
+    @override
+    def _store(self, value: Any) -> None:
+        self.__group.write_field(self.__index, value)
+
+    def group(self) -> _Group:
+        """get the group the entry is stored in"""
+        return self.__group
+
+
+class SharedBlackboard(Blackboard):
+    """
+    a world blackboard whose declared entries live in shared memory, so that
+    trees in several processes can read and write them without serialization
+
+    the schema maps each shared key to a fixed-size `struct` format, such as
+    `"d"` for a float, `"q"` for an int, `"?"` for a bool or `"16s"` for bytes;
+    any other key is an ordinary entry, local to the process
+
+    a key may instead map to a schema of fields, such as a sensor frame, which
+    declares a group of entries named `key.field`; a group that is bound as
+    a whole, e.g. with `bind(Frame, prefix="key.")`, is written and read at once
+
+    each group (or entry outside of a group) is a seqlock: reads never block
+    writers, and always see every value of a single write, but groups are not
+    consistent with each other, and each group should only be written by one
+    process at a time; a read that waits `timeout` seconds for a write to
+    finish, e.g. because its writer died, raises a `TimeoutError`
+
+    Python cannot issue memory fences, so the seqlock relies on writes to shared
+    memory becoming visible to other processes in order, which x86-64 guarantees
+    and is the only platform it has been checked on; on weakly ordered CPUs, such
+    as ARM, a read may see part of a concurrent write
+
+    writes from other processes are not stamped with local versions, or reported
+    to local subscribers, but `sequence` counts the writes to each entry's group
+    from every process
+    """
+
+    def __init__(self, memory: SharedMemory, owner: bool, timeout: float = 1.0) -> None:
+        super().__init__()
+        self.__memory: Final = memory
+        self.__owner: Final = owner
+        self.__closed = False
+        buffer = memory.buf
+        assert buffer is not None
+
+        magic, length = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise RuntimeError("shared memory was not created by a SharedBlackboard")
+        self.__schema: Final[Schema] = json.loads(
+            bytes(buffer[_HEADER.size : _HEADER.size + length])
+        )
+
+        self.__groups: Final = dict[tuple[str, ...], _Group]()
+        self.__pointers: Final = dict[str, _SharedPointer]()
+        for offset, fields in _layout(self.__schema, _HEADER.size + length)[0]:
+            group = _Group(buffer, offset, [*fields.values()], timeout)
+            self.__groups[tuple(fields)] = group
+            for index, key in enumerate(fields):
+                self.__pointers[key] = _SharedPointer(group, index)
+                self._insert(key, self.__pointers[key])
+
+    @staticmethod
+    def create(
+        schema: Schema, name: str | None = None, timeout: float = 1.0
+    ) -> "SharedBlackboard":
+        """create a new block of shared memory laid out according to the `schema`"""
+        encoded = json.dumps(schema).encode()
+        _, size = _layout(schema, _HEADER.size + len(encoded))
+        memory = SharedMemory(name, create=True, size=size)
+        buffer = memory.buf
+        assert buffer is not None
+        buffer[:size] = bytes(size)
+        _HEADER.pack_into(buffer, 0, _MAGIC, len(encoded))
+        buffer[_HEADER.size : _HEADER.size + len(encoded)] = encoded
+        return SharedBlackboard(memory, owner=True, timeout=timeout)
+
+    @staticmethod
+    def attach(name: str, timeout: float = 1.0) -> "SharedBlackboard":
+        """attach to a block of shared memory created by another process"""
+        # only the creator should unlink the memory, when it is closed
+        if sys.version_info >= (3, 13):
+            memory = SharedMemory(name, track=False)
+        else:
+            memory = SharedMemory(name)
+            if _UNREGISTER_ATTACHED:
+                resource_tracker.unregister(memory._name, "shared_memory")  # type: ignore[attr-defined]
+        return SharedBlackboard(memory, owner=False, timeout=timeout)
+
+    def name(self) -> str:
+        """get the name other processes `attach` with"""
+        return self.__memory.name
+
+    def schema(self) -> Schema:
+        """get the format of each shared key"""
+        return self.__schema
+
+    def sequence(self, key: str) -> int:
+        """get the number of writes to the group of the shared `key`, from any process"""
+        return self.__pointers[key].group().sequence()
+
+    @override
+    def _bind(
+        self, keys: Sequence[str], extract: Callable[[Any], Sequence[Any]]
+    ) -> BlackboardBinding:
+        """bind the `keys`, writing and reading them at once if they are a whole group"""
+        group = self.__groups.get(tuple(keys))
+        if group is None:
+            return super()._bind(keys, extract)
+        return BlackboardBinding(
+            keys, [self.get(key) for key in keys], extract, group.write, group.read
+        )
+
+    def close(self) -> None:
+        """detach from the shared memory, unlinking it if this blackboard created it"""
+        if self.__closed:
+            return
+
+        self.__closed = True
+        self.__memory.close()
+        if self.__owner:
+            if _UNREGISTER_ATTACHED:
+                # a child process sharing the tracker may have unregistered it
+                resource_tracker.register(self.__memory._name, "shared_memory")  # type: ignore[attr-defined]
+            self.__memory.unlink()
@@ -0,0 +1,150 @@
+import itertools
+from contextlib import contextmanager
+from typing import Any, Callable, Final, Iterator
+
+from btpy.core._impl.behavior_tree import BehaviorTree, _implements
+from btpy.core._impl.node_status import NodeStatus
+from btpy.core._impl.pointer import Pointer
+
+# python allows 100 levels of indentation, and 20 nested loops or `with` blocks
+_MAX_INDENT = 40
+_MAX_LOOPS = 15
+# the nodes inlined into each other in a function, which bounds the recursion of
+# generating the code, and of compiling it
+_MAX_DEPTH = 50
+
+
+class TickCode:
+    """
+    the source of a `CompiledTick`, to which each node adds its `_do_tick`
+    with `_compile_tick`
+
+    each node's tick is wrapped in the same bookkeeping as `BehaviorTree.tick`,
+    with its `_start_tick` and `_finish_tick`;
+    deeply nested subtrees are split into functions of their own, generated
+    once their parent's function is done, so that neither the code nor its
+    generation nest too deeply
+    """
+
+    def __init__(self) -> None:
+        self.__namespace: Final = dict[str, Any](
+            {status.name: status for status in NodeStatus}
+        )
+        self.__constants: Final = dict[int, str]()
+        self.__functions: Final = list[str]()
+        # the functions still to be generated, and the node each one ticks
+        self.__pending: Final = list[tuple[str, BehaviorTree]]()
+        self.__names: Final = itertools.count()
+        self.__lines = list[str]()
+        self.__indent = 0
+        self.__loops = 0
+        self.__depth = 0
+
+    def constant(self, value: Any) -> str:
+        """get the name of the `value` in the code"""
+        name = self.__constants.get(id(value))
+        if name is None:
+            # the namespace keeps the value alive, so its id is never reused
+            name = self.__constants[id(value)] = f"_c{next(self.__names)}"
+            self.__namespace[name] = value
+        return name
+
+    def variable(self) -> str:
+        """get the name of a new local variable"""
+        return f"_v{next(self.__names)}"
+
+    def port(self, node: BehaviorTree, key: str, ptr: Pointer[Any]) -> str:
+        """
+        get an expression for the value of the `node`'s port `key`, which
+        is bound to `ptr`, folding a literal into a constant
+        """
+        mapping = node.mappings().get(key)
+        if mapping is not None and not mapping.startswith("{"):
+            return self.constant(ptr.value)
+        return f"{self.constant(ptr)}.value"
+
+    def line(self, text: str) -> None:
+        """add a line of code"""
+        self.__lines.append("    " * self.__indent + text)
+
+    @contextmanager
+    def block(self, header: str, loop: bool = False) -> Iterator[None]:
+        """add a block, indenting the lines added meanwhile; `loop` marks a loop or `with`"""
+        self.line(header)
+        size = len(self.__lines)
+        self.__indent, self.__loops = self.__indent + 1, self.__loops + loop
+        try:
+            yield
+            if len(self.__lines) == size:
+                self.line("pass")
+
+        finally:
+            self.__indent, self.__loops = self.__indent - 1, self.__loops - loop
+
+    def tick(self, node: BehaviorTree, status: str) -> None:
+        """add code that ticks the `node`, storing its status in the variable `status`"""
+        if (
+            self.__indent > _MAX_INDENT
+            or self.__loops > _MAX_LOOPS
+            or self.__depth > _MAX_DEPTH
+        ):
+            function = f"_tick{next(self.__names)}"
+            self.__pending.append((function, node))
+            self.line(f"{status} = {function}()")
+            return
+
+        name = self.constant(node)
+        self.line(f"{self.constant(node._start_tick)}()")
+        self.__depth = self.__depth + 1
+        if _implements(type(node), "_compile_tick"):
+            node._compile_tick(self, name, status)
+        else:
+            BehaviorTree._compile_tick(node, self, name, status)
+        self.__depth = self.__depth - 1
+        self.line(f"{self.constant(node._finish_tick)}({status})")
+
+    def build(self, root: BehaviorTree) -> tuple[Callable[[], NodeStatus], str]:
+        """compile the tick of the `root`, returning it along with its source"""
+        self.__pending.append(("_tick", root))
+        while self.__pending:
+            self.__function(*self.__pending.pop())
+
+        source = "\n\n".join(self.__functions) + "\n"
+        exec(compile(source, "<compiled tick>", "exec"), self.__namespace)
+        function: Callable[[], NodeStatus] = self.__namespace["_tick"]
+        return function, source
+
+    def __function(self, name: str, node: BehaviorTree) -> None:
+        """add the function `name`, which ticks the `node`"""
+        self.__lines, self.__indent, self.__loops, self.__depth = [], 0, 0, 0
+        with self.block(f"def {name}():"):
+            status = self.variable()
+            self.tick(node, status)
+            self.line(f"return {status}")
+        self.__functions.append("\n".join(self.__lines))
+
+
+class CompiledTick:
+    """
+    the tick of an attached tree, compiled into a specialized Python function
+
+    the built-in nodes, and any node implementing `_compile_tick`, are inlined
+    into their parent's code, while other nodes are ticked with their `_do_tick`;
+    nodes keep their statuses and state, so the tree can still be ticked, halted
+    and inspected as usual
+
+    the tree's structure and literal ports are fixed when it is compiled, so
+    it should be compiled again after a subtree is replaced or built lazily
+    """
+
+    def __init__(self, root: BehaviorTree) -> None:
+        root.blackboard()
+        self.__tick, self.__source = TickCode().build(root)
+
+    def __call__(self) -> NodeStatus:
+        """tick the tree"""
+        return self.__tick()
+
+    def source(self) -> str:
+        """get the generated code"""
+        return self.__source
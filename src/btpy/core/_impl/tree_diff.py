@@ -0,0 +1,223 @@
+from collections import deque
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from enum import Enum
+from typing import Iterator, Mapping, Sequence
+
+from btpy.core._impl.behavior_tree import BehaviorTree, RootTree, SubTree
+from btpy.core._impl.bt_parser import BTParser
+from btpy.core._impl.tree_template import NodePlan, SubTreePlan, TreeTemplate
+
+_Node = BehaviorTree | NodePlan | SubTreePlan
+
+
+class ChangeKind(Enum):
+    """how part of a tree changed"""
+
+    ADDED = "added"
+    REMOVED = "removed"
+    MODIFIED = "modified"
+
+
+@dataclass(frozen=True, slots=True)
+class TreeChange:
+    """
+    a single difference between two trees
+
+    the `path` starts with the name of the subtree definition, followed by
+    each node's type and its index among its siblings, e.g. `main/Sequence/Inverter[2]`
+
+    when the change is to one of the node's ports, `port` is its name,
+    and `old` and `new` are its values before and after the change
+    """
+
+    kind: ChangeKind
+    path: str
+    port: str | None = None
+    old: str | None = None
+    new: str | None = None
+
+    def __str__(self) -> str:
+        if self.port is None:
+            return f"{self.kind.value} {self.path}"
+        return (
+            f"{self.kind.value} {self.path} {self.port}: {self.old!r} -> {self.new!r}"
+        )
+
+
+class TreeDiff:
+    """finds the structural differences between two versions of a tree"""
+
+    @staticmethod
+    def compare(
+        old: BTParser | TreeTemplate | RootTree, new: BTParser | TreeTemplate | RootTree
+    ) -> list[TreeChange]:
+        """
+        list the differences between two trees, or two loaded libraries of trees
+
+        subtrees whose digests match are skipped without being visited,
+        so the cost depends on the size of the change, not of the trees
+        """
+        return list(TreeDiff.iter_changes(old, new))
+
+    @staticmethod
+    def iter_changes(
+        old: BTParser | TreeTemplate | RootTree, new: BTParser | TreeTemplate | RootTree
+    ) -> Iterator[TreeChange]:
+        """list the differences between two trees, one at a time"""
+        if isinstance(old, RootTree) or isinstance(new, RootTree):
+            assert isinstance(old, RootTree) and isinstance(new, RootTree)
+            if old.digest() == new.digest():
+                return
+
+            old_main, new_main = old.class_name(), new.class_name()
+            old_definitions: Mapping[str, _Node] = {old_main: old.child()}
+            new_definitions: Mapping[str, _Node] = {new_main: new.child()}
+
+        else:
+            old_template = old.library() if isinstance(old, BTParser) else old
+            new_template = new.library() if isinstance(new, BTParser) else new
+            old_main, new_main = old_template.main_tree(), new_template.main_tree()
+            old_definitions = old_template.definitions()
+            new_definitions = new_template.definitions()
+
+        if old_main != new_main:
+            yield TreeChange(
+                ChangeKind.MODIFIED, "", "main_tree_to_execute", old_main, new_main
+            )
+
+        yield from TreeDiff()._iter_definitions(old_definitions, new_definitions)
+
+    def __init__(self) -> None:
+        # definitions that are still to be compared, and those that already were
+        self._pending = deque[tuple[str, _Node, _Node]]()
+        self._compared = set[str]()
+
+    def _iter_definitions(
+        self, old: Mapping[str, _Node], new: Mapping[str, _Node]
+    ) -> Iterator[TreeChange]:
+        """compare each subtree definition, by name"""
+        for name in old:
+            if name not in new:
+                yield TreeChange(ChangeKind.REMOVED, name)
+
+        for name in new:
+            if name not in old:
+                yield TreeChange(ChangeKind.ADDED, name)
+            else:
+                self._pending.append((name, old[name], new[name]))
+
+        # subtrees of a `RootTree` are only found while comparing their references
+        while self._pending:
+            name, old_root, new_root = self._pending.popleft()
+            if name in self._compared:
+                continue
+
+            self._compared.add(name)
+            if old_root.digest() == new_root.digest():
+                continue
+
+            if _name(old_root) != _name(new_root):
+                yield TreeChange(ChangeKind.REMOVED, f"{name}/{_name(old_root)}")
+                yield TreeChange(ChangeKind.ADDED, f"{name}/{_name(new_root)}")
+            else:
+                yield from self._iter_nodes(
+                    f"{name}/{_name(new_root)}", old_root, new_root
+                )
+
+    def _iter_nodes(self, path: str, old: _Node, new: _Node) -> Iterator[TreeChange]:
+        """compare two nodes of the same type, along with their descendants"""
+        stack = [(path, old, new)]
+        while stack:
+            path, old, new = stack.pop()
+            yield from _iter_ports(path, _ports(old), _ports(new))
+            if isinstance(old, SubTree) and isinstance(new, SubTree):
+                self._pending.append((old.class_name(), old.child(), new.child()))
+                continue
+
+            # the children of each modified pair are compared after all of its siblings
+            modified = list[tuple[str, _Node, _Node]]()
+            yield from _iter_children(path, _children(old), _children(new), modified)
+            stack.extend(reversed(modified))
+
+
+def _iter_children(
+    path: str,
+    old: Sequence[_Node],
+    new: Sequence[_Node],
+    modified: list[tuple[str, _Node, _Node]],
+) -> Iterator[TreeChange]:
+    """
+    align two lists of children, collecting the pairs that need to be compared
+
+    identical children are skipped, first at either end of the lists and then
+    wherever they match up by digest, then the remaining children are paired
+    up by type, and any left over were added or removed
+    """
+    old_digests = [child.digest() for child in old]
+    new_digests = [child.digest() for child in new]
+    shortest = min(len(old), len(new))
+    start = 0
+    while start < shortest and old_digests[start] == new_digests[start]:
+        start = start + 1
+    end = 0
+    while end < shortest - start and old_digests[-1 - end] == new_digests[-1 - end]:
+        end = end + 1
+
+    identical = SequenceMatcher(
+        None,
+        old_digests[start : len(old) - end],
+        new_digests[start : len(new) - end],
+        False,
+    )
+    for tag, i1, i2, j1, j2 in identical.get_opcodes():
+        if tag == "equal":
+            continue
+
+        i1, i2, j1, j2 = i1 + start, i2 + start, j1 + start, j2 + start
+        same_type = SequenceMatcher(
+            None,
+            [_name(child) for child in old[i1:i2]],
+            [_name(child) for child in new[j1:j2]],
+            False,
+        )
+        for tag, k1, k2, l1, l2 in same_type.get_opcodes():
+            if tag == "equal":
+                for i, j in zip(range(i1 + k1, i1 + k2), range(j1 + l1, j1 + l2)):
+                    if old[i].digest() != new[j].digest():
+                        modified.append(
+                            (f"{path}/{_name(new[j])}[{j}]", old[i], new[j])
+                        )
+                continue
+
+            for i in range(i1 + k1, i1 + k2):
+                yield TreeChange(ChangeKind.REMOVED, f"{path}/{_name(old[i])}[{i}]")
+            for j in range(j1 + l1, j1 + l2):
+                yield TreeChange(ChangeKind.ADDED, f"{path}/{_name(new[j])}[{j}]")
+
+
+def _iter_ports(
+    path: str, old: Mapping[str, str], new: Mapping[str, str]
+) -> Iterator[TreeChange]:
+    """compare the port mappings of two nodes"""
+    for port in sorted(old.keys() | new.keys()):
+        if port not in new:
+            yield TreeChange(ChangeKind.REMOVED, path, port, old[port], None)
+        elif port not in old:
+            yield TreeChange(ChangeKind.ADDED, path, port, None, new[port])
+        elif old[port] != new[port]:
+            yield TreeChange(ChangeKind.MODIFIED, path, port, old[port], new[port])
+
+
+def _name(node: _Node) -> str:
+    return node.class_name() if isinstance(node, BehaviorTree) else node.name
+
+
+def _ports(node: _Node) -> Mapping[str, str]:
+    return node.mappings() if isinstance(node, BehaviorTree) else node.ports
+
+
+def _children(node: _Node) -> Sequence[_Node]:
+    if isinstance(node, BehaviorTree):
+        return node.children()
+    return node.children if isinstance(node, NodePlan) else ()
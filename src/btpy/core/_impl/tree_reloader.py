@@ -0,0 +1,198 @@
+from functools import partial
+from itertools import repeat
+from pathlib import Path
+
+from btpy.core._impl.behavior_tree import BehaviorTree, RootTree, SubTree
+from btpy.core._impl.blackboard import Blackboard
+from btpy.core._impl.bt_parser import BTParser
+from btpy.core._impl.tree_template import NodePlan, SubTreePlan, TreeTemplate
+
+
+class TreeReloader:
+    """
+    keeps a live `RootTree` up to date with the files it was loaded from
+
+    when a file changes, only the nodes of the changed definitions whose type,
+    ports or number of children changed are rebuilt, along with their descendants;
+    every other node, including each nested `SubTree`, keeps its state and blackboard
+
+    the files are not watched; call `changed()` or `reload()` to poll them,
+    e.g. between ticks
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        parser: BTParser | None = None,
+        blackboard: Blackboard | None = None,
+    ) -> None:
+        """load the tree at `path` with the `parser`, attached to the `blackboard`"""
+        self._path = Path(path)
+        self._parser = parser or BTParser()
+        self._template = self._parser.parse_template(self._path)
+        self._versions = _versions(self._template)
+        # the node each decorated node was built for, since the parser's
+        # decorators wrap every node in nodes of other types
+        self._undecorated = dict[BehaviorTree, BehaviorTree]()
+        main_tree = self._template.main_tree()
+        self._tree = RootTree(
+            main_tree,
+            self._template._build(
+                self._template.definitions()[main_tree],
+                self._parser._lazy_subtrees,
+                self._undecorated,
+            ),
+        ).attach_blackboard(blackboard or Blackboard())
+        # every live instance of each subtree, so they can be found without a search
+        self._subtrees = dict[str, dict[SubTree, None]]()
+        # the indexed subtrees that were not built yet, whose contents are not indexed
+        self._unexpanded = dict[SubTree, None]()
+        self._index(self._tree)
+
+    def tree(self) -> RootTree:
+        """get the live tree"""
+        return self._tree
+
+    def changed(self) -> bool:
+        """check whether any of the files the tree was loaded from have changed"""
+        return _versions(self._template) != self._versions
+
+    def reload(self) -> list[str]:
+        """
+        update each subtree whose definition changed, returning their names
+
+        this should be called between ticks, and halts each node that is
+        rebuilt; only the files that changed are parsed again
+        """
+        if not self.changed():
+            return []
+
+        template = self._parser.parse_template(self._path)
+        if template.main_tree() != self._template.main_tree():
+            raise RuntimeError(
+                f"cannot reload {self._template.main_tree()} as {template.main_tree()}"
+            )
+
+        previous = self._template.definitions()
+        changed = [
+            name
+            for name, plan in template.definitions().items()
+            if name in previous
+            and plan is not previous[name]
+            and plan.digest() != previous[name].digest()
+        ]
+        self._template = template
+        self._versions = _versions(template)
+
+        # index the subtrees that were built since they were indexed
+        for subtree in list(self._unexpanded):
+            if subtree.expanded():
+                del self._unexpanded[subtree]
+                self._index(subtree.child())
+
+        # subtrees built during this reload are already up to date
+        built = set[SubTree]()
+        for name in changed:
+            instances = self._subtrees.get(name, {})
+            for subtree in list(instances):
+                # an instance may have been rebuilt along with a node containing it
+                if subtree in built or subtree not in instances:
+                    continue
+
+                if subtree.expanded():
+                    self._patch(subtree, template, built)
+                else:
+                    subtree.replace(
+                        partial(
+                            template._build,
+                            template.definitions()[name],
+                            self._parser._lazy_subtrees,
+                            self._undecorated,
+                        )
+                    )
+
+        return changed
+
+    def _patch(
+        self, subtree: SubTree, template: TreeTemplate, built: set[SubTree]
+    ) -> None:
+        """rebuild each node of the `subtree` that no longer matches its definition"""
+        plan = template.definitions()[subtree.class_name()]
+        stack: list[tuple[BehaviorTree, BehaviorTree, NodePlan | SubTreePlan]] = [
+            (subtree, subtree.child(), plan)
+        ]
+        while stack:
+            parent, node, plan = stack.pop()
+            loaded = self._undecorated.get(node, node)
+            if _matches(loaded, plan):
+                if isinstance(plan, NodePlan):
+                    stack.extend(zip(repeat(loaded), loaded.children(), plan.children))
+                continue
+
+            self._unindex(node)
+            new = template._build(plan, self._parser._lazy_subtrees, self._undecorated)
+            if parent is subtree:
+                subtree.replace(new)
+            else:
+                parent._replace(node, new)
+            built.update(self._index(new))
+
+    def _index(self, node: BehaviorTree) -> list[SubTree]:
+        """add each subtree in the tree rooted at `node` to the index"""
+        subtrees = [
+            subtree for subtree in _built_nodes(node) if isinstance(subtree, SubTree)
+        ]
+        for subtree in subtrees:
+            self._subtrees.setdefault(subtree.class_name(), {})[subtree] = None
+            if not subtree.expanded():
+                self._unexpanded[subtree] = None
+        return subtrees
+
+    def _unindex(self, node: BehaviorTree) -> None:
+        """remove each subtree in the tree rooted at `node` from the index"""
+        for subtree in _built_nodes(node):
+            self._undecorated.pop(subtree, None)
+            if isinstance(subtree, SubTree):
+                del self._subtrees[subtree.class_name()][subtree]
+                self._unexpanded.pop(subtree, None)
+
+
+def _built_nodes(node: BehaviorTree) -> list[BehaviorTree]:
+    """list the nodes in the tree rooted at `node`, without building lazy subtrees"""
+    nodes = list[BehaviorTree]()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        if not isinstance(node, SubTree) or node.expanded():
+            stack.extend(node.children())
+    return nodes
+
+
+def _matches(node: BehaviorTree, plan: NodePlan | SubTreePlan) -> bool:
+    """
+    check whether the `node` can be kept for the `plan`, comparing its children
+    separately; a subtree is kept if it references the same definition
+    """
+    if isinstance(plan, SubTreePlan):
+        return (
+            isinstance(node, SubTree)
+            and node.class_name() == plan.name
+            and node.mappings() == plan.ports
+        )
+
+    return (
+        not isinstance(node, SubTree)
+        and node.class_name() == plan.name
+        and node.mappings() == plan.ports
+        and len(node.children()) == len(plan.children)
+    )
+
+
+def _versions(template: TreeTemplate) -> dict[Path, tuple[int, int]]:
+    """get the modification time and size of each of the `template`'s files"""
+    versions = dict[Path, tuple[int, int]]()
+    for path, _ in template.sources():
+        stat = path.stat()
+        versions[path] = (stat.st_mtime_ns, stat.st_size)
+    return versions
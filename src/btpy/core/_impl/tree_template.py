@@ -0,0 +1,243 @@
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+from btpy.core._impl.behavior_tree import BehaviorTree, RootTree, SubTree, node_digest
+from btpy.core._impl.blackboard import Blackboard
+from btpy.core._impl.node_registration import BehaviorTreeFactoryFunction
+
+
+@dataclass(frozen=True, slots=True, init=False)
+class NodePlan:
+    """a pre-resolved description of a single node and its children"""
+
+    name: str
+    factory: BehaviorTreeFactoryFunction
+    ports: Mapping[str, str]
+    children: tuple["NodePlan | SubTreePlan", ...]
+    _digest: bytes | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __init__(
+        self,
+        name: str,
+        factory: BehaviorTreeFactoryFunction,
+        ports: Mapping[str, str],
+        children: tuple["NodePlan | SubTreePlan", ...],
+    ) -> None:
+        # the generated `__init__` of a frozen dataclass sets each field through
+        # `object.__setattr__`, which is most of the cost of compiling a node,
+        # so the slots are set through their descriptors instead
+        _set_name(self, name)
+        _set_factory(self, factory)
+        _set_ports(self, ports)
+        _set_children(self, children)
+        _set_digest(self, None)
+
+    def digest(self) -> bytes:
+        """
+        get a hash of the plan, excluding the definitions its `SubTreePlan`s refer to
+
+        for a plan that references no subtrees, this is the same hash as
+        `BehaviorTree.digest` of the node it builds; otherwise the two differ,
+        since a built `SubTree` hashes its root, so each definition can be
+        compared on its own
+        """
+        # visit the plan in post-order, so each node's children are hashed first
+        stack: list[tuple[NodePlan, bool]] = [(self, False)]
+        while stack:
+            plan, visited = stack.pop()
+            if plan._digest is not None:
+                continue
+
+            if not visited:
+                stack.append((plan, True))
+                stack.extend(
+                    (child, False)
+                    for child in plan.children
+                    if isinstance(child, NodePlan)
+                )
+                continue
+
+            digest = node_digest(
+                plan.name, plan.ports, (child.digest() for child in plan.children)
+            )
+            # the plan is frozen, but its digest is only a cache
+            object.__setattr__(plan, "_digest", digest)
+
+        assert self._digest is not None
+        return self._digest
+
+
+_set_name, _set_factory, _set_ports, _set_children, _set_digest = (
+    vars(NodePlan)[name].__set__
+    for name in ("name", "factory", "ports", "children", "_digest")
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SubTreePlan:
+    """a reference to a subtree definition, along with the ports it remaps"""
+
+    name: str
+    ports: Mapping[str, str]
+
+    def digest(self) -> bytes:
+        """get a hash of the reference, excluding the definition it refers to"""
+        return node_digest(self.name, self.ports, ())
+
+
+# the plans to build for a plan, in post-order, with the number of children each takes
+_Steps = list[tuple[NodePlan | SubTreePlan, int]]
+
+
+class TreeTemplate:
+    """an immutable, pre-resolved tree description that can be instantiated many times"""
+
+    def __init__(
+        self,
+        main_tree: str,
+        definitions: Mapping[str, NodePlan | SubTreePlan],
+        decorators: tuple[Callable[[BehaviorTree], BehaviorTree], ...] = (),
+        sources: tuple[tuple[Path, bytes], ...] = (),
+    ) -> None:
+        assert main_tree in definitions
+        self._main_tree = main_tree
+        self._definitions = MappingProxyType(dict(definitions))
+        self._decorators = decorators
+        self._sources = sources
+        # the steps of each plan built so far, by its id and whether it was lazy,
+        # along with the plan itself, so the id cannot be reused while cached
+        self.__steps: dict[tuple[int, bool], tuple[NodePlan | SubTreePlan, _Steps]] = {}
+
+    def main_tree(self) -> str:
+        """get the name of the tree to execute"""
+        return self._main_tree
+
+    def definitions(self) -> Mapping[str, NodePlan | SubTreePlan]:
+        """get the plan of each subtree definition"""
+        return self._definitions
+
+    def sources(self) -> tuple[tuple[Path, bytes], ...]:
+        """get the files the template was loaded from, along with their content hashes"""
+        return self._sources
+
+    def instantiate(
+        self,
+        blackboard: Blackboard | None = None,
+        lazy_subtrees: bool = False,
+    ) -> RootTree:
+        """
+        build a fresh `RootTree` attached to the `blackboard`
+
+        when `lazy_subtrees`, each `SubTree` is only built the first time it is needed
+        """
+        return RootTree(
+            self._main_tree,
+            self._build(self._definitions[self._main_tree], lazy_subtrees),
+        ).attach_blackboard(blackboard or Blackboard())
+
+    def build(self, name: str, lazy_subtrees: bool = False) -> BehaviorTree:
+        """build a fresh, unattached root for the subtree definition `name`"""
+        return self._build(self._definitions[name], lazy_subtrees)
+
+    def _build(
+        self,
+        plan: NodePlan | SubTreePlan,
+        lazy: bool,
+        undecorated: dict[BehaviorTree, BehaviorTree] | None = None,
+    ) -> BehaviorTree:
+        """
+        instantiate the node described by the `plan`
+
+        if given, `undecorated` records the node built for each plan, by
+        the outermost of the decorators wrapping it, for every decorated node
+        """
+        nodes: list[BehaviorTree] = []
+        decorated = bool(self._decorators)
+        for step, count in self.__steps_of(plan, lazy):
+            if count:
+                children = nodes[-count:]
+                del nodes[-count:]
+            else:
+                children = []
+            # most nodes are undecorated loaded nodes, built here without a call
+            if decorated or type(step) is not NodePlan:
+                nodes.append(self.__build_node(step, children, lazy, undecorated))
+            else:
+                nodes.append(step.factory(children, **step.ports))
+
+        (node,) = nodes
+        return node
+
+    def __steps_of(self, plan: NodePlan | SubTreePlan, lazy: bool) -> _Steps:
+        """
+        get the plans to build for the `plan`, in post-order, along
+        with the number of built children that each one takes
+
+        the steps are worked out once per plan, so that building
+        a tree is a single loop over them
+        """
+        cached = self.__steps.get((id(plan), lazy))
+        if cached is not None and cached[0] is plan:
+            return cached[1]
+
+        steps: _Steps = []
+        # each plan to visit, and whether its children have been visited
+        stack = [(plan, False)]
+        # the subtree definitions being visited, which must not contain themselves
+        building: set[str] = set()
+        while stack:
+            visiting, visited = stack.pop()
+            if isinstance(visiting, NodePlan):
+                if visited or not visiting.children:
+                    steps.append((visiting, len(visiting.children)))
+                else:
+                    stack.append((visiting, True))
+                    stack.extend(
+                        [(child, False) for child in reversed(visiting.children)]
+                    )
+
+            elif lazy:
+                steps.append((visiting, 0))
+
+            elif visited:
+                building.discard(visiting.name)
+                steps.append((visiting, 1))
+
+            else:
+                if visiting.name in building:
+                    raise RuntimeError(f"subtree {visiting.name} contains itself")
+                building.add(visiting.name)
+                stack.append((visiting, True))
+                stack.append((self._definitions[visiting.name], False))
+
+        self.__steps[(id(plan), lazy)] = (plan, steps)
+        return steps
+
+    def __build_node(
+        self,
+        plan: NodePlan | SubTreePlan,
+        children: list[BehaviorTree],
+        lazy: bool,
+        undecorated: dict[BehaviorTree, BehaviorTree] | None,
+    ) -> BehaviorTree:
+        """instantiate the node described by the `plan`, given its built `children`"""
+        if isinstance(plan, SubTreePlan):
+            return SubTree(
+                plan.name,
+                partial(self._build, self._definitions[plan.name], lazy, undecorated)
+                if lazy
+                else children[0],
+                **plan.ports,
+            )
+
+        loaded = plan.factory(children, **plan.ports)
+        assert loaded.class_name() == plan.name
+        node = loaded
+        for decorator in self._decorators:
+            node = decorator(node)
+        if undecorated is not None and node is not loaded:
+            undecorated[node] = loaded
+        return node
@@ -0,0 +1,86 @@
+import random
+from typing import Callable, Iterable, override
+
+from btpy import BehaviorTree, NodeStatus
+from btpy.builtins import (
+    Delay,
+    Fallback,
+    ForceFailure,
+    ForceSuccess,
+    Inverter,
+    KeepRunningUntilFailure,
+    ReactiveFallback,
+    ReactiveSequence,
+    Repeat,
+    RetryUntilSuccessful,
+    RunOnce,
+    Sequence,
+    SequenceWithMemory,
+)
+from btpy.core import SubTree
+
+Log = list[tuple[str, str]]
+
+CONTROLS: list[Callable[[list[BehaviorTree]], BehaviorTree]] = [
+    Sequence,
+    SequenceWithMemory,
+    ReactiveSequence,
+    Fallback,
+    ReactiveFallback,
+]
+
+DECORATORS: list[Callable[[BehaviorTree], BehaviorTree]] = [
+    lambda child: Inverter([child]),
+    lambda child: ForceSuccess([child]),
+    lambda child: ForceFailure([child]),
+    lambda child: KeepRunningUntilFailure([child]),
+    lambda child: Repeat([child], num_cycles="2"),
+    lambda child: RetryUntilSuccessful([child], num_attempts="2"),
+    lambda child: RunOnce([child], then_skip="false"),
+    lambda child: Delay([child], delay_msec="0"),
+    lambda child: SubTree("subtree", child),
+]
+
+
+class Scripted(BehaviorTree):
+    """a leaf that returns the next of its `statuses` on each tick, logging its ticks and halts"""
+
+    def __init__(
+        self, label: str, statuses: Iterable[int], log: Log | None = None
+    ) -> None:
+        super().__init__(name=label)
+        self.__label = label
+        self.__statuses = iter(statuses)
+        self.__log = log
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        if self.__log is not None:
+            self.__log.append(("tick", self.__label))
+        return NodeStatus(next(self.__statuses))
+
+    @override
+    def halt(self) -> None:
+        if self.__log is not None and self.active():
+            self.__log.append(("halt", self.__label))
+        super().halt()
+
+
+def build(
+    rng: random.Random,
+    leaf: Callable[[], BehaviorTree],
+    depth: int = 6,
+    controls: list[Callable[[list[BehaviorTree]], BehaviorTree]] = CONTROLS,
+    decorators: list[Callable[[BehaviorTree], BehaviorTree]] = DECORATORS,
+) -> BehaviorTree:
+    """build a random tree of the `controls` and `decorators`, with `leaf()` leaves"""
+    if depth == 0 or rng.random() < 0.2:
+        return leaf()
+
+    if rng.randrange(2):
+        children = [
+            build(rng, leaf, depth - 1, controls, decorators)
+            for _ in range(rng.randint(1, 4))
+        ]
+        return rng.choice(controls)(children)
+    return rng.choice(decorators)(build(rng, leaf, depth - 1, controls, decorators))
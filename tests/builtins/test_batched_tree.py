@@ -0,0 +1,171 @@
+import itertools
+import random
+from typing import Any, Callable, Iterator, override
+
+import pytest
+from btpy import BehaviorTree, Blackboard, BTParser, NodeRegistration, NodeStatus
+from btpy.builtins import Observer, Sequence
+from btpy.core import BatchedTree, RootTree
+from random_trees import Scripted, build
+
+np = pytest.importorskip("numpy")
+
+_AGENTS = 8
+_TICKS = 30
+
+
+def _build(seed: int, leaf: Callable[[str], BehaviorTree]) -> BehaviorTree:
+    """build a random tree of the built-in nodes, naming each leaf in order"""
+    labels = itertools.count()
+    return build(random.Random(seed), lambda: leaf(f"leaf {next(labels)}"))
+
+
+def _scripts(
+    labels: list[str], seed: int
+) -> tuple[dict[str, Any], dict[str, Callable[[Any], Any]]]:
+    """the statuses of each leaf for each agent and tick, and leaves returning them"""
+    generator = np.random.default_rng(seed)
+    # a leaf is ticked at most twice per node above it each tick
+    scripts = {
+        label: generator.integers(1, 5, (_AGENTS, _TICKS * 64), dtype=np.uint8)
+        for label in labels
+    }
+
+    def leaf(label: str) -> Callable[[Any], Any]:
+        ticks = np.zeros(_AGENTS, np.intp)
+
+        def tick(agents: Any) -> Any:
+            statuses = scripts[label][agents, ticks[agents]]
+            ticks[agents] += 1
+            return statuses
+
+        return tick
+
+    return scripts, {label: leaf(label) for label in labels}
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_batch_matches_tick(seed: int) -> None:
+    """test that each agent of a batch behaves like its own tree, ticked with `tick`"""
+    labels = list[str]()
+
+    def prototype_leaf(label: str) -> BehaviorTree:
+        labels.append(label)
+        return Scripted(label, [])
+
+    prototype = RootTree("main", _build(seed, prototype_leaf)).attach_blackboard(
+        Blackboard()
+    )
+    scripts, leaves = _scripts(labels, seed)
+    batch = BatchedTree(prototype, _AGENTS, leaves)
+
+    trees = [
+        RootTree(
+            "main",
+            _build(seed, lambda label: Scripted(label, scripts[label][agent].tolist())),
+        ).attach_blackboard(Blackboard())
+        for agent in range(_AGENTS)
+    ]
+
+    rng = random.Random(seed)
+    for count in range(_TICKS):
+        agents = sorted(rng.sample(range(_AGENTS), rng.randint(1, _AGENTS)))
+        assert batch.tick(agents).tolist() == [
+            trees[agent].tick().value for agent in agents
+        ]
+        if count % 7 == 6:
+            batch.halt(agents[::2])
+            for agent in agents[::2]:
+                trees[agent].halt()
+
+        for nodes in zip(prototype, *trees):
+            assert batch.status(nodes[0]).tolist() == [
+                node.status().value for node in nodes[1:]
+            ]
+            assert batch.active(nodes[0]).tolist() == [
+                node.active() for node in nodes[1:]
+            ]
+
+
+class _Move(BehaviorTree):
+    @override
+    def _do_tick(self) -> NodeStatus:
+        return NodeStatus.SUCCESS
+
+
+@pytest.fixture
+def register_move() -> Iterator[None]:
+    with NodeRegistration.scope():
+        NodeRegistration.register(_Move)
+        yield
+
+
+@pytest.mark.usefixtures("register_move")
+def test_batch_of_a_parsed_tree() -> None:
+    """test that the leaves of a parsed tree are ticked by name, with shared ports"""
+    xml = """
+    <root BTCPP_format="4" main_tree_to_execute="main">
+        <BehaviorTree ID="main">
+            <Repeat num_cycles="{cycles}">
+                <Sequence>
+                    <_Move name="ready" />
+                    <_Move />
+                </Sequence>
+            </Repeat>
+        </BehaviorTree>
+    </root>
+    """
+    blackboard = Blackboard()
+    blackboard.set("cycles", 3)
+    tree = BTParser().parse_string(xml.strip(), blackboard=blackboard)
+    ready = np.array([True, False, True, True])
+    moves = np.zeros(4, np.intp)
+
+    def move(agents: Any) -> int:
+        moves[agents] += 1
+        return NodeStatus.SUCCESS.value
+
+    batch = BatchedTree(
+        tree,
+        4,
+        {
+            "ready": lambda agents: np.where(
+                ready[agents], NodeStatus.SUCCESS.value, NodeStatus.FAILURE.value
+            ),
+            "_Move": move,
+        },
+    )
+    assert batch.size() == 4
+    assert [NodeStatus(value) for value in batch.tick()] == [
+        NodeStatus.SUCCESS,
+        NodeStatus.FAILURE,
+        NodeStatus.SUCCESS,
+        NodeStatus.SUCCESS,
+    ]
+    assert moves.tolist() == [3, 0, 3, 3]
+    assert batch.active(tree).tolist() == [True] * 4
+
+    blackboard.set("cycles", 5)
+    batch.tick([0, 1])
+    assert moves.tolist() == [5, 0, 3, 3]
+
+
+def test_nodes_without_a_batched_tick_are_rejected() -> None:
+    """test that a node only implementing `_do_tick` needs a leaf"""
+
+    class _Print(Observer):
+        @override
+        def observe(self, node: BehaviorTree) -> Any:
+            raise AssertionError
+
+    leaf = Scripted("leaf", [])
+    tree = RootTree("main", Sequence([leaf])).attach_blackboard(Blackboard())
+    with pytest.raises(ValueError):
+        BatchedTree(tree, 2)
+    BatchedTree(tree, 2, {"leaf": lambda agents: NodeStatus.SUCCESS.value})
+
+    observed = RootTree("main", _Print(Scripted("leaf", []))).attach_blackboard(
+        Blackboard()
+    )
+    with pytest.raises(ValueError):
+        BatchedTree(observed, 2, {"leaf": lambda agents: NodeStatus.SUCCESS.value})
@@ -0,0 +1,91 @@
+import itertools
+import random
+from contextlib import contextmanager
+from typing import Callable, Iterator, override
+
+import pytest
+from btpy import BehaviorTree, Blackboard, NodeStatus
+from btpy.builtins import Observer, ReactiveSequence
+from btpy.core import CompiledTick, RootTree
+from random_trees import CONTROLS, DECORATORS, Log, Scripted, build
+
+
+class _Twice(BehaviorTree):
+    """a node with children that only implements `_do_tick`"""
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        for child in self.children():
+            if child.tick() == NodeStatus.FAILURE:
+                return NodeStatus.FAILURE
+        return self.children()[0].tick()
+
+
+class _Eager(ReactiveSequence):
+    """a built-in node whose `_do_tick` is overridden to not halt later siblings"""
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        for child in self.children():
+            if (status := child.tick()) != NodeStatus.SUCCESS:
+                return status
+        return NodeStatus.SUCCESS
+
+
+_CONTROLS = [*CONTROLS, _Twice, _Eager]
+
+
+class _Logger(Observer):
+    def __init__(self, node: BehaviorTree, log: Log) -> None:
+        super().__init__(node)
+        self.__log = log
+
+    @override
+    @contextmanager
+    def observe(self, node: BehaviorTree) -> Iterator[None]:
+        yield
+        self.__log.append((node.class_name(), node.status().name))
+
+
+def _build(seed: int, log: Log) -> BehaviorTree:
+    """build a random tree of the built-in nodes, with scripted leaves and observers"""
+    rng = random.Random(seed)
+
+    def leaf() -> BehaviorTree:
+        statuses = random.Random(rng.randrange(1 << 30))
+        return Scripted(
+            f"leaf {rng.random()}",
+            (statuses.choice(list(NodeStatus)).value for _ in itertools.count()),
+            log,
+        )
+
+    decorators = [*DECORATORS, lambda child: _Logger(child, log)]
+    return build(rng, leaf, 6, _CONTROLS, decorators)
+
+
+_EXECUTORS: dict[str, Callable[[RootTree], Callable[[], NodeStatus]]] = {
+    "iterative": lambda tree: tree.tick_iteratively,
+    "compiled": CompiledTick,
+}
+
+
+@pytest.mark.parametrize("executor", _EXECUTORS)
+@pytest.mark.parametrize("seed", range(100))
+def test_executors_match_tick(executor: str, seed: int) -> None:
+    """test that the built-in nodes behave the same with each executor as with `tick`"""
+    logs = (Log(), Log())
+    trees = [
+        RootTree("main", _build(seed, log)).attach_blackboard(Blackboard())
+        for log in logs
+    ]
+    tick = _EXECUTORS[executor](trees[1])
+
+    for count in range(30):
+        assert trees[0].tick() == tick()
+        if count % 7 == 6:
+            trees[0].halt()
+            trees[1].halt()
+        assert logs[0] == logs[1]
+        assert [(node.status(), node.active()) for node in trees[0]] == [
+            (node.status(), node.active()) for node in trees[1]
+        ]
@@ -10,9 +10,11 @@ class _EchoAction(BehaviorTree):
         super().init()
         self.next_status = NodeStatus.SUCCESS
         self.halted = False
+        self.ticked = False
 
     @override
     def _do_tick(self) -> NodeStatus:
+        self.ticked = True
         return self.next_status
 
     @override
@@ -43,7 +45,8 @@ def test_fallback(
 
     assert Fallback([one, two]).tick() == final
     assert one.halted == should_halt
-    assert two.halted == should_halt
+    # children that were never ticked are not active, so are not halted
+    assert two.halted == (should_halt and two.ticked)
 
 
 @pytest.mark.parametrize(
@@ -101,4 +104,4 @@ def test_reactive_fallback(
 
     assert ReactiveFallback(list(echos)).tick() == final
     for echo in echos:
-        assert echo.halted == should_halt
+        assert echo.halted == (should_halt and echo.ticked)
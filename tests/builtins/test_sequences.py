@@ -10,9 +10,11 @@ class _EchoAction(BehaviorTree):
         super().init()
         self.next_status = NodeStatus.SUCCESS
         self.halted = False
+        self.ticked = False
 
     @override
     def _do_tick(self) -> NodeStatus:
+        self.ticked = True
         return self.next_status
 
     @override
@@ -42,7 +44,8 @@ def test_sequence(
 
     assert Sequence([one, two]).tick() == final
     assert one.halted == should_halt
-    assert two.halted == should_halt
+    # children that were never ticked are not active, so are not halted
+    assert two.halted == (should_halt and two.ticked)
 
 
 def test_sequence_with_memory() -> None:
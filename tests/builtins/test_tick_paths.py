@@ -0,0 +1,135 @@
+import random
+from typing import Any, Callable
+
+import pytest
+from btpy import BehaviorTree, Blackboard, NodeStatus
+from btpy.builtins import (
+    Delay,
+    Fallback,
+    ForceFailure,
+    ForceSuccess,
+    Inverter,
+    KeepRunningUntilFailure,
+    ReactiveFallback,
+    ReactiveSequence,
+    Repeat,
+    RetryUntilSuccessful,
+    RunOnce,
+    Sequence,
+    SequenceWithMemory,
+)
+from btpy.core import BatchedTree, CompiledTick, RootTree
+from random_trees import Scripted
+
+_TICKS = 40
+
+Builder = Callable[[list[BehaviorTree]], BehaviorTree]
+
+# the number of children of each built-in node, and how to build it
+_NODES: dict[str, tuple[int, Builder]] = {
+    "Sequence": (3, Sequence),
+    "SequenceWithMemory": (3, SequenceWithMemory),
+    "ReactiveSequence": (3, ReactiveSequence),
+    "Fallback": (3, Fallback),
+    "ReactiveFallback": (3, ReactiveFallback),
+    "Inverter": (1, Inverter),
+    "ForceSuccess": (1, ForceSuccess),
+    "ForceFailure": (1, ForceFailure),
+    "KeepRunningUntilFailure": (1, KeepRunningUntilFailure),
+    "Repeat": (1, lambda children: Repeat(children, num_cycles="3")),
+    "Repeat forever": (1, lambda children: Repeat(children, num_cycles="-1")),
+    "RetryUntilSuccessful": (
+        1,
+        lambda children: RetryUntilSuccessful(children, num_attempts="3"),
+    ),
+    "RunOnce": (1, lambda children: RunOnce(children, then_skip="false")),
+    "RunOnce then skip": (1, RunOnce),
+    "Delay": (1, lambda children: Delay(children, delay_msec="0")),
+}
+
+Scripts = dict[str, list[int]]
+Path = Callable[[Builder, Scripts], tuple[Callable[[], NodeStatus], Callable[[], None]]]
+
+
+def _tree(
+    builder: Builder, leaf: Callable[[str], BehaviorTree], labels: Scripts
+) -> BehaviorTree:
+    return RootTree(
+        "main", builder([leaf(label) for label in labels])
+    ).attach_blackboard(Blackboard())
+
+
+def _tick(
+    builder: Builder, scripts: Scripts
+) -> tuple[Callable[[], NodeStatus], Callable[[], None]]:
+    tree = _tree(builder, lambda label: Scripted(label, scripts[label]), scripts)
+    return tree.tick, tree.halt
+
+
+def _tick_iteratively(
+    builder: Builder, scripts: Scripts
+) -> tuple[Callable[[], NodeStatus], Callable[[], None]]:
+    tree = _tree(builder, lambda label: Scripted(label, scripts[label]), scripts)
+    return tree.tick_iteratively, tree.halt
+
+
+def _compiled_tick(
+    builder: Builder, scripts: Scripts
+) -> tuple[Callable[[], NodeStatus], Callable[[], None]]:
+    tree = _tree(builder, lambda label: Scripted(label, scripts[label]), scripts)
+    return CompiledTick(tree), tree.halt
+
+
+def _batched_tree(
+    builder: Builder, scripts: Scripts
+) -> tuple[Callable[[], NodeStatus], Callable[[], None]]:
+    np = pytest.importorskip("numpy")
+    ticks = dict.fromkeys(scripts, 0)
+
+    def leaf(label: str) -> Callable[[Any], Any]:
+        def tick(agents: Any) -> Any:
+            status = scripts[label][ticks[label]]
+            ticks[label] = ticks[label] + 1
+            return np.full(agents.shape, status, np.uint8)
+
+        return tick
+
+    tree = _tree(builder, lambda label: Scripted(label, []), scripts)
+    batch = BatchedTree(tree, 1, {label: leaf(label) for label in scripts})
+    return lambda: NodeStatus(batch.tick()[0].item()), batch.halt
+
+
+_PATHS: dict[str, Path] = {
+    "tick_iteratively": _tick_iteratively,
+    "CompiledTick": _compiled_tick,
+    "BatchedTree": _batched_tree,
+}
+
+
+def _statuses(path: Path, builder: Builder, scripts: Scripts) -> list[NodeStatus]:
+    """tick a tree through the `path`, halting it now and then"""
+    tick, halt = path(builder, scripts)
+    statuses = list[NodeStatus]()
+    for count in range(_TICKS):
+        statuses.append(tick())
+        if count % 7 == 6:
+            halt()
+    return statuses
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("path", _PATHS)
+@pytest.mark.parametrize("node", _NODES)
+def test_paths_match_tick(node: str, path: str, seed: int) -> None:
+    """test that each way of ticking a built-in node gives the statuses of `tick`"""
+    rng = random.Random(seed)
+    arity, builder = _NODES[node]
+    # `Repeat` and `RetryUntilSuccessful` tick a leaf up to three times per tick,
+    # and `Repeat forever` until it does not succeed
+    scripts = {
+        f"leaf {i}": [rng.randint(1, 4) for _ in range(_TICKS * 3)]
+        for i in range(arity)
+    }
+    assert _statuses(_PATHS[path], builder, scripts) == _statuses(
+        _tick, builder, scripts
+    )
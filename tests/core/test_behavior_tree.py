@@ -0,0 +1,170 @@
+import sys
+from typing import override
+
+from btpy import BehaviorTree, Blackboard, NodeStatus
+from btpy.builtins import Inverter, ReactiveSequence, Sequence
+from btpy.core import RootTree
+
+
+class _Action(BehaviorTree):
+    def init(self) -> None:
+        super().init()
+        self.next_status = NodeStatus.RUNNING
+        self.halts = list["_Action"]()
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        return self.next_status
+
+    @override
+    def halt(self) -> None:
+        if self.active():
+            self.halts.append(self)
+        super().halt()
+
+
+def test_only_active_nodes_are_halted() -> None:
+    """test that halting skips children that were not ticked since their last halt"""
+    running, idle = _Action(), _Action()
+    root = Sequence([Inverter([running]), Inverter([idle])])
+    assert not running.active()
+
+    assert root.tick() == NodeStatus.RUNNING
+    assert root.active() and running.active() and not idle.active()
+    root.halt()
+    assert not root.active() and not running.active()
+    assert running.halts == [running]
+    assert idle.halts == []
+
+    root.halt()
+    assert running.halts == [running]
+
+
+def test_ticking_a_descendant_activates_its_ancestors() -> None:
+    """test that a node ticked directly is still halted with its tree"""
+    action = _Action()
+    tree = RootTree("main", Sequence([action]))
+    action.tick()
+    assert tree.active()
+    tree.halt()
+    assert action.halts == [action] and not tree.active()
+
+
+def test_reactive_sequence_halts_later_active_siblings() -> None:
+    """test that a running child halts the later siblings that were running, in order"""
+    first, second, third = _Action(), _Action(), _Action()
+    first.next_status = second.next_status = NodeStatus.SUCCESS
+    root = ReactiveSequence([first, second, third])
+    assert root.tick() == NodeStatus.RUNNING
+
+    second.next_status = NodeStatus.RUNNING
+    assert root.tick() == NodeStatus.RUNNING
+    assert third.halts == [third] and second.active()
+    assert first.halts == [] and first.active()
+
+
+class _Parallel(BehaviorTree):
+    halts = list[tuple[str, bool]]()
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        for child in self.children():
+            child.tick()
+        return NodeStatus.RUNNING
+
+    @override
+    def halt(self) -> None:
+        if self.active():
+            # whether the children are still running when the node is halted
+            running = any(child.active() for child in self.children())
+            _Parallel.halts.append((self.name(), running))
+        super().halt()
+
+
+def test_nodes_are_halted_before_their_children() -> None:
+    """test that each node is halted before its descendants, depth first"""
+    root = _Parallel(
+        [
+            _Parallel([_Parallel([_Action()], name="c"), _Action()], name="b"),
+            _Parallel([_Action()], name="d"),
+        ],
+        name="a",
+    )
+    root.attach_blackboard(Blackboard())
+    _Parallel.halts.clear()
+    root.tick()
+    root.halt()
+    assert _Parallel.halts == [("a", True), ("b", True), ("c", True), ("d", True)]
+    assert not any(node.active() for node in root)
+
+
+class _Resetting(_Parallel):
+    @override
+    def halt(self) -> None:
+        super().halt()
+        # whether the children are still running once `super().halt()` returns
+        running = any(child.active() for child in self.children())
+        _Parallel.halts.append((self.name(), running))
+
+
+def test_children_are_halted_after_each_override_returns() -> None:
+    """test that the root and nested nodes halt their children in the same order"""
+    root = _Resetting([_Resetting([_Action()], name="b")], name="a")
+    root.attach_blackboard(Blackboard())
+    _Parallel.halts.clear()
+    root.tick()
+    root.halt()
+    assert _Parallel.halts == [
+        ("a", True),
+        ("a", True),
+        ("b", True),
+        ("b", True),
+    ]
+    assert not any(node.active() for node in root)
+
+
+def test_replaced_nodes_are_halted_by_their_new_parent() -> None:
+    """test that a replacement root is tracked by the subtree it was swapped into"""
+    old, new = _Action(), _Action()
+    tree = RootTree("main", old)
+    tree.tick()
+    tree.replace(new)
+    assert old.halts == [old] and not old.active()
+
+    tree.tick()
+    tree.halt()
+    assert new.halts == [new]
+
+
+def test_deep_trees_are_ticked_without_recursing() -> None:
+    """test that trees deeper than the recursion limit can be attached, ticked and halted"""
+    action = _Action()
+    node: BehaviorTree = action
+    depth = sys.getrecursionlimit() * 2
+    for _ in range(depth):
+        node = Inverter([node])
+    tree = RootTree("main", node).attach_blackboard(Blackboard())
+
+    assert tree.tick_iteratively() == NodeStatus.RUNNING
+    assert action.active() and tree.active()
+    assert sum(1 for _ in tree) == depth + 2
+
+    tree.halt()
+    assert action.halts == [action] and not tree.active()
+
+    action.next_status = NodeStatus.SUCCESS
+    expected = NodeStatus.SUCCESS if depth % 2 == 0 else NodeStatus.FAILURE
+    assert tree.tick_iteratively() == expected
+    assert tree.status() == expected and action.status() == NodeStatus.SUCCESS
+
+
+def test_iteration_is_in_pre_order() -> None:
+    """test that nodes are visited before their children, from left to right"""
+    tree = RootTree("main", Sequence([Inverter([_Action()]), _Action()]))
+    assert [node.class_name() for node in tree] == [
+        "main",
+        "Sequence",
+        "Inverter",
+        "_Action",
+        "_Action",
+    ]
@@ -1,5 +1,13 @@
+import gc
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
 from btpy import Blackboard
-from btpy.core import BlackboardChildType
+from btpy.core import BlackboardChildType, Pointer
 
 
 def test_top_level_blackboard() -> None:
@@ -171,3 +179,220 @@ def test_get_transformation() -> None:
     assert uut.get("none").value is None
     assert uut.get("none", int).value is None
     assert uut.get("none", str).value is None
+
+
+def test_resolved_keys_are_shadowed_by_later_remappings() -> None:
+    """test that a cached lookup is invalidated when a layer above it gains the key"""
+    root = Blackboard()
+    middle = root.create_child(BlackboardChildType.CHILD)
+    leaf = middle.create_child(BlackboardChildType.CHILD)
+    root.set("key", "root value")
+    assert leaf.get("key").value == "root value"
+    assert leaf.get("key") is root.get("key")
+
+    Blackboard.remap(root, middle, {"key": "middle value"})
+    assert leaf.get("key").value == "middle value"
+    assert leaf.get("key") is middle.get("key")
+
+
+def test_resolved_keys_respect_remapped_layers() -> None:
+    """test that deep lookups stop at remapped layers for private ports"""
+    root = Blackboard()
+    remapped = root.create_child(BlackboardChildType.REMAPPED)
+    leaf = remapped
+    for _ in range(10):
+        leaf = leaf.create_child(BlackboardChildType.CHILD)
+
+    for _ in range(2):
+        leaf.set("_private", "private value")
+        leaf.set("public", "public value")
+        assert root.get("_private").value is None
+        assert remapped.get("_private").value == "private value"
+        assert root.get("public").value == "public value"
+        assert leaf.get("@public") is root.get("public")
+
+
+def test_changed_since_lists_written_keys() -> None:
+    """test that writes, including through aliases, are recorded"""
+    root = Blackboard()
+    child = root.create_child(BlackboardChildType.CHILD)
+    root.set("a", 1)
+    root.set("b", 2)
+    Blackboard.remap(root, child, {"alias": "{a}"})
+
+    version = Pointer.clock()
+    assert root.changed_since(version) == []
+    child.get("alias").value = 3
+    assert root.changed_since(version) == ["a"]
+    assert child.changed_since(version) == ["alias"]
+
+    version = Pointer.clock()
+    root.set("b", 2)
+    root.set("c", 4)
+    assert root.changed_since(version) == ["b", "c"]
+    assert child.changed_since(version) == []
+
+
+def test_subscribers_are_notified_of_writes() -> None:
+    """test that subscribers see writes through every alias until they unsubscribe"""
+    root = Blackboard()
+    child = root.create_child(BlackboardChildType.CLEAN)
+    Blackboard.remap(root, child, {"alias": "{key}"})
+    seen = list[tuple[str, Any]]()
+    unsubscribe = root.subscribe("key", lambda key, value: seen.append((key, value)))
+
+    root.set("key", 1)
+    child.set("alias", 2)
+    assert seen == [("key", 1), ("key", 2)]
+
+    unsubscribe()
+    root.set("key", 3)
+    assert seen == [("key", 1), ("key", 2)]
+
+
+def test_snapshots_restore_written_entries() -> None:
+    """test that restoring rolls back writes through aliases, and only those"""
+    root = Blackboard()
+    child = root.create_child(BlackboardChildType.CLEAN)
+    other = Blackboard()
+    root.set("a", 1)
+    root.set("b", 2)
+    other.set("a", 1)
+    Blackboard.remap(root, child, {"alias": "{a}", "literal": "3"})
+
+    snapshot = child.snapshot()
+    assert snapshot.changed() == 0
+    child.set("alias", 10)
+    child.set("alias", 11)
+    child.set("literal", "4")
+    root.set("new", 5)
+    other.set("a", 6)
+    assert snapshot.changed() == 3
+
+    alias = child.get("alias")
+    snapshot.restore()
+    assert not snapshot.active()
+    assert child.get("alias") is alias is root.get("a")
+    assert root.get("a").value == 1
+    assert root.get("b").value == 2
+    assert child.get("literal").value == "3"
+    assert root.get("new").value is None
+    assert other.get("a").value == 6
+
+    root.set("a", 7)
+    assert root.get("a").value == 7
+
+
+def test_snapshots_can_be_committed_and_nested() -> None:
+    """test that committing keeps writes, and that nested snapshots roll back in turn"""
+    blackboard = Blackboard()
+    blackboard.set("key", 1)
+
+    outer = blackboard.snapshot()
+    blackboard.set("key", 2)
+    inner = blackboard.snapshot()
+    blackboard.set("key", 3)
+    inner.restore()
+    assert blackboard.get("key").value == 2
+
+    inner = blackboard.snapshot()
+    blackboard.set("key", 4)
+    inner.commit()
+    assert blackboard.get("key").value == 4
+
+    outer.restore()
+    assert blackboard.get("key").value == 1
+
+
+def test_abandoned_snapshots_stop_recording() -> None:
+    """test that a snapshot that is never restored or committed stops recording once collected"""
+    blackboard = Blackboard()
+    snapshot = blackboard.snapshot()
+    collected = weakref.ref(snapshot)
+    blackboard.set("key", 1)
+
+    del snapshot
+    gc.collect()
+    assert collected() is None
+    assert not blackboard._write_hooks
+
+
+@dataclass
+class _Frame:
+    x: float
+    y: float
+    valid: bool
+
+
+def test_set_many_is_one_write() -> None:
+    """test that bulk writes share a version and notify once all are written"""
+    root = Blackboard()
+    child = root.create_child(BlackboardChildType.CHILD)
+    seen = list[list[Any]]()
+    child.subscribe("a", lambda key, value: seen.append(child.get_many(["a", "b"])))
+
+    child.set_many({"a": 1, "b": 2, "@c": 3})
+    assert seen == [[1, 2]]
+    assert root.get("a").version() == root.get("c").version()
+    assert root.changed_since(root.get("a").version() - 1) == ["a", "b", "c"]
+    assert root.get_many(["a", "b", "c", "missing"]) == [1, 2, 3, None]
+
+
+def test_set_many_is_rolled_back() -> None:
+    """test that snapshots record bulk writes"""
+    blackboard = Blackboard()
+    blackboard.set_many({"a": 1, "b": 2})
+    snapshot = blackboard.snapshot()
+    blackboard.set_many({"a": 3, "b": 4})
+    snapshot.restore()
+    assert blackboard.get_many(["a", "b"]) == [1, 2]
+
+
+def test_dataclass_bindings() -> None:
+    """test that a dataclass's fields are written to and read from prefixed ports"""
+    blackboard = Blackboard()
+    binding = blackboard.bind(_Frame, prefix="pose.")
+    assert binding.keys() == ("pose.x", "pose.y", "pose.valid")
+
+    binding.write(_Frame(1.0, 2.0, True))
+    assert blackboard.get("pose.y").value == 2.0
+    blackboard.set("pose.x", 3.0)
+    assert _Frame(*binding.read()) == _Frame(3.0, 2.0, True)
+
+    names = blackboard.bind(["pose.x", "other"])
+    names.write([4.0, "value"])
+    assert binding.read() == (4.0, 2.0, True)
+    assert names.read() == (4.0, "value")
+
+
+def test_numpy_bindings() -> None:
+    """test that a structured record's fields are written as python values"""
+    np = pytest.importorskip("numpy")
+    dtype = np.dtype([("x", "f8"), ("count", "i4")])
+    frames = np.array([(1.5, 2), (0.0, 0)], dtype=dtype)
+
+    blackboard = Blackboard()
+    binding = blackboard.bind(dtype)
+    binding.write(frames[0])
+    assert blackboard.get_many(["x", "count"]) == [1.5, 2]
+    assert isinstance(blackboard.get("count").value, int)
+
+    frames[1] = binding.read()
+    assert frames[1].item() == (1.5, 2)
+
+
+def test_concurrent_lookups_share_entries() -> None:
+    """test that threads missing the same key at once all get the same entry"""
+    for _ in range(20):
+        root = Blackboard()
+        leaves = [root.create_child(BlackboardChildType.CHILD) for _ in range(8)]
+        barrier = threading.Barrier(8)
+
+        def look_up(leaf: Blackboard) -> list[Pointer[Any]]:
+            barrier.wait()
+            return [leaf.get(f"key {i}") for i in range(50)]
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(look_up, leaves))
+        for i in range(50):
+            assert all(result[i] is root.get(f"key {i}") for result in results)
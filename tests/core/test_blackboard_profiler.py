@@ -0,0 +1,144 @@
+from typing import override
+
+import pytest
+from btpy import BehaviorTree, Blackboard, NodeStatus
+from btpy.builtins import Sequence
+from btpy.core import BlackboardChildType, BlackboardProfiler, ProfileRow, RootTree
+
+
+class _Counter(BehaviorTree):
+    @override
+    def _do_tick(self) -> NodeStatus:
+        total = self.get("total")
+        total.value = (total.value or 0) + (self.get("step").value or 0)
+        return NodeStatus.SUCCESS
+
+
+def _tree(blackboard: Blackboard) -> tuple[RootTree, _Counter]:
+    counter = _Counter(name="counter", step="{@step}", total="{total}")
+    tree = RootTree("main", Sequence([counter]))
+    tree.attach_blackboard(blackboard)
+    return tree, counter
+
+
+def test_profiles_reads_and_writes_per_node() -> None:
+    """test that each node's lookups and writes are counted by key, outside of `@` remappings"""
+    blackboard = Blackboard()
+    blackboard.set("step", 2)
+    blackboard.set("total", 0)
+    tree, _ = _tree(blackboard)
+
+    profiler = BlackboardProfiler()
+    with profiler.profile(tree):
+        for _ in range(3):
+            assert tree.tick() == NodeStatus.SUCCESS
+        blackboard.set("total", 10)
+        blackboard.get("@step")
+
+    rows = {(row.key, row.node): row for row in profiler.rows()}
+    assert rows["total", "counter"] == ProfileRow("total", "counter", 3, 3, 0, 0, 0, 0)
+    assert rows["step", "counter"] == ProfileRow("step", "counter", 3, 0, 0, 0, 0, 0)
+    assert rows["total", ""] == ProfileRow("total", "", 1, 1, 0, 0, 0, 0)
+    assert rows["step", ""] == ProfileRow("step", "", 1, 0, 0, 0, 1, 0)
+    assert blackboard.get("total").value == 10
+
+
+def test_profiles_walks_and_misses() -> None:
+    """test that searched layers and created entries are counted"""
+    root = Blackboard()
+    root.set("deep", 1)
+    child = root.create_child(BlackboardChildType.CHILD).create_child(
+        BlackboardChildType.CHILD
+    )
+
+    profiler = BlackboardProfiler()
+    with profiler.profile(child):
+        for _ in range(3):
+            assert child.get("deep").value == 1
+        child.get("missing")
+
+    rows = {row.key: row for row in profiler.rows()}
+    assert (rows["deep"].reads, rows["deep"].walks, rows["deep"].depth) == (3, 1, 2)
+    assert (rows["missing"].reads, rows["missing"].misses) == (1, 1)
+
+
+def test_profiling_restores_classes() -> None:
+    """test that nodes and blackboards are unchanged after profiling"""
+    blackboard = Blackboard()
+    blackboard.set("step", 1)
+    tree, counter = _tree(blackboard)
+
+    profiler = BlackboardProfiler()
+    with pytest.raises(KeyError):
+        with profiler.profile(tree):
+            assert type(counter) is not _Counter
+            assert counter.class_name() == "_Counter"
+            raise KeyError()
+
+    assert type(counter) is _Counter
+    assert type(blackboard) is Blackboard
+    tree.tick()
+    assert profiler.rows() == []
+
+
+def test_profiled_classes_are_created_once() -> None:
+    """test that profiling again reuses the instrumented classes"""
+    blackboard = Blackboard()
+    tree, counter = _tree(blackboard)
+
+    profiled = list[type]()
+    for _ in range(2):
+        with BlackboardProfiler().profile(tree):
+            profiled.append(type(counter))
+    assert profiled[0] is profiled[1]
+
+
+def test_nested_profiles_record_to_each_profiler() -> None:
+    """test that nodes profiled twice are counted by both profilers"""
+    blackboard = Blackboard()
+    blackboard.set("step", 1)
+    tree, counter = _tree(blackboard)
+
+    outer, inner = BlackboardProfiler(), BlackboardProfiler()
+    with outer.profile(tree):
+        with inner.profile(counter):
+            tree.tick()
+        tree.tick()
+
+    assert type(counter) is _Counter
+    assert not hasattr(counter, "_profilers")
+    assert {(row.key, row.node, row.reads) for row in inner.rows()} == {
+        ("step", "counter", 1),
+        ("total", "counter", 1),
+    }
+    assert {(row.key, row.node, row.reads) for row in outer.rows()} == {
+        ("step", "counter", 2),
+        ("total", "counter", 2),
+    }
+
+
+def test_report_is_sorted() -> None:
+    """test that the report lists the highest counts first"""
+    blackboard = Blackboard()
+    blackboard.set("step", 1)
+    tree, _ = _tree(blackboard)
+
+    profiler = BlackboardProfiler()
+    with profiler.profile(tree):
+        tree.tick()
+        blackboard.get("@step")
+        blackboard.get("@step")
+
+    lines = profiler.report(sort_by="world").splitlines()
+    assert lines[0].split() == [
+        "key",
+        "node",
+        *"reads writes walks depth world misses".split(),
+    ]
+    assert lines[1].split() == ["step", "2", "0", "0", "0", "2", "0"]
+    assert len(profiler.report(limit=1).splitlines()) == 2
+    with pytest.raises(ValueError):
+        profiler.report(sort_by="time")
+
+    profiler.clear()
+    assert profiler.rows() == []
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+from btpy import BTParser
+from btpy.__main__ import main
+from btpy.core import BTWriter
+
+
+@pytest.fixture
+def main_xml_file() -> Path:
+    return Path(__file__).parent / "main.xml"
+
+
+def test_bundle_round_trip(main_xml_file: Path, tmp_path: Path) -> None:
+    """test that a bundle loads the same tree as the xml it was compiled from"""
+    template = BTParser().parse_template(main_xml_file)
+    bundle = tmp_path / "main.btpy"
+    bundle.write_bytes(BTWriter.to_bundle(template))
+
+    loaded = BTParser().parse_bundle_template(bundle)
+    assert loaded.main_tree() == template.main_tree()
+    assert loaded.definitions() == template.definitions()
+    assert loaded.sources() == template.sources()
+    assert {path.name for path, _ in loaded.sources()} == {"main.xml", "helper.xml"}
+
+    expected = BTWriter.to_xml(BTParser().parse(main_xml_file))
+    assert BTWriter.to_xml(BTParser().parse_bundle(bundle)) == expected
+
+
+def test_compile_command(main_xml_file: Path, tmp_path: Path) -> None:
+    """test that the command line compiles a bundle"""
+    bundle = tmp_path / "compiled.btpy"
+    main(["compile", str(main_xml_file), "-o", str(bundle)])
+    expected = BTWriter.to_xml(BTParser().parse(main_xml_file))
+    assert BTWriter.to_xml(BTParser().parse_bundle(bundle)) == expected
+
+
+def test_stale_bundles_are_rejected(tmp_path: Path) -> None:
+    """test that a bundle can not be loaded once its sources change"""
+    source = tmp_path / "tree.xml"
+    source.write_text(
+        '<root BTCPP_format="4"><BehaviorTree ID="main"><Sequence /></BehaviorTree></root>'
+    )
+    bundle = tmp_path / "tree.btpy"
+    bundle.write_bytes(BTWriter.to_bundle(BTParser().parse_template(source)))
+    BTParser().parse_bundle(bundle)
+
+    source.write_text(
+        '<root BTCPP_format="4"><BehaviorTree ID="main"><Fallback /></BehaviorTree></root>'
+    )
+    # the source is rewritten with the same size, likely within the
+    # granularity of its modification time, so the shared cache must re-read it
+    with pytest.raises(RuntimeError, match="out of date"):
+        BTParser().parse_bundle(bundle)
+
+    BTParser().parse_bundle(bundle, check_sources=False)
+
+
+def test_invalid_bundles_are_rejected(tmp_path: Path) -> None:
+    """test that files that are not bundles are not loaded"""
+    bundle = tmp_path / "bad.btpy"
+    bundle.write_bytes(b"not a bundle, but long enough to have a header")
+    with pytest.raises(RuntimeError, match="unsupported bundle format"):
+        BTParser().parse_bundle(bundle)
@@ -1,9 +1,10 @@
+import sys
 from pathlib import Path
-from typing import Final
+from typing import Final, override
 
 import pytest
-from btpy import BTParser
-from btpy.core import BTWriter
+from btpy import BehaviorTree, BTParser, NodeRegistration, NodeStatus
+from btpy.core import BehaviorTreeFactory, BTWriter, IncludeCache, NodePlan
 
 
 @pytest.fixture
@@ -68,3 +69,203 @@ def test_errors_on_invalid_tag() -> None:
 """.strip()
     with pytest.raises(RuntimeError):
         BTParser().parse_string(xml)
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_parse_indexed(main_xml_file: str, indexed: bool) -> None:
+    """test that indexed parsing produces the same tree as eager parsing"""
+    expected = BTWriter.to_xml(BTParser().parse(main_xml_file))
+    from_file = BTParser(indexed=indexed).parse(main_xml_file)
+    assert BTWriter.to_xml(from_file) == expected
+    assert BTWriter.to_xml(BTParser(indexed=indexed).parse_string(expected)) == expected
+
+
+def test_indexed_only_reads_used_trees(tmp_path: Path) -> None:
+    """test that indexed parsing never reads trees that are not used"""
+    (tmp_path / "library.xml").write_text(
+        """
+<?xml version="1.0" encoding="UTF-8"?>
+<root BTCPP_format="4">
+    <!-- <BehaviorTree ID="commented"> -->
+    <BehaviorTree ID="broken">
+        <Sequence />
+        <!-- </BehaviorTree> -->
+        <Sequence />
+    </BehaviorTree>
+
+    <BehaviorTree ID="helper" description="a > b">
+        <Sequence name="hélper" />
+    </BehaviorTree>
+</root>
+""".strip(),
+        encoding="utf-8",
+    )
+    (tmp_path / "main.xml").write_text(
+        """
+<?xml version="1.0" encoding="UTF-8"?>
+<root BTCPP_format="4" main_tree_to_execute="main">
+    <include path="library.xml" />
+
+    <BehaviorTree ID="main">
+        <SubTree ID="helper" />
+    </BehaviorTree>
+</root>
+""".strip(),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError):
+        BTParser().parse(tmp_path / "main.xml")
+
+    tree = BTParser(indexed=True).parse(tmp_path / "main.xml")
+    assert [node.name() for node in tree] == ["main", "helper", "hélper"]
+
+
+def test_indexed_trees_are_decoded_as_declared(tmp_path: Path) -> None:
+    """test that indexed definitions are read in the encoding their file declares"""
+    (tmp_path / "main.xml").write_bytes(
+        """
+<?xml version="1.0" encoding="ISO-8859-1"?>
+<root BTCPP_format="4" main_tree_to_execute="main">
+    <BehaviorTree ID="main">
+        <Sequence name="café" />
+    </BehaviorTree>
+</root>
+""".strip().encode("latin-1")
+    )
+    tree = BTParser(indexed=True).parse(tmp_path / "main.xml")
+    assert [node.name() for node in tree] == ["main", "café"]
+
+
+def test_indexed_trees_are_rescanned_once_edited(tmp_path: Path) -> None:
+    """test that reading a definition whose file changed since it was indexed scans it again"""
+    library = """
+<root BTCPP_format="4">
+    <BehaviorTree ID="helper">
+        <Sequence name="before" />
+    </BehaviorTree>
+</root>
+""".strip()
+    (tmp_path / "library.xml").write_text(library, encoding="utf-8")
+    (tmp_path / "main.xml").write_text(
+        """
+<root BTCPP_format="4" main_tree_to_execute="main">
+    <include path="library.xml" />
+    <BehaviorTree ID="main">
+        <SubTree ID="helper" />
+    </BehaviorTree>
+</root>
+""".strip(),
+        encoding="utf-8",
+    )
+    parser = BTParser(indexed=True, include_cache=IncludeCache())
+    tree = parser.parse(tmp_path / "main.xml")
+    assert [node.name() for node in tree] == ["main", "helper", "before"]
+
+    edited = library.replace("<BehaviorTree", "<!-- moved -->\n    <BehaviorTree")
+    (tmp_path / "library.xml").write_text(edited.replace("before", "after"))
+    tree = parser.get()
+    assert [node.name() for node in tree] == ["main", "helper", "after"]
+    assert dict(parser.template().sources())[
+        (tmp_path / "library.xml").resolve()
+    ] == IncludeCache().digest(tmp_path / "library.xml")
+
+    (tmp_path / "library.xml").write_text(library.replace("helper", "renamed"))
+    with pytest.raises(RuntimeError, match="no longer describes the tree helper"):
+        parser.get()
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_unchanged_definitions_are_not_recompiled(
+    main_xml_file: str, indexed: bool
+) -> None:
+    """test that reloading an unchanged file reuses its compiled plans"""
+    parser = BTParser(indexed=indexed, include_cache=IncludeCache())
+    first = parser.parse_template(main_xml_file).definitions()
+    second = parser.parse_template(main_xml_file).definitions()
+    assert first.keys() == second.keys()
+    assert all(first[name] is second[name] for name in first)
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_plans_are_reused_without_reparsing(main_xml_file: str, indexed: bool) -> None:
+    """test that resolving the same loaded description twice reuses its plans"""
+    parser = BTParser(indexed=indexed, include_cache=IncludeCache())
+    first = parser.parse_template(main_xml_file).definitions()
+    second = parser.template().definitions()
+    third = parser.library().definitions()
+    assert all(first[name] is second[name] is third[name] for name in first)
+
+
+def _custom() -> BehaviorTreeFactory:
+    """define a new node type named `Custom`"""
+
+    class Custom(BehaviorTree):
+        @override
+        def _do_tick(self) -> NodeStatus:
+            return NodeStatus.SUCCESS
+
+    return Custom
+
+
+def test_plans_are_recompiled_in_another_registration_scope(tmp_path: Path) -> None:
+    """test that a plan is not reused with factories from a scope that has closed"""
+    (tmp_path / "main.xml").write_text(
+        """
+<root BTCPP_format="4" main_tree_to_execute="main">
+    <BehaviorTree ID="main">
+        <Custom />
+    </BehaviorTree>
+</root>
+""".strip()
+    )
+    parser = BTParser(include_cache=IncludeCache())
+    custom, replacement = _custom(), _custom()
+    with NodeRegistration.scope():
+        NodeRegistration.register(custom)
+        first = parser.parse_template(tmp_path / "main.xml").definitions()["main"]
+    with NodeRegistration.scope():
+        NodeRegistration.register(replacement)
+        second = parser.parse_template(tmp_path / "main.xml").definitions()["main"]
+
+    assert isinstance(first, NodePlan) and isinstance(second, NodePlan)
+    assert first.factory is custom
+    assert second.factory is replacement
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_deep_trees_are_parsed(tmp_path: Path, indexed: bool) -> None:
+    """test that trees deeper than the recursion limit can be parsed and bundled"""
+    depth = sys.getrecursionlimit() * 2
+    xml = f"""
+<root BTCPP_format="4" main_tree_to_execute="main">
+    <BehaviorTree ID="main">
+        {"<Inverter>" * depth}<SubTree ID="leaf" />{"</Inverter>" * depth}
+    </BehaviorTree>
+    <BehaviorTree ID="leaf">
+        <Sequence />
+    </BehaviorTree>
+</root>
+"""
+    parser = BTParser(indexed=indexed)
+    tree = parser.parse_string(xml)
+    assert sum(1 for _ in tree) == depth + 3
+    expected = NodeStatus.SUCCESS if depth % 2 == 0 else NodeStatus.FAILURE
+    assert tree.tick_iteratively() == expected
+
+    (tmp_path / "tree.btpy").write_bytes(BTWriter.to_bundle(parser.template()))
+    bundled = BTParser().parse_bundle(tmp_path / "tree.btpy")
+    assert bundled.digest() == tree.digest()
+
+
+def test_subtrees_cannot_contain_themselves() -> None:
+    """test that a subtree that references itself is rejected when it is built"""
+    xml = """
+<root BTCPP_format="4" main_tree_to_execute="main">
+    <BehaviorTree ID="main">
+        <Inverter><SubTree ID="main" /></Inverter>
+    </BehaviorTree>
+</root>
+"""
+    with pytest.raises(RuntimeError, match="subtree main contains itself"):
+        BTParser().parse_string(xml)
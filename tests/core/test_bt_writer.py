@@ -0,0 +1,99 @@
+import io
+import sys
+
+from btpy import BehaviorTree, BTParser
+from btpy.builtins import Inverter, Sequence
+from btpy.core import BTWriter, RootTree, SubTree
+
+_XML = """
+<?xml version="1.0" encoding="UTF-8"?>
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <BehaviorTree ID="main">
+    <Sequence name="top">
+      <SubTree ID="first" x="{y}" />
+      <Fallback>
+        <SubTree ID="second" />
+        <Inverter>
+          <Sequence />
+        </Inverter>
+      </Fallback>
+      <SubTree ID="first" />
+    </Sequence>
+  </BehaviorTree>
+  <BehaviorTree ID="first">
+    <SubTree ID="nested" _autoremap="true" />
+  </BehaviorTree>
+  <BehaviorTree ID="nested">
+    <Sequence />
+  </BehaviorTree>
+  <BehaviorTree ID="second">
+    <SubTree ID="nested" />
+  </BehaviorTree>
+</root>
+""".lstrip()
+
+
+def test_subtrees_are_written_depth_first() -> None:
+    """test that subtrees are described in the order a depth first search finds them"""
+    assert BTWriter.to_xml(BTParser().parse_string(_XML), indent=2) == _XML
+
+
+def test_write_matches_to_xml() -> None:
+    """test that streaming the xml to a file produces the same output"""
+    tree = BTParser().parse_string(_XML)
+    fp = io.StringIO()
+    BTWriter.write(tree, fp, indent="    ")
+    assert fp.getvalue() == BTWriter.to_xml(tree, indent=4)
+    assert "".join(BTWriter.iter_xml(tree)) == BTWriter.to_xml(tree)
+
+
+def test_write_deep_tree() -> None:
+    """test that trees deeper than the recursion limit can be written"""
+    depth = sys.getrecursionlimit() * 2
+    node: BehaviorTree = Sequence()
+    for _ in range(depth):
+        node = Inverter([node])
+
+    lines = BTWriter.to_xml(RootTree("main", node), indent=1).splitlines()
+    assert len(lines) == 2 * depth + 6
+    assert lines[depth + 3] == " " * (depth + 2) + "<Sequence />"
+
+
+def test_identical_subtrees_are_described_once() -> None:
+    """test that subtrees with identical definitions share one description"""
+    same = RootTree(
+        "main",
+        Sequence([SubTree("a", Sequence(), x="{y}"), SubTree("b", Sequence())]),
+    )
+    xml = BTWriter.to_xml(same)
+    assert xml.count("<BehaviorTree ID=") == 2
+    assert '<BehaviorTree ID="a">' in xml and '<BehaviorTree ID="b">' not in xml
+    assert '<SubTree ID="a" x="{y}" />' in xml and '<SubTree ID="a" />' in xml
+    assert BTWriter.to_xml(BTParser().parse_string(xml)) == xml
+
+
+def test_different_subtrees_with_one_name_are_kept_apart() -> None:
+    """test that a different definition under a name already described gets its own ID"""
+    different = RootTree(
+        "main",
+        Sequence(
+            [
+                SubTree("a", Sequence()),
+                SubTree("a", Inverter([Sequence()])),
+                SubTree("a", Inverter([Sequence()])),
+            ]
+        ),
+    )
+    xml = BTWriter.to_xml(different)
+    assert '<BehaviorTree ID="a">' in xml and '<BehaviorTree ID="a_2">' in xml
+    assert xml.count("<Inverter>") == 1 and xml.count('<SubTree ID="a_2" />') == 2
+
+    def definitions(tree: SubTree) -> list[bytes]:
+        subtrees = tree.child().children()
+        return [
+            subtree.child().digest()
+            for subtree in subtrees
+            if isinstance(subtree, SubTree)
+        ]
+
+    assert definitions(BTParser().parse_string(xml)) == definitions(different)
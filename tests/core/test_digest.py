@@ -0,0 +1,78 @@
+import sys
+
+from btpy import BehaviorTree, BTParser
+from btpy.builtins import Fallback, Inverter, Sequence
+from btpy.core import NodePlan, RootTree, SubTree
+
+_XML = """
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <BehaviorTree ID="main">
+    <Sequence>
+      <SubTree ID="child" x="{y}" />
+      <Inverter>
+        <Fallback name="{z}" />
+      </Inverter>
+    </Sequence>
+  </BehaviorTree>
+  <BehaviorTree ID="child">
+    <Sequence />
+  </BehaviorTree>
+</root>
+"""
+
+
+def test_identical_trees_have_identical_digests() -> None:
+    """test that separately built trees with the same structure have the same digest"""
+    first = BTParser().parse_string(_XML)
+    second = BTParser().parse_string(_XML)
+    assert first is not second
+    assert first.digest() == second.digest()
+    assert first.fingerprint() == second.fingerprint() == first.digest().hex()
+    assert len(first.digest()) == 16
+
+
+def test_digest_covers_structure() -> None:
+    """test that changing a name, port or child changes the digest"""
+    digest = BTParser().parse_string(_XML).digest()
+    for old, new in [
+        ('ID="child"', 'ID="other"'),
+        ('x="{y}"', 'x="{w}"'),
+        ('x="{y}"', ""),
+        ("<Fallback", "<Sequence"),
+        ("<Sequence />", "<Fallback />"),
+    ]:
+        changed = BTParser().parse_string(_XML.replace(old, new))
+        assert changed.digest() != digest, (old, new)
+
+
+def test_subtree_digests_are_independent_of_position() -> None:
+    """test that a subtree's digest does not depend on where it is used"""
+    child = SubTree("child", Sequence([Inverter([Fallback()])]))
+    tree = RootTree("main", Sequence([Sequence([child])]))
+    assert (
+        child.digest() == SubTree("child", Sequence([Inverter([Fallback()])])).digest()
+    )
+    assert tree.digest() != child.digest()
+
+
+def test_digest_deep_tree() -> None:
+    """test that trees deeper than the recursion limit can be hashed"""
+    node: BehaviorTree = Sequence()
+    for _ in range(sys.getrecursionlimit() * 2):
+        node = Inverter([node])
+    assert len(RootTree("main", node).digest()) == 16
+
+
+def test_plan_digests_match_tree_digests() -> None:
+    """test that a template's plans hash the same way as the nodes they build"""
+    template = BTParser().parse_template_string(_XML)
+    main = template.definitions()["main"]
+    assert isinstance(main, NodePlan)
+
+    root = template.instantiate().child()
+    subtree = root.children()[0]
+    assert isinstance(subtree, SubTree)
+    assert template.definitions()["child"].digest() == subtree.child().digest()
+    assert main.children[1].digest() == root.children()[1].digest()
+    # the plan of `main` does not cover the definition of `child`
+    assert main.digest() != root.digest()
@@ -0,0 +1,94 @@
+import os
+from pathlib import Path
+
+import pytest
+from btpy import BTParser
+from btpy.core import IncludeCache
+
+
+def _write(path: Path, includes: list[str], trees: list[str]) -> None:
+    path.write_text(
+        '<root BTCPP_format="4">'
+        + "".join(f'<include path="{include}" />' for include in includes)
+        + "".join(
+            f'<BehaviorTree ID="{id}"><Sequence /></BehaviorTree>' for id in trees
+        )
+        + "</root>"
+    )
+
+
+@pytest.fixture
+def diamond(tmp_path: Path) -> Path:
+    """main includes left and right, which both include bottom"""
+    _write(tmp_path / "main.xml", ["left.xml", "right.xml"], ["main"])
+    _write(tmp_path / "left.xml", ["bottom.xml"], ["left"])
+    _write(tmp_path / "right.xml", ["bottom.xml"], ["right"])
+    _write(tmp_path / "bottom.xml", [], ["bottom"])
+    return tmp_path / "main.xml"
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_diamond_includes_are_parsed_once(diamond: Path, indexed: bool) -> None:
+    """test that each file of a diamond include graph is only parsed once"""
+    cache = IncludeCache()
+    BTParser(indexed=indexed, include_cache=cache).parse(diamond)
+    assert (cache.hits(), cache.misses()) == (0, 4)
+
+    BTParser(indexed=indexed, include_cache=cache).parse(diamond)
+    assert (cache.hits(), cache.misses()) == (4, 4)
+
+
+def test_cache_is_keyed_by_contents(diamond: Path) -> None:
+    """test that touched files are not re-parsed, but modified files are"""
+    cache = IncludeCache()
+    BTParser(include_cache=cache).parse(diamond)
+    bottom = diamond.parent / "bottom.xml"
+
+    stat = bottom.stat()
+    os.utime(bottom, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    BTParser(include_cache=cache).parse(diamond)
+    assert (cache.hits(), cache.misses()) == (4, 4)
+
+    _write(bottom, [], ["bottom", "extra"])
+    BTParser(include_cache=cache).parse(diamond)
+    assert (cache.hits(), cache.misses()) == (7, 5)
+
+
+def test_recent_rewrites_are_reread(diamond: Path) -> None:
+    """test that a same-size rewrite keeping the modification time is not missed"""
+    cache = IncludeCache()
+    bottom = diamond.parent / "bottom.xml"
+    digest = cache.digest(bottom)
+
+    stat = bottom.stat()
+    bottom.write_text(bottom.read_text().replace("Sequence", "Fallback"))
+    os.utime(bottom, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert bottom.stat().st_size == stat.st_size
+    assert cache.digest(bottom) != digest
+
+
+def test_older_files_are_not_reread(diamond: Path) -> None:
+    """test that files modified long enough ago are trusted by their size and time"""
+    cache = IncludeCache()
+    bottom = diamond.parent / "bottom.xml"
+    stat = bottom.stat()
+    os.utime(bottom, ns=(stat.st_atime_ns, stat.st_mtime_ns - 60_000_000_000))
+    digest = cache.digest(bottom)
+
+    stat = bottom.stat()
+    bottom.write_text(bottom.read_text().replace("Sequence", "Fallback"))
+    os.utime(bottom, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.digest(bottom) == digest
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_include_cycles_are_reported(tmp_path: Path, indexed: bool) -> None:
+    """test that mutually including files raise an error instead of recursing"""
+    _write(tmp_path / "main.xml", ["first.xml"], ["main"])
+    _write(tmp_path / "first.xml", ["second.xml"], [])
+    _write(tmp_path / "second.xml", ["first.xml"], [])
+
+    with pytest.raises(RuntimeError, match="include cycle: .*first.xml -> .*first.xml"):
+        BTParser(indexed=indexed, include_cache=IncludeCache()).parse(
+            tmp_path / "main.xml"
+        )
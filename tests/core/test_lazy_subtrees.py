@@ -0,0 +1,80 @@
+from typing import Iterator, override
+
+import pytest
+from btpy import BehaviorTree, Blackboard, BTParser, NodeRegistration, NodeStatus
+from btpy.core import BTWriter, SubTree
+
+
+class _CopyAction(BehaviorTree):
+    @override
+    def _do_tick(self) -> NodeStatus:
+        self.get("output").value = self.get("input").value
+        return NodeStatus.SUCCESS
+
+
+@pytest.fixture(autouse=True)
+def register_copy_action() -> Iterator[None]:
+    with NodeRegistration.scope():
+        NodeRegistration.register(_CopyAction)
+        yield
+
+
+_XML = """
+<?xml version="1.0" encoding="UTF-8"?>
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <BehaviorTree ID="main">
+    <Fallback>
+      <SubTree ID="copy" name="taken" input="{value}" output="{result}" />
+      <SubTree ID="copy" name="not_taken" input="{value}" output="{other}" />
+    </Fallback>
+  </BehaviorTree>
+
+  <BehaviorTree ID="copy">
+    <Sequence>
+      <Action ID="_CopyAction" />
+      <SubTree ID="nested" />
+    </Sequence>
+  </BehaviorTree>
+
+  <BehaviorTree ID="nested">
+    <ForceSuccess>
+      <Sequence />
+    </ForceSuccess>
+  </BehaviorTree>
+</root>
+""".strip()
+
+
+def _subtrees(tree: SubTree) -> dict[str, SubTree]:
+    """find the direct subtrees of the main tree, without expanding them"""
+    fallback = tree.child()
+    return {
+        subtree.name(): subtree
+        for subtree in fallback.children()
+        if isinstance(subtree, SubTree)
+    }
+
+
+def test_subtrees_expand_on_first_tick() -> None:
+    """test that lazy subtrees are only built once they are ticked"""
+    blackboard = Blackboard()
+    tree = BTParser(lazy_subtrees=True).parse_string(_XML, blackboard=blackboard)
+    subtrees = _subtrees(tree)
+    assert not subtrees["taken"].expanded()
+    assert not subtrees["not_taken"].expanded()
+
+    blackboard.set("value", 42)
+    assert tree.tick() == NodeStatus.SUCCESS
+    assert subtrees["taken"].expanded()
+    assert not subtrees["not_taken"].expanded()
+    assert blackboard.get("result").value == 42
+    assert blackboard.get("other").value is None
+
+
+def test_lazy_subtrees_expand_on_demand() -> None:
+    """test that iterating and writing a lazy tree matches the eager tree"""
+    eager = BTParser().parse_string(_XML)
+    lazy = BTParser(lazy_subtrees=True).parse_string(_XML)
+    assert BTWriter.to_xml(lazy) == BTWriter.to_xml(eager)
+    assert [node.name() for node in lazy] == [node.name() for node in eager]
+    assert all(subtree.expanded() for subtree in _subtrees(lazy).values())
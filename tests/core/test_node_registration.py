@@ -1,3 +1,7 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterator, override
 
 import pytest
@@ -53,3 +57,34 @@ def test_renamed_node_registration() -> None:
     assert not NodeRegistration.has(name)
     assert NodeRegistration.has(updated_name)
     assert NodeRegistration.get(updated_name) is _FakeNode
+
+
+def test_scopes_are_local_to_their_context() -> None:
+    """test that new threads start outside of the scope, unlike `asyncio` tasks"""
+    NodeRegistration.register(_FakeNode)
+
+    async def has() -> bool:
+        return NodeRegistration.has("_FakeNode")
+
+    assert asyncio.run(has())
+    with ThreadPoolExecutor(1) as executor:
+        assert not executor.submit(NodeRegistration.has, "_FakeNode").result()
+        copied = contextvars.copy_context()
+        assert executor.submit(copied.run, NodeRegistration.has, "_FakeNode").result()
+
+
+def test_concurrent_scopes_do_not_interfere() -> None:
+    """test that threads can open and close scopes independently"""
+    barrier = threading.Barrier(4)
+
+    def register(index: int) -> bool:
+        with NodeRegistration.scope():
+            NodeRegistration.register(f"node {index}", _FakeNode)
+            barrier.wait()
+            return all(
+                NodeRegistration.has(f"node {i}") == (i == index) for i in range(4)
+            )
+
+    with ThreadPoolExecutor(4) as executor:
+        assert all(executor.map(register, range(4)))
+    assert not any(NodeRegistration.has(f"node {i}") for i in range(4))
@@ -0,0 +1,141 @@
+from typing import override
+
+import pytest
+from btpy import BehaviorTree, Blackboard, NodeStatus, Port
+from btpy.core import BTParser, PortDirection, RootTree
+
+
+class _Reader(BehaviorTree):
+    count = Port(int)
+    enabled = Port(bool, key="is_enabled")
+    anything = Port()
+    result = Port(int, direction=PortDirection.OUTPUT)
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        return NodeStatus.SUCCESS if self.enabled.value else NodeStatus.FAILURE
+
+
+class _Derived(_Reader):
+    extra = Port(str)
+
+
+def test_ports_are_bound_on_attach() -> None:
+    """test that ports resolve to the same entries as `get`"""
+    reader = _Reader(count="{x}", is_enabled="true", result="{y}")
+    blackboard = Blackboard()
+    blackboard.set("x", "3")
+    RootTree("main", reader).attach_blackboard(blackboard)
+
+    assert reader.enabled is reader.get("is_enabled")
+    assert reader.result is reader.get("result")
+    assert reader.count.value == 3
+    assert reader.enabled.value is True
+    assert reader.anything.value is None
+    assert reader.tick() == NodeStatus.SUCCESS
+
+    blackboard.set("x", "4")
+    assert reader.count.value == 4
+    reader.result.value = 5
+    assert blackboard.get("y").value == 5
+
+
+def test_remapped_ports_are_not_written_back() -> None:
+    """test that reading a typed port leaves the shared entry unchanged"""
+    reader = _Reader(count="{x}")
+    blackboard = Blackboard()
+    blackboard.set("x", "3")
+    RootTree("main", reader).attach_blackboard(blackboard)
+
+    assert reader.count.value == 3
+    assert blackboard.get("x").value == "3"
+    reader.get("count").value = "6"
+    assert blackboard.get("x").value == "6"
+    assert reader.count.value == 6
+
+
+class _Items(_Reader):
+    count = Port(len)
+
+
+def test_remapped_ports_are_converted_after_each_write() -> None:
+    """test that writing the same object again refreshes the converted value"""
+    node = _Items(count="{x}")
+    blackboard = Blackboard()
+    items = [1, 2]
+    blackboard.set("x", items)
+    RootTree("main", node).attach_blackboard(blackboard)
+    assert node.count.value == 2
+
+    items.append(3)
+    blackboard.set("x", items)
+    assert node.count.value == 3
+    blackboard.get("x").value = [1, 2, 3]
+    assert node.count.value == 3
+
+
+def test_literal_ports_are_converted_when_built() -> None:
+    """test that literals are converted once, and stored converted"""
+    reader = _Reader(count="3", is_enabled="false")
+    RootTree("main", reader).attach_blackboard(Blackboard())
+    assert reader.count is reader.get("count")
+    assert reader.get("count").value == 3
+    assert reader.get("is_enabled").value is False
+
+
+def test_ports_are_inherited() -> None:
+    """test that subclasses bind the ports of their bases"""
+    derived = _Derived(extra="value", is_enabled="false")
+    RootTree("main", derived).attach_blackboard(Blackboard())
+    assert derived.extra.value == "value"
+    assert derived.enabled.value is False
+    assert derived.tick() == NodeStatus.FAILURE
+    assert _Derived.extra.key() == "extra"
+    assert _Derived.enabled.key() == "is_enabled"
+
+
+@pytest.mark.parametrize(
+    "ports",
+    [
+        {"is_enabled": "yes"},
+        {"count": "many"},
+        {"result": "5"},
+    ],
+)
+def test_invalid_ports_are_rejected_when_built(ports: dict[str, str]) -> None:
+    """test that invalid literals and unmapped outputs raise while building"""
+    with pytest.raises(ValueError, match="port"):
+        _Reader(**ports)
+
+
+def test_invalid_ports_are_rejected_when_parsed() -> None:
+    """test that invalid literals of built-in nodes raise while parsing"""
+    xml = """
+    <root BTCPP_format="4" main_tree_to_execute="main">
+        <BehaviorTree ID="main">
+            <Repeat num_cycles="twice">
+                <Sequence />
+            </Repeat>
+        </BehaviorTree>
+    </root>
+    """
+    with pytest.raises(ValueError, match="num_cycles of Repeat"):
+        BTParser().parse_string(xml.strip())
+
+
+def test_remapped_bool_ports_reject_other_values() -> None:
+    """test that bool ports are coerced like `get(key, bool)`"""
+    reader = _Reader(is_enabled="{x}")
+    blackboard = Blackboard()
+    blackboard.set("x", "yes")
+    RootTree("main", reader).attach_blackboard(blackboard)
+    with pytest.raises(ValueError):
+        reader.tick()
+
+
+def test_provided_ports() -> None:
+    """test that the declared ports are listed by name"""
+    ports = _Derived.provided_ports()
+    assert set(ports) == {"name", "count", "is_enabled", "anything", "result", "extra"}
+    assert ports["result"].direction() == PortDirection.OUTPUT
+    assert ports["count"].direction() == PortDirection.INPUT
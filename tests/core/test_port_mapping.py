@@ -2,6 +2,7 @@ from typing import Iterator, override
 
 import pytest
 from btpy import BehaviorTree, Blackboard, BTParser, NodeRegistration, NodeStatus
+from btpy.core import BlackboardChildType
 
 
 class _AddAction(BehaviorTree):
@@ -208,3 +209,37 @@ def test_bad_port_mapping(x: int, y: int) -> None:
     expected = 2 * (blackboard.set("x", x) + blackboard.set("y", y))
     assert tree.tick() == NodeStatus.FAILURE
     assert blackboard.get("result").value == expected
+
+
+def test_unmapped_nodes_share_blackboards(monkeypatch: pytest.MonkeyPatch) -> None:
+    """test that only nodes that remap ports create their own blackboard"""
+    created = list[Blackboard]()
+    create_child = Blackboard.create_child
+
+    def counting_create_child(
+        self: Blackboard, type: BlackboardChildType
+    ) -> Blackboard:
+        created.append(create_child(self, type))
+        return created[-1]
+
+    monkeypatch.setattr(Blackboard, "create_child", counting_create_child)
+    tree = BTParser().parse_string(
+        """
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <BehaviorTree ID="main">
+    <Sequence>
+      <Sequence><Sequence /><Sequence /></Sequence>
+      <Sequence name="mapped" />
+      <SubTree ID="sub" />
+    </Sequence>
+  </BehaviorTree>
+  <BehaviorTree ID="sub">
+    <Sequence><Sequence /></Sequence>
+  </BehaviorTree>
+</root>
+"""
+    )
+
+    # only the remapped node and the subtree's clean blackboard
+    assert len(created) == 2
+    assert tree.tick() == NodeStatus.SUCCESS
@@ -0,0 +1,188 @@
+import multiprocessing
+import os
+import struct
+import subprocess
+import sys
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Iterator
+
+import btpy
+import pytest
+from btpy import Blackboard, BTParser, NodeStatus
+from btpy.core import Pointer, SharedBlackboard
+
+_SCHEMA: dict[str, str | dict[str, str]] = {
+    "speed": "d",
+    "count": "q",
+    "ready": "?",
+    "label": "8s",
+    "pose": {"x": "d", "y": "d", "valid": "?"},
+}
+
+
+@dataclass
+class _Pose:
+    x: float
+    y: float
+    valid: bool
+
+
+@pytest.fixture
+def shared() -> Iterator[SharedBlackboard]:
+    blackboard = SharedBlackboard.create(_SCHEMA)
+    yield blackboard
+    blackboard.close()
+
+
+def _write_from_child(name: str) -> None:
+    blackboard = SharedBlackboard.attach(name)
+    blackboard.set_many({"speed": 2.5, "count": 7})
+    blackboard.set("ready", True)
+    blackboard.close()
+
+
+def test_entries_are_shared(shared: SharedBlackboard) -> None:
+    """test that writes through one blackboard are read through another"""
+    other = SharedBlackboard.attach(shared.name())
+    assert other.schema() == _SCHEMA
+    assert other.get_many(["speed", "count", "ready", "label"]) == [
+        0.0,
+        0,
+        False,
+        bytes(8),
+    ]
+
+    shared.set("speed", 1.5)
+    shared.set("label", b"forward")
+    other.set("local", "value")
+    assert other.get("speed").value == 1.5
+    assert other.get("label").value == b"forward\0"
+    assert shared.get("local").value is None
+    assert other.sequence("speed") == shared.sequence("speed") == 1
+    other.close()
+    other.close()
+
+
+def test_entries_are_shared_between_processes(shared: SharedBlackboard) -> None:
+    """test that a child process's writes are seen by the parent"""
+    child = multiprocessing.get_context("spawn").Process(
+        target=_write_from_child, args=(shared.name(),)
+    )
+    child.start()
+    child.join(timeout=30)
+    assert child.exitcode == 0
+    assert shared.get_many(["speed", "count", "ready"]) == [2.5, 7, True]
+    assert shared.sequence("ready") == 1
+
+
+def test_attaching_from_another_interpreter_keeps_the_memory(
+    shared: SharedBlackboard,
+) -> None:
+    """test that a process that attached and exited does not unlink the memory"""
+    code = f"""
+from btpy.core import SharedBlackboard
+SharedBlackboard.attach({shared.name()!r}).set("count", 5)
+"""
+    # the child imports the same `btpy`, even when it is not installed
+    src_dir = Path(btpy.__file__).parent.parent
+    path = os.pathsep.join(filter(None, [str(src_dir), os.environ.get("PYTHONPATH")]))
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        env={**os.environ, "PYTHONPATH": path},
+    )
+    assert process.returncode == 0, process.stderr
+    assert "leaked" not in process.stderr
+
+    other = SharedBlackboard.attach(shared.name())
+    assert other.get("count").value == shared.get("count").value == 5
+    other.close()
+
+
+def test_reads_time_out_if_a_writer_dies(shared: SharedBlackboard) -> None:
+    """test that a write left unfinished fails reads, until the group is written again"""
+    other = SharedBlackboard.attach(shared.name(), timeout=0.01)
+    raw = SharedMemory(shared.name())
+    buffer = raw.buf
+    assert buffer is not None
+    try:
+        # find the sequence number of the entry, which is all a write of 0 changes
+        before = bytes(buffer)
+        shared.set("count", 0)
+        (offset,) = [i for i, byte in enumerate(buffer) if byte != before[i]]
+        buffer[offset] = 3
+
+        with pytest.raises(TimeoutError):
+            other.get("count").value
+        assert other.get("speed").value == 0.0
+
+        shared.set("count", 4)
+        assert other.get("count").value == 4
+    finally:
+        raw.close()
+        other.close()
+
+
+def test_groups_are_written_and_read_at_once(shared: SharedBlackboard) -> None:
+    """test that a bound group shares one sequence, and its entries are still keys"""
+    other = SharedBlackboard.attach(shared.name())
+    writer = shared.bind(_Pose, prefix="pose.")
+    reader = other.bind(_Pose, prefix="pose.")
+    version = Pointer.clock()
+
+    writer.write(_Pose(1.0, 2.0, True))
+    assert _Pose(*reader.read()) == _Pose(1.0, 2.0, True)
+    assert other.get_many(["pose.x", "pose.valid"]) == [1.0, True]
+    assert shared.changed_since(version) == ["pose.x", "pose.y", "pose.valid"]
+    assert other.sequence("pose.y") == 1
+
+    other.set("pose.y", 3.0)
+    assert reader.read() == (1.0, 3.0, True)
+    assert shared.sequence("pose.x") == 2
+    other.close()
+
+
+def test_invalid_values_leave_entries_readable(shared: SharedBlackboard) -> None:
+    """test that a failed write does not leave an entry locked"""
+    shared.set("count", 3)
+    with pytest.raises(struct.error):
+        shared.set("count", "three")
+    assert shared.get("count").value == 3
+    assert shared.sequence("count") == 1
+
+
+def test_trees_and_snapshots_use_shared_entries(shared: SharedBlackboard) -> None:
+    """test that a tree reads shared entries through its world blackboard"""
+    xml = """
+    <root BTCPP_format="4" main_tree_to_execute="main">
+        <BehaviorTree ID="main">
+            <Repeat num_cycles="{@count}">
+                <Sequence />
+            </Repeat>
+        </BehaviorTree>
+    </root>
+    """
+    tree = BTParser().parse_string(xml.strip(), blackboard=Blackboard(world=shared))
+    shared.set("count", -2)
+    assert tree.tick() == NodeStatus.FAILURE
+
+    snapshot = shared.snapshot()
+    shared.set("count", 2)
+    assert tree.tick() == NodeStatus.SUCCESS
+    snapshot.restore()
+    assert shared.get("count").value == -2
+
+
+def test_attaching_to_other_memory_fails() -> None:
+    """test that memory without a schema is rejected"""
+    memory = SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(RuntimeError):
+            SharedBlackboard.attach(memory.name)
+    finally:
+        memory.close()
+        memory.unlink()
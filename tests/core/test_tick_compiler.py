@@ -0,0 +1,79 @@
+import sys
+from typing import override
+
+from btpy import BehaviorTree, Blackboard, NodeStatus
+from btpy.builtins import Inverter, Repeat, RunOnce, Sequence
+from btpy.core import CompiledTick, RootTree, SubTree
+
+
+class _Counter(BehaviorTree):
+    def init(self) -> None:
+        super().init()
+        self.ticks = 0
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        self.ticks = self.ticks + 1
+        return NodeStatus.SUCCESS
+
+
+def test_deep_trees_are_split_into_functions() -> None:
+    """test that trees nested deeper than Python allows blocks to be still compile"""
+    counter = _Counter()
+    node: BehaviorTree = counter
+    for _ in range(sys.getrecursionlimit() * 2):
+        node = Sequence([Inverter([node])])
+    tree = RootTree("main", node).attach_blackboard(Blackboard())
+
+    tick = CompiledTick(tree)
+    assert tick.source().count("def ") > 1
+    assert tick() == tree.tick_iteratively() == NodeStatus.SUCCESS
+    assert counter.ticks == 2 and counter.status() == NodeStatus.SUCCESS
+
+
+def test_lazy_subtrees_are_ticked_with_do_tick() -> None:
+    """test that an unexpanded subtree is built by its first compiled tick"""
+    counter = _Counter()
+    subtree = SubTree("lazy", lambda: counter)
+    tree = RootTree("main", Sequence([subtree])).attach_blackboard(Blackboard())
+
+    tick = CompiledTick(tree)
+    assert not subtree.expanded()
+    assert tick() == NodeStatus.SUCCESS
+    assert subtree.expanded() and counter.ticks == 1
+
+
+def test_literal_ports_are_constants() -> None:
+    """test that literal ports are folded, while remapped ports are read each tick"""
+    literal, remapped = _Counter(), _Counter()
+    blackboard = Blackboard()
+    blackboard.set("cycles", 1)
+    tree = RootTree(
+        "main",
+        Sequence(
+            [
+                Repeat([literal], num_cycles="3"),
+                Repeat([remapped], num_cycles="{cycles}"),
+            ]
+        ),
+    ).attach_blackboard(blackboard)
+
+    tick = CompiledTick(tree)
+    assert tick.source().count(".value") == 1
+    assert tick() == NodeStatus.SUCCESS
+    blackboard.set("cycles", 2)
+    assert tick() == NodeStatus.SUCCESS
+    assert (literal.ticks, remapped.ticks) == (6, 3)
+
+
+def test_source_only_uses_protected_members() -> None:
+    """test that the generated code does not reach into name-mangled attributes"""
+    counter = _Counter()
+    tree = RootTree(
+        "main", Sequence([Repeat([RunOnce([counter])], num_cycles="2")])
+    ).attach_blackboard(Blackboard())
+
+    tick = CompiledTick(tree)
+    assert "__" not in tick.source()
+    assert tick() == NodeStatus.SUCCESS
+    assert counter.ticks == 1
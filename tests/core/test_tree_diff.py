@@ -0,0 +1,137 @@
+import pytest
+from btpy import BTParser
+from btpy.builtins import Fallback, Sequence
+from btpy.core import ChangeKind, RootTree, TreeChange, TreeDiff
+
+_XML = """
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <BehaviorTree ID="main">
+    <Sequence name="top">
+      <SubTree ID="first" x="{y}" />
+      <Fallback>
+        <Inverter>
+          <Sequence />
+        </Inverter>
+        <Sequence name="a" />
+        <Sequence name="b" />
+      </Fallback>
+    </Sequence>
+  </BehaviorTree>
+  <BehaviorTree ID="first">
+    <Sequence name="{x}" />
+  </BehaviorTree>
+  <BehaviorTree ID="unused">
+    <Sequence />
+  </BehaviorTree>
+</root>
+"""
+
+
+def _changed(old: str, new: str) -> str:
+    return _XML.replace(old, new)
+
+
+def test_identical_trees_have_no_changes() -> None:
+    """test that comparing identical trees and libraries finds nothing"""
+    assert (
+        TreeDiff.compare(BTParser().parse_string(_XML), BTParser().parse_string(_XML))
+        == []
+    )
+    assert (
+        TreeDiff.compare(
+            BTParser().parse_template_string(_XML),
+            BTParser().parse_template_string(_XML),
+        )
+        == []
+    )
+
+
+def test_port_changes() -> None:
+    """test that port mappings are reported by path"""
+    old = BTParser().parse_string(_XML)
+    new = BTParser().parse_string(
+        _changed('<Sequence name="a" />', '<Sequence name="c" extra="1" />')
+    )
+    assert TreeDiff.compare(old, new) == [
+        TreeChange(
+            ChangeKind.ADDED,
+            "main/Sequence/Fallback[1]/Sequence[1]",
+            "extra",
+            None,
+            "1",
+        ),
+        TreeChange(
+            ChangeKind.MODIFIED,
+            "main/Sequence/Fallback[1]/Sequence[1]",
+            "name",
+            "a",
+            "c",
+        ),
+    ]
+
+
+def test_node_changes() -> None:
+    """test that added, removed and retyped nodes are reported by path"""
+    old = BTParser().parse_string(_XML)
+    new = BTParser().parse_string(
+        _changed(
+            '<Sequence name="b" />', '<Sequence name="b" />\n<Fallback />'
+        ).replace("<Inverter>\n          <Sequence />\n        </Inverter>", "")
+    )
+    assert [str(change) for change in TreeDiff.compare(old, new)] == [
+        "removed main/Sequence/Fallback[1]/Inverter[0]",
+        "added main/Sequence/Fallback[1]/Fallback[2]",
+    ]
+
+
+def test_subtree_changes() -> None:
+    """test that changes inside a subtree are reported under its definition"""
+    changed = _changed('<Sequence name="{x}" />', '<Sequence name="{z}" />')
+    old, new = BTParser().parse_string(_XML), BTParser().parse_string(changed)
+    assert TreeDiff.compare(old, new) == [
+        TreeChange(ChangeKind.MODIFIED, "first/Sequence", "name", "{x}", "{z}")
+    ]
+
+    old_template = BTParser().parse_template_string(_XML)
+    new_template = BTParser().parse_template_string(changed)
+    assert TreeDiff.compare(old_template, new_template) == TreeDiff.compare(old, new)
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_library_changes(indexed: bool) -> None:
+    """test that libraries compare every definition, including unused ones"""
+    old, new = BTParser(indexed=indexed), BTParser(indexed=indexed)
+    old.parse_template_string(_XML)
+    new.parse_template_string(
+        _changed('<BehaviorTree ID="unused">', '<BehaviorTree ID="renamed">').replace(
+            'main_tree_to_execute="main"', 'main_tree_to_execute="first"'
+        )
+    )
+    assert TreeDiff.compare(old, new) == [
+        TreeChange(ChangeKind.MODIFIED, "", "main_tree_to_execute", "main", "first"),
+        TreeChange(ChangeKind.REMOVED, "unused"),
+        TreeChange(ChangeKind.ADDED, "renamed"),
+    ]
+
+
+def test_repeated_children_are_compared_in_place() -> None:
+    """test that a change among identical siblings is not reported as a move"""
+
+    def tree(changed: int | None) -> RootTree:
+        return RootTree(
+            "main",
+            Sequence(
+                [Fallback(name="{x}" if i == changed else "{y}") for i in range(5)]
+            ),
+        )
+
+    for changed in range(5):
+        assert TreeDiff.compare(tree(None), tree(changed)) == [
+            TreeChange(
+                ChangeKind.MODIFIED,
+                f"main/Sequence/Fallback[{changed}]",
+                "name",
+                "{y}",
+                "{x}",
+            )
+        ]
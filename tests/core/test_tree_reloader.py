@@ -0,0 +1,249 @@
+import os
+from pathlib import Path
+from typing import Iterator, override
+
+import pytest
+from btpy import BehaviorTree, Blackboard, BTParser, NodeRegistration, NodeStatus
+from btpy.core import IncludeCache, SubTree, TreeReloader
+
+
+class _Running(BehaviorTree):
+    def init(self) -> None:
+        super().init()
+        self.halted = False
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        return NodeStatus.RUNNING
+
+    @override
+    def halt(self) -> None:
+        super().halt()
+        self.halted = True
+
+
+@pytest.fixture(autouse=True)
+def register_running() -> Iterator[None]:
+    with NodeRegistration.scope():
+        NodeRegistration.register(_Running)
+        yield
+
+
+_MAIN = """
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <include path="library.xml" />
+  <BehaviorTree ID="main">
+    <Sequence>
+      <SubTree ID="first" />
+      <SubTree ID="second" value="{value}" />
+    </Sequence>
+  </BehaviorTree>
+</root>
+"""
+
+_LIBRARY = """
+<root BTCPP_format="4">
+  <BehaviorTree ID="first">
+    <ForceSuccess>
+      <Sequence name="{name}" />
+    </ForceSuccess>
+  </BehaviorTree>
+  <BehaviorTree ID="second">
+    <Action ID="_Running" />
+  </BehaviorTree>
+</root>
+"""
+
+
+def _write(path: Path, text: str) -> None:
+    """write the file, making sure its modification time changes"""
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+
+@pytest.fixture
+def reloader(tmp_path: Path) -> TreeReloader:
+    _write(tmp_path / "main.xml", _MAIN)
+    _write(tmp_path / "library.xml", _LIBRARY)
+    blackboard = Blackboard()
+    blackboard.set("value", 1)
+    return TreeReloader(
+        tmp_path / "main.xml", BTParser(include_cache=IncludeCache()), blackboard
+    )
+
+
+def _subtrees(reloader: TreeReloader) -> list[SubTree]:
+    return _subtrees_of(reloader.tree().child())
+
+
+def _subtrees_of(sequence: BehaviorTree) -> list[SubTree]:
+    return [child for child in sequence.children() if isinstance(child, SubTree)]
+
+
+def test_unchanged_files_are_not_reloaded(
+    reloader: TreeReloader, tmp_path: Path
+) -> None:
+    """test that nothing is swapped when no definition changed"""
+    assert not reloader.changed()
+    assert reloader.reload() == []
+
+    roots = [subtree.child() for subtree in _subtrees(reloader)]
+    _write(tmp_path / "library.xml", _LIBRARY)
+    assert reloader.changed()
+    assert reloader.reload() == []
+    assert not reloader.changed()
+    assert [subtree.child() for subtree in _subtrees(reloader)] == roots
+
+
+def test_changed_definitions_are_swapped(
+    reloader: TreeReloader, tmp_path: Path
+) -> None:
+    """test that only changed nodes are rebuilt, keeping the state of the rest"""
+    tree = reloader.tree()
+    assert tree.tick() == NodeStatus.RUNNING
+    first, second = _subtrees(reloader)
+    running = second.child()
+    assert isinstance(running, _Running)
+    old_root = first.child()
+    old_sequence = old_root.children()[0]
+
+    _write(tmp_path / "library.xml", _LIBRARY.replace("{name}", "{other}"))
+    assert reloader.reload() == ["first"]
+
+    assert _subtrees(reloader) == [first, second]
+    assert first.child() is old_root
+    assert old_root.children()[0] is not old_sequence
+    assert old_root.children()[0].mappings() == {"name": "{other}"}
+    assert second.child() is running and not running.halted
+    assert second.get("value").value == 1
+
+    # the sequence resumes at the running subtree, without ticking the new one
+    assert tree.tick() == NodeStatus.RUNNING
+    assert old_root.children()[0].status() == NodeStatus.SKIPPED
+    assert tree.digest() == BTParser().parse(tmp_path / "main.xml").digest()
+
+
+def test_running_subtrees_are_halted(reloader: TreeReloader, tmp_path: Path) -> None:
+    """test that the previous root of a changed subtree is halted"""
+    assert reloader.tree().tick() == NodeStatus.RUNNING
+    _, second = _subtrees(reloader)
+    running = second.child()
+    assert isinstance(running, _Running)
+
+    _write(
+        tmp_path / "library.xml",
+        _LIBRARY.replace(
+            '<Action ID="_Running" />', '<Inverter><Action ID="_Running" /></Inverter>'
+        ),
+    )
+    assert reloader.reload() == ["second"]
+    assert running.halted
+    assert second.child().class_name() == "Inverter"
+    assert second.child().get("value").value == 1
+    assert reloader.tree().tick() == NodeStatus.RUNNING
+
+
+def test_nested_subtrees_are_swapped(reloader: TreeReloader, tmp_path: Path) -> None:
+    """test that subtrees built while reloading are tracked too"""
+    nesting = _LIBRARY.replace('<Sequence name="{name}" />', '<SubTree ID="second" />')
+    _write(tmp_path / "library.xml", nesting)
+    assert reloader.reload() == ["first"]
+
+    inverted = '<Inverter><Action ID="_Running" /></Inverter>'
+    _write(
+        tmp_path / "library.xml", nesting.replace('<Action ID="_Running" />', inverted)
+    )
+    assert reloader.reload() == ["second"]
+
+    first, second = _subtrees(reloader)
+    nested = first.child().children()[0]
+    assert isinstance(nested, SubTree)
+    assert nested.child().class_name() == second.child().class_name() == "Inverter"
+
+
+def test_unchanged_nested_subtrees_are_kept(
+    reloader: TreeReloader, tmp_path: Path
+) -> None:
+    """test that a nested subtree whose definition did not change keeps its blackboard"""
+    nesting = _LIBRARY.replace(
+        '<Sequence name="{name}" />',
+        '<Sequence><Sequence name="{name}" /><SubTree ID="second" /></Sequence>',
+    )
+    _write(tmp_path / "library.xml", nesting)
+    assert reloader.reload() == ["first"]
+    first, _ = _subtrees(reloader)
+    sequence = first.child().children()[0]
+    nested = sequence.children()[1]
+    assert isinstance(nested, SubTree)
+    nested.blackboard().set("state", 1)
+
+    _write(tmp_path / "library.xml", nesting.replace("{name}", "{other}"))
+    assert reloader.reload() == ["first"]
+    assert sequence.children()[0].mappings() == {"name": "{other}"}
+    assert sequence.children()[1] is nested
+    assert nested.blackboard().get("state").value == 1
+
+    # a node whose own type changed is rebuilt along with its descendants
+    _write(tmp_path / "library.xml", nesting.replace("ForceSuccess", "ForceFailure"))
+    assert reloader.reload() == ["first"]
+    assert first.child().class_name() == "ForceFailure"
+    assert first.child().children()[0].children()[1] is not nested
+    assert reloader.tree().digest() == BTParser().parse(tmp_path / "main.xml").digest()
+
+
+def test_lazy_subtrees_are_not_built(tmp_path: Path) -> None:
+    """test that reloading follows the parser's settings, without building subtrees"""
+    _write(tmp_path / "main.xml", _MAIN)
+    _write(tmp_path / "library.xml", _LIBRARY)
+    parser = BTParser(include_cache=IncludeCache(), lazy_subtrees=True)
+    reloader = TreeReloader(tmp_path / "main.xml", parser)
+    first, second = _subtrees(reloader)
+    assert not first.expanded() and not second.expanded()
+
+    _write(tmp_path / "library.xml", _LIBRARY.replace("{name}", "{other}"))
+    assert reloader.reload() == ["first"]
+    assert not first.expanded()
+    assert first.child().children()[0].mappings() == {"name": "{other}"}
+
+    _write(tmp_path / "library.xml", _LIBRARY)
+    assert reloader.reload() == ["first"]
+    assert first.child().children()[0].mappings() == {"name": "{name}"}
+    assert not second.expanded()
+    assert reloader.tree().tick() == NodeStatus.RUNNING
+    assert reloader.tree().digest() == parser.parse(tmp_path / "main.xml").digest()
+
+
+class _Wrapper(BehaviorTree):
+    """a decorator like an `Observer`, which wraps every node the parser builds"""
+
+    @override
+    def _do_tick(self) -> NodeStatus:
+        return self.children()[0].tick()
+
+
+def test_decorated_nodes_are_kept(tmp_path: Path) -> None:
+    """test that the parser's decorators do not make every node look changed"""
+    _write(tmp_path / "main.xml", _MAIN)
+    _write(tmp_path / "library.xml", _LIBRARY)
+    parser = BTParser(lambda node: _Wrapper([node]), include_cache=IncludeCache())
+    reloader = TreeReloader(tmp_path / "main.xml", parser)
+    assert reloader.tree().tick() == NodeStatus.RUNNING
+    first, second = _subtrees_of(reloader.tree().child().children()[0])
+    old_root, running = first.child(), second.child()
+    old_sequence = old_root.children()[0].children()[0]
+
+    _write(tmp_path / "library.xml", _LIBRARY.replace("{name}", "{other}"))
+    assert reloader.reload() == ["first"]
+    assert first.child() is old_root and second.child() is running
+    new_sequence = old_root.children()[0].children()[0]
+    assert new_sequence is not old_sequence and isinstance(new_sequence, _Wrapper)
+    assert new_sequence.children()[0].mappings() == {"name": "{other}"}
+    assert reloader.tree().digest() == parser.parse(tmp_path / "main.xml").digest()
+
+
+def test_main_tree_cannot_be_renamed(reloader: TreeReloader, tmp_path: Path) -> None:
+    """test that the live tree cannot be replaced with a different main tree"""
+    _write(tmp_path / "main.xml", _MAIN.replace('"main"', '"other"'))
+    with pytest.raises(RuntimeError, match="cannot reload main as other"):
+        reloader.reload()
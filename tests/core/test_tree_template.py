@@ -0,0 +1,100 @@
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
+import pytest
+from btpy import Blackboard, BTParser, NodeStatus
+from btpy.builtins import Inverter
+from btpy.core import BehaviorTree, BTWriter, NodePlan, SubTreePlan
+
+_XML = """
+<?xml version="1.0" encoding="UTF-8"?>
+<root BTCPP_format="4" main_tree_to_execute="main">
+  <BehaviorTree ID="main">
+    <Sequence name="top">
+      <SubTree ID="helper" name="first" />
+      <SubTree ID="helper" name="second" />
+    </Sequence>
+  </BehaviorTree>
+
+  <BehaviorTree ID="helper">
+    <Fallback name="helper_called" />
+  </BehaviorTree>
+
+  <BehaviorTree ID="unused">
+    <NotARegisteredNode />
+  </BehaviorTree>
+</root>
+""".strip()
+
+
+def test_template_matches_parse() -> None:
+    """test that instantiating a template builds the same tree as parsing"""
+    template = BTParser().parse_template_string(_XML)
+    expected = BTWriter.to_xml(BTParser().parse_string(_XML))
+    assert BTWriter.to_xml(template.instantiate()) == expected
+    assert BTWriter.to_xml(template.instantiate()) == expected
+
+
+def test_template_from_file() -> None:
+    """test that a template can be loaded from file"""
+    path = Path(__file__).parent / "main.xml"
+    expected = BTWriter.to_xml(BTParser().parse(path))
+    assert BTWriter.to_xml(BTParser().parse_template(path).instantiate()) == expected
+
+
+def test_template_only_resolves_reachable_trees() -> None:
+    """test that unused tree definitions are never resolved"""
+    template = BTParser().parse_template_string(_XML)
+    assert template.main_tree() == "main"
+    assert set(template.definitions()) == {"main", "helper"}
+    main = template.definitions()["main"]
+    assert isinstance(main, NodePlan)
+    (first, second) = main.children
+    assert first == SubTreePlan("helper", {"name": "first"})
+    assert second == SubTreePlan("helper", {"name": "second"})
+
+
+def test_plans_are_frozen() -> None:
+    """test that a plan cannot be changed once it is built"""
+    main = BTParser().parse_template_string(_XML).definitions()["main"]
+    assert isinstance(main, NodePlan)
+    with pytest.raises(FrozenInstanceError):
+        main.name = "other"  # type: ignore[misc]
+    assert main == NodePlan(main.name, main.factory, main.ports, main.children)
+
+
+def test_unchanged_plans_reuse_the_template() -> None:
+    """test that resolving the same descriptions again gives the same template"""
+    parser = BTParser()
+    template = parser.parse_template_string(_XML)
+    assert parser.template() is template
+    assert parser.template(lambda node: Inverter([node])) is not template
+    assert parser.parse_template_string(_XML) is not template
+
+
+def test_template_instances_are_independent() -> None:
+    """test that each instance has its own nodes and blackboard"""
+    template = BTParser().parse_template_string(_XML)
+    blackboard = Blackboard()
+    first = template.instantiate(blackboard)
+    second = template.instantiate()
+
+    assert first.tick() == NodeStatus.FAILURE
+    assert second.status() == NodeStatus.SKIPPED
+    assert {id(node) for node in first}.isdisjoint(id(node) for node in second)
+
+    first.child().get("value").value = 1
+    assert blackboard.get("value").value == 1
+    assert second.child().get("value").value is None
+
+
+def test_template_applies_decorators() -> None:
+    """test that the parser's decorators are applied to every instance"""
+
+    def invert(node: BehaviorTree) -> BehaviorTree:
+        return Inverter([node])
+
+    template = BTParser(invert).parse_template_string(_XML)
+    for tree in (template.instantiate(), template.instantiate()):
+        assert isinstance(tree.child(), Inverter)
+        assert tree.tick() == NodeStatus.FAILURE
@@ -87,6 +87,7 @@ def _integration_test_cases(
     yield xml, tick_count, expected_observations, write_actual_observations
 
 
+@pytest.mark.parametrize("lazy_subtrees", [False, True])
 @pytest.mark.parametrize(
     "xml,tick_count,expected_observations,write_back", _integration_test_cases()
 )
@@ -95,10 +96,11 @@ def test_integration(
     tick_count: int,
     expected_observations: list[tuple[str, str]],
     write_back: Callable[[list[tuple[str, str]]], None],
+    lazy_subtrees: bool,
 ) -> None:
     """test that trees execute as expected"""
     _RecordingObserver.record = []
-    tree = BTParser(_RecordingObserver).parse_string(xml)
+    tree = BTParser(_RecordingObserver, lazy_subtrees=lazy_subtrees).parse_string(xml)
     for _ in range(tick_count):
         tree.tick()
     actual_observations = [